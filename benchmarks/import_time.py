@@ -0,0 +1,111 @@
+"""
+Measure the time it takes to import ``slim``.
+
+Runs ``django.setup()`` (which imports all the installed apps, including
+``slim``) in a fresh interpreter started with ``python -X importtime``
+(Python 3.7+) and sums up the import time of ``slim`` modules.
+
+Usage::
+
+    DJANGO_SETTINGS_MODULE=settings python benchmarks/import_time.py
+    python benchmarks/import_time.py --settings=settings --runs=10
+
+Run it against two checkouts (``PYTHONPATH=src``) to compare.
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+__title__ = 'benchmarks.import_time'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2013-2017 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = ('measure', 'main',)
+
+# import time:       self [us] |  cumulative | imported package
+IMPORT_TIME_LINE = re.compile(
+    r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$'
+)
+
+SETUP_CODE = 'import django; django.setup()'
+
+
+def measure(settings_module, package='slim'):
+    """Import the Django project once and measure imports of ``package``.
+
+    :param str settings_module: Django settings module.
+    :param str package: Name of the package to measure.
+    :return dict: Self import time (in microseconds) of each module of
+        ``package``.
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    process = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', SETUP_CODE],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        universal_newlines=True
+    )
+    stdout, stderr = process.communicate()
+    if process.returncode:
+        raise RuntimeError(stderr)
+
+    timings = {}
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        self_time, cumulative, indent, module = match.groups()
+        if module == package or module.startswith(package + '.'):
+            timings[module] = int(self_time)
+    return timings
+
+
+def main():
+    """Run the benchmark and print the results."""
+    if sys.version_info < (3, 7):
+        sys.exit("Python 3.7+ is required (for ``-X importtime``).")
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--settings',
+                        default=os.environ.get('DJANGO_SETTINGS_MODULE'),
+                        help="Django settings module.")
+    parser.add_argument('--runs', type=int, default=5,
+                        help="Number of runs. Median is reported.")
+    parser.add_argument('--top', type=int, default=10,
+                        help="Number of the slowest modules to list.")
+    options = parser.parse_args()
+    if not options.settings:
+        parser.error("Django settings module is not given.")
+
+    runs = [measure(options.settings) for __ in range(options.runs)]
+    modules = set()
+    for timings in runs:
+        modules.update(timings)
+
+    def median(values):
+        values = sorted(values)
+        return values[len(values) // 2]
+
+    results = dict(
+        (module, median([timings.get(module, 0) for timings in runs]))
+        for module in modules
+    )
+    total = median([sum(timings.values()) for timings in runs])
+
+    print("slim modules imported: %s" % len(results))
+    print("slim import time (self, median of %s runs): %.1f ms" % (
+        options.runs, total / 1000.0
+    ))
+    for module, self_time in sorted(results.items(),
+                                    key=lambda item: -item[1])[:options.top]:
+        print("  %8.1f ms  %s" % (self_time / 1000.0, module))
+
+
+if __name__ == '__main__':
+    main()
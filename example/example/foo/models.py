@@ -6,7 +6,8 @@ from django.template.loader import render_to_string
 from django.core.urlresolvers import reverse
 
 from slim import Slim, LanguageField
-from slim.models.decorators import auto_prepend_language
+from slim.models import SlimManager
+from slim.models.decorators import cached_auto_prepend_language
 
 FOO_IMAGES_STORAGE_PATH = 'foo-images'
 
@@ -36,11 +37,19 @@ class FooItem(models.Model, Slim):
     date_published = models.DateTimeField(_("Date published"), blank=True, null=True, default=datetime.datetime.now())
     slug = models.SlugField(unique=True, verbose_name=_("Slug"))
 
-    language = LanguageField()
+    language = LanguageField(translation_group=True,
+                             translation_index=True,
+                             language_indexes=('date_published',),
+                             url_fields=('slug',),
+                             listing_indexes=('-date_published',),
+                             unique_translations=True,
+                             shared_fields=('date_published',))
 
     date_created = models.DateTimeField(_("Date created"), blank=True, null=True, auto_now_add=True, editable=False)
     date_updated = models.DateTimeField(_("Date updated"), blank=True, null=True, auto_now=True, editable=False)
 
+    objects = SlimManager()
+
     class Meta:
         verbose_name = _("Foo item")
         verbose_name_plural = _("Foo items")
@@ -48,7 +57,7 @@ class FooItem(models.Model, Slim):
     def __unicode__(self):
         return self.title
 
-    @auto_prepend_language
+    @cached_auto_prepend_language
     def get_absolute_url(self):
         """
         Absolute URL, which goes to the foo item detail page.
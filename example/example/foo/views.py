@@ -3,14 +3,17 @@ from django.shortcuts import render_to_response
 from django.template import RequestContext
 from django.utils import translation
 
+from slim.decorators import translation_group_condition
 from slim.helpers import get_language_from_request
+from slim.listing import get_listing_index
 
 from foo.models import FooItem
 
 
 def browse(request, template_name='foo/browse.html'):
     """
-    In the template, we show all available FooItems for current language.
+    In the template, we show all available FooItems for current language. Items not translated into the current
+    language are shown in their original language.
 
     :param django.http.HttpRequest request:
     :param str template_name:
@@ -18,19 +21,25 @@ def browse(request, template_name='foo/browse.html'):
     """
     language = get_language_from_request(request)
 
-    results_kwargs = {}
-
     if language is not None:
         translation.activate(language)
-        results_kwargs.update({'language': language})
-
-    queryset = FooItem._default_manager.filter(**results_kwargs).order_by('-date_published')
-
-    context = {'items': queryset}
+        # Precomputed listing, a single primary key lookup per page
+        try:
+            page = int(request.GET.get('page', 1))
+        except ValueError:
+            page = 1
+        items = get_listing_index(FooItem, '-date_published').get_page(
+            language, number=max(page, 1), per_page=20
+        )
+    else:
+        items = FooItem._default_manager.all().order_by('-date_published')
+
+    context = {'items': items}
 
     return render_to_response(template_name, context, context_instance=RequestContext(request))
 
 
+@translation_group_condition(FooItem)
 def detail(request, slug, template_name='foo/detail.html'):
     """
     Foo item detail. In the template, we show the title and the body of the FooItem and links to all its' all
@@ -47,8 +56,7 @@ def detail(request, slug, template_name='foo/detail.html'):
         translation.activate(language)
 
     try:
-        item = FooItem._default_manager.all().prefetch_related('translations') \
-                      .select_related('translation_of').get(slug=slug)
+        item = FooItem._default_manager.with_translation_groups().get(slug=slug)
 
     except Exception as e:
         raise Http404
@@ -4,3 +4,6 @@ __build__ = 0x000015
 __author__ = 'Artur Barseghyan'
 __copyright__ = '2013-2017 Artur Barseghyan'
 __license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = ('bulk',)
+
+from .bulk import bulk
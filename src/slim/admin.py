@@ -4,10 +4,30 @@ __copyright__ = '2013-2017 Artur Barseghyan'
 __license__ = 'GPL 2.0/LGPL 2.1'
 __all__ = ('SlimAdmin',)
 
-from django.utils.translation import ugettext_lazy as _
-from django.contrib import admin
+from django.utils.encoding import force_text
+from django.utils.translation import ugettext, ugettext_lazy as _
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.models import CHANGE, DELETION, LogEntry
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import PermissionDenied
+from django.db import IntegrityError, transaction
+from django.template.response import TemplateResponse
 
-from slim.helpers import default_language
+from nine import versions
+from six import string_types
+
+from slim.bulk import bulk
+from slim.handlers import TRANSLATION_GROUP_FIELD_NAME
+from slim.helpers import (
+    get_default_language,
+    get_languages,
+    get_languages_keys
+)
+from slim.models.managers import (
+    SlimQuerySet,
+    get_translation_group_subquery_lookup
+)
 
 
 class SlimAdmin(admin.ModelAdmin):
@@ -23,7 +43,31 @@ class SlimAdmin(admin.ModelAdmin):
     Do NOT set this value to False!
 
     ``collapse_slim_fieldset`` if set to True, the language fieldset is shown collapsed.
+
+    ``translation_chunk_size`` - number of objects translated at once by the
+    ``create_missing_translations`` action. Default value is 500.
+
+    ``group_update_actions`` - actions updating fields of whole translation
+    groups, as (name, description, field values) tuples. Default value is
+    empty.
+
+    ``delete_groups_send_signals`` - if set to True, the
+    ``delete_translation_groups`` action sends ``pre_delete`` and
+    ``post_delete`` signals. Default value is False.
+
+    ``translation_groups_confirmation_template`` - template of the
+    confirmation page of the translation group actions.
+
+    ``translation_groups_title_field`` - field describing the objects on the
+    confirmation page of the translation group actions (and in the log).
+    Primary keys are shown if not set.
+
+    ``translation_groups_confirmation_limit`` - number of objects listed on
+    the confirmation page of the translation group actions at most. Default
+    value is 100.
     """
+    actions = ['create_missing_translations']
+
     # If set to True, only primary language objects are shown in the list view.
     list_view_primary_only = False
 
@@ -39,14 +83,44 @@ class SlimAdmin(admin.ModelAdmin):
     # If set to True, the fieldset is shown collapsed.
     collapse_slim_fieldset = True
 
+    # Number of objects translated at once by the
+    # ``create_missing_translations`` action.
+    translation_chunk_size = 500
+
+    # Actions updating whole translation groups of the selected objects.
+    # Tuples of (name, description, field values), such as
+    # ``('unpublish', _("Unpublish in all languages"), {'published': False})``
+    group_update_actions = ()
+
+    # If set to True, ``delete_translation_groups`` sends the ``pre_delete``
+    # and ``post_delete`` signals (slower).
+    delete_groups_send_signals = False
+
+    # Template of the confirmation page of the translation group actions.
+    translation_groups_confirmation_template = None
+
+    # Field describing the objects on the confirmation page of the
+    # translation group actions (and in the log), such as ``'title'``.
+    translation_groups_title_field = None
+
+    # Number of objects listed on the confirmation page of the translation
+    # group actions at most.
+    translation_groups_confirmation_limit = 100
+
     def queryset(self, *args, **kwargs):
-        # For faster admin load we use ``prefetch_related``. Note, that this doesn't work on Django < 1.5.
-        queryset = super(SlimAdmin, self).get_queryset(*args, **kwargs) \
-                                         .prefetch_related('translations') \
-                                         .select_related('translation_of')
+        queryset = super(SlimAdmin, self).get_queryset(*args, **kwargs)
+
+        # For faster admin load we load the whole translation groups at
+        # once, if model uses the ``SlimManager``. Otherwise, we use
+        # ``prefetch_related``. Note, that this doesn't work on Django < 1.5.
+        if hasattr(queryset, 'with_translation_groups'):
+            queryset = queryset.with_translation_groups()
+        else:
+            queryset = queryset.prefetch_related('translations') \
+                               .select_related('translation_of')
 
         if self.list_view_primary_only is True:
-            f = {self.language_field: default_language}
+            f = {self.language_field: get_default_language()}
             queryset = queryset.filter(**f)
 
         return queryset
@@ -85,6 +159,406 @@ class SlimAdmin(admin.ModelAdmin):
 
         return list_filter
 
+    def get_actions(self, request):
+        """Add a ``create_missing_translations`` action per language.
+
+        Translations are only created by users having the add permission.
+        Translation groups are deleted (updated) by users having the delete
+        (change) permission.
+        """
+        actions = super(SlimAdmin, self).get_actions(request)
+        if self.actions is None:
+            return actions
+
+        if 'create_missing_translations' in actions \
+                and not self.has_add_permission(request):
+            del actions['create_missing_translations']
+
+        if 'delete_translation_groups' in actions \
+                and not self.has_delete_permission(request):
+            del actions['delete_translation_groups']
+
+        if 'create_missing_translations' in actions:
+            for language, language_name in get_languages():
+                name = 'create_missing_translations_%s' % language
+                actions[name] = (
+                    self._make_create_missing_translations_action(language),
+                    name,
+                    _("Create missing translations in %s") % language_name
+                )
+
+        if self.group_update_actions \
+                and self.has_change_permission(request):
+            for name, description, fields in self.group_update_actions:
+                actions[name] = (
+                    self._make_update_translation_groups_action(name),
+                    name,
+                    description
+                )
+        return actions
+
+    def _make_update_translation_groups_action(self, name):
+        """Make action updating translation groups (see
+        ``group_update_actions``)."""
+        def action(modeladmin, request, queryset):
+            return modeladmin.update_translation_groups(request, queryset,
+                                                        name)
+        return action
+
+    def _make_create_missing_translations_action(self, language):
+        """Make ``create_missing_translations`` action for the language."""
+        def action(modeladmin, request, queryset):
+            return modeladmin.create_missing_translations(
+                request, queryset, languages=[language]
+            )
+        return action
+
+    def get_translation_copy_values(self, original, language):
+        """Get field values of the translation copied from the original.
+
+        Values of unique text fields (such as slugs) get the language code
+        appended. Override to customise.
+
+        :param original: Original translation.
+        :param str language: Language of the translation.
+        :return dict:
+        """
+        skip = (self.language_field, 'translation_of',
+                TRANSLATION_GROUP_FIELD_NAME)
+        values = {}
+        for field in original._meta.fields:
+            if field.primary_key or field.name in skip \
+                    or getattr(field, 'auto_now', False) \
+                    or getattr(field, 'auto_now_add', False):
+                continue
+            value = getattr(original, field.attname)
+            if field.unique:
+                if not isinstance(value, string_types):
+                    continue
+                suffix = '-%s' % language
+                if field.max_length:
+                    value = value[:field.max_length - len(suffix)]
+                value += suffix
+            values[field.attname] = value
+        return values
+
+    def create_missing_translations(self, request, queryset, languages=None):
+        """Copy the selected objects into the languages they are missing in.
+
+        Translation groups of the selected objects (translations selected
+        stand for their originals) and the languages they are missing in
+        are found using a single query. Originals are then loaded and their
+        copies (see ``get_translation_copy_values``) inserted with
+        ``bulk_create``, ``translation_chunk_size`` at a time, all within a
+        single transaction.
+
+        :param django.http.HttpRequest request:
+        :param django.db.models.query.QuerySet queryset: Selected objects.
+        :param iterable languages: Languages to translate to. Defaults to
+            all languages.
+        """
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        model = self.model
+        if languages is None:
+            languages = get_languages_keys()
+
+        # {group pk: languages of the existing objects}
+        existing = {}
+        rows = model._default_manager.filter(
+            get_translation_group_subquery_lookup(model, queryset)
+        ).values_list('pk', 'translation_of', self.language_field)
+        for pk, translation_of_pk, language in rows:
+            existing.setdefault(translation_of_pk or pk, set()).add(language)
+
+        missing = sorted(
+            (group_pk, [language for language in languages
+                        if language not in group_languages])
+            for group_pk, group_languages in existing.items()
+        )
+        missing = [
+            (group_pk, group_missing)
+            for group_pk, group_missing in missing
+            if group_missing
+        ]
+
+        created = 0
+        try:
+            with transaction.atomic(using=queryset.db):
+                with bulk():
+                    for start in range(0, len(missing),
+                                       self.translation_chunk_size):
+                        chunk = missing[start:start +
+                                        self.translation_chunk_size]
+                        originals = model._default_manager.in_bulk(
+                            [group_pk for group_pk, group_missing in chunk]
+                        )
+                        objs = []
+                        for group_pk, group_missing in chunk:
+                            original = originals.get(group_pk)
+                            if original is None:
+                                continue
+                            for language in group_missing:
+                                values = self.get_translation_copy_values(
+                                    original, language
+                                )
+                                values['translation_of_id'] = group_pk
+                                values[self.language_field] = language
+                                objs.append(model(**values))
+                        SlimQuerySet(model, using=queryset.db).bulk_create(
+                            objs
+                        )
+                        created += len(objs)
+        except IntegrityError as err:
+            self.message_user(
+                request,
+                ugettext("No translations created: %s") % err,
+                level=messages.ERROR
+            )
+            return
+
+        self.message_user(
+            request,
+            ugettext("%(created)s translations of %(objects)s objects "
+                     "created.") % {'created': created,
+                                    'objects': len(missing)}
+        )
+    create_missing_translations.short_description = \
+        _("Create missing translations")
+
+    def get_slim_queryset(self, queryset):
+        """Get ``SlimQuerySet`` of the objects in the queryset.
+
+        :param django.db.models.query.QuerySet queryset:
+        :return slim.models.managers.SlimQuerySet:
+        """
+        if isinstance(queryset, SlimQuerySet):
+            return queryset
+        return SlimQuerySet(self.model, using=queryset.db).filter(
+            pk__in=queryset.values('pk')
+        )
+
+    def get_translation_group_rows(self, queryset, originals_only=False):
+        """Get rows describing the objects of the translation groups of
+        ``queryset`` (no model instances are created).
+
+        :param django.db.models.query.QuerySet queryset: Selected objects.
+        :param bool originals_only: If set to True, only the original
+            translations (one per translation group) are included.
+        :return django.db.models.query.ValuesListQuerySet: Primary key,
+            primary key of the original translation, language and title
+            (see ``translation_groups_title_field``) of each object.
+        """
+        model = self.model
+        rows = model._default_manager.using(queryset.db).filter(
+            get_translation_group_subquery_lookup(model, queryset)
+        )
+        if originals_only:
+            rows = rows.filter(translation_of__isnull=True)
+        return rows.values_list(
+            'pk', 'translation_of', self.language_field,
+            self.translation_groups_title_field or 'pk'
+        )
+
+    def describe_translation_group_row(self, pk, title):
+        """Describe an object of a translation group.
+
+        :param pk: Primary key of the object.
+        :param title: See ``translation_groups_title_field``.
+        :return str:
+        """
+        if self.translation_groups_title_field:
+            return force_text(title)
+        return u'%s #%s' % (force_text(self.model._meta.verbose_name), pk)
+
+    def get_translation_group_objects(self, queryset):
+        """Describe the objects of the translation groups of ``queryset``.
+
+        At most ``translation_groups_confirmation_limit`` objects are
+        described, using a single query (two, if there are more).
+
+        :param django.db.models.query.QuerySet queryset: Selected objects.
+        :return tuple: Lists of descriptions, one per translation group (the
+            original translation first), and the number of objects not
+            described.
+        """
+        limit = self.translation_groups_confirmation_limit
+        rows = self.get_translation_group_rows(queryset).order_by('pk')
+        listed = list(rows[:limit + 1])
+        if len(listed) > limit:
+            listed = listed[:limit]
+            more = rows.count() - limit
+        else:
+            more = 0
+
+        groups = {}
+        for pk, translation_of_pk, language, title in listed:
+            groups.setdefault(translation_of_pk or pk, []).append((
+                translation_of_pk is not None,
+                u'%s (%s)' % (self.describe_translation_group_row(pk, title),
+                              language)
+            ))
+        return [
+            [description for is_translation, description in sorted(group)]
+            for group_pk, group in sorted(groups.items())
+        ], more
+
+    def log_translation_groups(self, request, queryset, action_flag,
+                               change_message=''):
+        """Log an action on the translation groups of ``queryset``.
+
+        One entry per translation group (for the original translation) is
+        written, using a single query.
+
+        :param django.http.HttpRequest request:
+        :param django.db.models.query.QuerySet queryset: Selected objects.
+        :param int action_flag: ``ADDITION``, ``CHANGE`` or ``DELETION``.
+        :param str change_message:
+        """
+        content_type = ContentType.objects.get_for_model(self.model)
+        LogEntry.objects.bulk_create([
+            LogEntry(
+                user_id=request.user.pk,
+                content_type_id=content_type.pk,
+                object_id=force_text(pk),
+                object_repr=self.describe_translation_group_row(
+                    pk, title
+                )[:200],
+                action_flag=action_flag,
+                change_message=change_message
+            )
+            for pk, translation_of_pk, language, title
+            in self.get_translation_group_rows(queryset, originals_only=True)
+        ])
+
+    def render_translation_groups_confirmation(self, request, queryset,
+                                               action, title, question):
+        """Render the confirmation page of a translation group action.
+
+        The objects of the affected translation groups are listed (see
+        ``get_translation_group_objects``). Confirming posts the action
+        back, with ``post`` set.
+
+        :param django.http.HttpRequest request:
+        :param django.db.models.query.QuerySet queryset: Selected objects.
+        :param str action: Name of the action.
+        :param str title:
+        :param str question:
+        :return django.template.response.TemplateResponse:
+        """
+        opts = self.model._meta
+        groups, more = self.get_translation_group_objects(queryset)
+
+        context = {}
+        if versions.DJANGO_GTE_1_8:
+            context.update(self.admin_site.each_context(request))
+        context.update({
+            'title': title,
+            'question': question,
+            'objects': [[group[0], group[1:]] for group in groups],
+            'more': more,
+            'selected_pks': queryset.values_list('pk', flat=True),
+            'opts': opts,
+            'app_label': opts.app_label,
+            'action': action,
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        })
+
+        request.current_app = self.admin_site.name
+        return TemplateResponse(
+            request,
+            self.translation_groups_confirmation_template or [
+                'admin/%s/%s/translation_groups_confirmation.html' % (
+                    opts.app_label, opts.object_name.lower()
+                ),
+                'admin/%s/translation_groups_confirmation.html' % (
+                    opts.app_label
+                ),
+                'slim/admin/translation_groups_confirmation.html',
+            ],
+            context
+        )
+
+    def delete_translation_groups(self, request, queryset):
+        """Delete the selected objects along with all their translations.
+
+        See ``slim.models.managers.SlimQuerySet.delete_groups`` (and
+        ``delete_groups_send_signals``). As ``delete_selected`` does, lists
+        the objects to delete on a confirmation page first. The deletion is
+        logged once per translation group. Not enabled by default. Add it to
+        the ``actions`` to enable.
+        """
+        if not self.has_delete_permission(request):
+            raise PermissionDenied
+
+        if not request.POST.get('post'):
+            return self.render_translation_groups_confirmation(
+                request, queryset, 'delete_translation_groups',
+                ugettext("Are you sure?"),
+                ugettext("Are you sure you want to delete the selected "
+                         "objects in all languages? All of the following "
+                         "objects will be deleted:")
+            )
+
+        self.log_translation_groups(
+            request, queryset, DELETION,
+            ugettext("Deleted in all languages.")
+        )
+        deleted = self.get_slim_queryset(queryset).delete_groups(
+            send_signals=self.delete_groups_send_signals
+        )
+        self.message_user(
+            request,
+            ugettext("%(deleted)s objects deleted.") % {'deleted': deleted}
+        )
+    delete_translation_groups.short_description = \
+        _("Delete selected objects in all languages")
+
+    def update_translation_groups(self, request, queryset, name):
+        """Update fields of the selected objects and all their translations.
+
+        See ``slim.models.managers.SlimQuerySet.update_groups`` and
+        ``group_update_actions``. Lists the objects to update on a
+        confirmation page first. The change is logged once per translation
+        group.
+
+        :param django.http.HttpRequest request:
+        :param django.db.models.query.QuerySet queryset: Selected objects.
+        :param str name: Name of the action in ``group_update_actions``.
+        """
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+
+        for action, description, fields in self.group_update_actions:
+            if action == name:
+                break
+        else:
+            raise ValueError("Unknown group update action %s." % name)
+
+        if not request.POST.get('post'):
+            return self.render_translation_groups_confirmation(
+                request, queryset, name,
+                ugettext("Are you sure?"),
+                ugettext("Are you sure you want to apply \"%(action)s\" to "
+                         "the selected objects in all languages? All of the "
+                         "following objects will be changed:") % {
+                    'action': description
+                }
+            )
+
+        updated = self.get_slim_queryset(queryset).update_groups(**fields)
+        self.log_translation_groups(
+            request, queryset, CHANGE,
+            ugettext("Changed %s in all languages.") % u', '.join(
+                sorted(fields)
+            )
+        )
+        self.message_user(
+            request,
+            ugettext("%(updated)s objects updated.") % {'updated': updated}
+        )
+
     def _django17_declared_fieldsets(self):
         if self.fieldsets:
             return self.fieldsets
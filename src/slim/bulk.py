@@ -0,0 +1,178 @@
+__title__ = 'slim.bulk'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2013-2017 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'BulkContext',
+    'bulk',
+    'get_bulk_context',
+)
+
+import threading
+from contextlib import contextmanager
+
+_local = threading.local()
+
+
+class BulkContext(object):
+    """Per-save work deferred while ``slim.bulk`` is active.
+
+    Instead of being invalidated on each save (or delete), affected
+    translation groups (and listing indexes) are collected and invalidated
+    (shared fields copied) at once on exit.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        # {model: set of group pks}
+        self.groups = {}
+        # {model: set of URLs of deleted (or moved) objects}
+        self.urls = {}
+        # Models having originals with the translation group field not set
+        self.ungrouped_models = set()
+        # {model: set of pks of originals with shared fields changed}
+        self.shared_groups = {}
+        # {listing index: set of languages, or None for all languages}
+        self.listing_indexes = {}
+
+    def add_group(self, model, group_pk):
+        """Record a translation group to invalidate.
+
+        :param model: Model class.
+        :param group_pk: Primary key of the original translation. None (new
+            originals created by ``bulk_create`` on databases not returning
+            primary keys) only marks the model as changed.
+        """
+        group_pks = self.groups.setdefault(model._meta.concrete_model, set())
+        if group_pk is not None:
+            group_pks.add(group_pk)
+
+    def add_url(self, model, url):
+        """Record a page URL to purge.
+
+        :param model: Model class.
+        :param str url:
+        """
+        self.urls.setdefault(model._meta.concrete_model, set()).add(url)
+
+    def add_shared_group(self, model, group_pk):
+        """Record an original translation to copy shared fields of to its
+        translations.
+
+        :param model: Model class.
+        :param group_pk: Primary key of the original translation.
+        """
+        self.shared_groups.setdefault(
+            model._meta.concrete_model, set()
+        ).add(group_pk)
+
+    def add_listing_indexes(self, indexes):
+        """Record listing indexes to drop.
+
+        :param dict indexes: Languages to drop the indexes for (None for all
+            languages), by ``slim.listing.ListingIndex``.
+        """
+        for index, languages in indexes.items():
+            recorded = self.listing_indexes.get(index, set())
+            if recorded is None or languages is None:
+                self.listing_indexes[index] = None
+            else:
+                self.listing_indexes[index] = recorded | set(languages)
+
+    def add_ungrouped_model(self, model):
+        """Record a model to fill in the translation group field for.
+
+        :param model: Model class.
+        """
+        self.ungrouped_models.add(model._meta.concrete_model)
+
+    def flush(self, update_database=True):
+        """Do all the work deferred, once per model.
+
+        :param bool update_database: If set to False, no queries are made,
+            only caches are invalidated (used when leaving the context with
+            an error, since the transaction might be broken).
+        """
+        from .handlers import (
+            fill_translation_groups,
+            invalidate_translation_groups,
+            purge_translation_groups_pages
+        )
+
+        from .models.managers import GROUP_CHUNK_SIZE, SlimQuerySet
+
+        if update_database:
+            for model in self.ungrouped_models:
+                fill_translation_groups(model)
+            # See ``slim.handlers.push_shared_fields``
+            for model, group_pks in self.shared_groups.items():
+                group_pks = sorted(group_pks)
+                for start in range(0, len(group_pks), GROUP_CHUNK_SIZE):
+                    SlimQuerySet(model).filter(
+                        pk__in=group_pks[start:start + GROUP_CHUNK_SIZE]
+                    ).sync_shared_fields()
+
+        for model in set(self.groups) | set(self.urls):
+            group_pks = self.groups.get(model, set())
+            invalidate_translation_groups(model, group_pks)
+            # URLs of the translation groups are not known without queries
+            purge_translation_groups_pages(
+                model,
+                group_pks if update_database else (),
+                urls=self.urls.get(model, ())
+            )
+        for index, languages in self.listing_indexes.items():
+            index.drop(languages)
+
+        self.groups = {}
+        self.urls = {}
+        self.ungrouped_models = set()
+        self.shared_groups = {}
+        self.listing_indexes = {}
+
+
+def get_bulk_context():
+    """Get the bulk context of the current thread.
+
+    :return slim.bulk.BulkContext: Or None if not within ``slim.bulk``.
+    """
+    return getattr(_local, 'bulk_context', None)
+
+
+@contextmanager
+def bulk():
+    """Defer per-save work of slim until the end of the block.
+
+    Cache invalidation, page purging, copying of the shared fields and the
+    translation group field maintenance normally happen once for each
+    object saved or deleted.
+    Within the block, affected translation groups are collected instead and
+    dealt with once on exit, in batches (a single cache operation or query
+    per model). Nested blocks are merged into the outermost one.
+
+    Objects created with ``SlimQuerySet.bulk_create`` and updated with
+    ``SlimQuerySet.bulk_update`` (which do not send signals) are taken care
+    of too, whether within the block or not.
+
+    Example::
+
+        import slim
+
+        with slim.bulk():
+            for row in rows:
+                FooItem.objects.create(**row)
+    """
+    if get_bulk_context() is not None:
+        yield get_bulk_context()
+        return
+
+    context = BulkContext()
+    _local.bulk_context = context
+    try:
+        yield context
+    except Exception:
+        _local.bulk_context = None
+        context.flush(update_database=False)
+        raise
+    _local.bulk_context = None
+    context.flush()
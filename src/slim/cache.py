@@ -0,0 +1,522 @@
+__title__ = 'slim.cache'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2013-2017 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'build_translation_maps',
+    'bump_group_version',
+    'bump_group_versions',
+    'get_cache',
+    'get_cached_translation',
+    'get_cached_translations',
+    'get_group_version',
+    'get_group_version_key',
+    'get_group_versions',
+    'get_object_url',
+    'get_page_cache_key',
+    'get_page_path_key',
+    'get_translation_map',
+    'get_translation_map_key',
+    'get_translation_group_urls',
+    'get_translation_maps',
+    'invalidate_translation_map',
+    'invalidate_translation_maps',
+    'is_cache_enabled',
+    'new_page_path_entry',
+    'purge_translation_group_pages',
+    'tag_translation_group_page',
+)
+
+import hashlib
+import random
+import time
+
+from .conf import settings as slim_settings
+
+# Number of seconds between checks for a translation map being built by
+# another process.
+LOCK_POLL_INTERVAL = 0.05
+
+
+def is_cache_enabled():
+    """Check if translation maps shall be cached.
+
+    :return bool:
+    """
+    return bool(slim_settings.USE_CACHE)
+
+
+def get_cache():
+    """Get the cache to store translation maps in.
+
+    :return django.core.cache.backends.base.BaseCache:
+    """
+    try:
+        from django.core.cache import caches
+        return caches[slim_settings.CACHE_ALIAS]
+    except ImportError:
+        from django.core.cache import get_cache as django_get_cache
+        return django_get_cache(slim_settings.CACHE_ALIAS)
+
+
+def get_translation_map_key(model, group_pk):
+    """Get cache key of the translation map.
+
+    :param model: Model class.
+    :param group_pk: Primary key of the original translation.
+    :return str:
+    """
+    return 'slim.translation_map.%s.%s.%s' % (
+        model._meta.app_label, model._meta.object_name.lower(), group_pk
+    )
+
+
+def build_translation_maps(model, group_pks):
+    """Build translation maps of the translation groups using a single query.
+
+    :param model: Model class.
+    :param iterable group_pks: Primary keys of the original translations.
+    :return dict: Primary keys of the original translations as keys, dicts
+        ({language: pk}) as values. Groups that do not exist (any more) get
+        empty dicts.
+    """
+    from .models.managers import get_translation_group_lookup
+
+    translation_maps = dict((group_pk, {}) for group_pk in group_pks)
+    if not translation_maps:
+        return translation_maps
+
+    queryset = model._default_manager.filter(
+        get_translation_group_lookup(model, list(translation_maps))
+    ).values_list('pk', 'translation_of', 'language')
+
+    for pk, translation_of_pk, language in queryset:
+        translation_maps[translation_of_pk or pk][language] = pk
+
+    return translation_maps
+
+
+def _get_up_to_date_map(entry, version):
+    """Get translation map out of the cache entry, if it's up to date.
+
+    :param tuple entry: Version of the translation group (at the time the
+        map was built) and the translation map.
+    :param int version: Current version of the translation group.
+    :return dict: Or None if the map is outdated (or missing).
+    """
+    if isinstance(entry, tuple) and version is not None \
+            and entry[0] == version:
+        return entry[1]
+    return None
+
+
+def get_translation_map(model, group_pk):
+    """Get (cached) translation map of the translation group.
+
+    If the map is not cached yet, only one process builds it, while the
+    others wait (at most ``SLIM_CACHE_LOCK_WAIT`` seconds) for it to appear
+    in the cache. Maps are stored along with the version of the translation
+    group read before building them, and maps of other versions are
+    ignored, so that a map built out of data changed meanwhile is never
+    used.
+
+    :param model: Model class.
+    :param group_pk: Primary key of the original translation.
+    :return dict: Language codes as keys, primary keys as values.
+    """
+    cache = get_cache()
+    key = get_translation_map_key(model, group_pk)
+    version_key = get_group_version_key(model, group_pk)
+
+    cached = cache.get_many([key, version_key])
+    translation_map = _get_up_to_date_map(cached.get(key),
+                                          cached.get(version_key))
+    if translation_map is not None:
+        return translation_map
+
+    lock_key = '%s.lock' % key
+    if not cache.add(lock_key, 1, slim_settings.CACHE_LOCK_TIMEOUT):
+        # Another process is building the translation map
+        deadline = time.time() + slim_settings.CACHE_LOCK_WAIT
+        while time.time() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            cached = cache.get_many([key, version_key])
+            translation_map = _get_up_to_date_map(cached.get(key),
+                                                  cached.get(version_key))
+            if translation_map is not None:
+                return translation_map
+        return build_translation_maps(model, [group_pk])[group_pk]
+
+    try:
+        version = cached.get(version_key)
+        if version is None:
+            version = get_group_version(model, group_pk)
+        translation_map = build_translation_maps(model, [group_pk])[group_pk]
+        cache.set(key, (version, translation_map),
+                  slim_settings.CACHE_TIMEOUT)
+    finally:
+        cache.delete(lock_key)
+
+    return translation_map
+
+
+def get_translation_maps(model, group_pks):
+    """Get (cached) translation maps of multiple translation groups.
+
+    Missing (or outdated) translation maps are built using a single query.
+    See ``get_translation_map``.
+
+    :param model: Model class.
+    :param iterable group_pks: Primary keys of the original translations.
+    :return dict: Primary keys of the original translations as keys,
+        translation maps as values.
+    """
+    cache = get_cache()
+    group_pks = set(group_pks)
+    keys = dict(
+        (group_pk, (get_translation_map_key(model, group_pk),
+                    get_group_version_key(model, group_pk)))
+        for group_pk in group_pks
+    )
+    cached = cache.get_many(
+        [key for group_keys in keys.values() for key in group_keys]
+    )
+
+    translation_maps = {}
+    versions = {}
+    for group_pk, (key, version_key) in keys.items():
+        versions[group_pk] = cached.get(version_key)
+        translation_map = _get_up_to_date_map(cached.get(key),
+                                              versions[group_pk])
+        if translation_map is not None:
+            translation_maps[group_pk] = translation_map
+
+    missing_group_pks = [
+        group_pk for group_pk in group_pks
+        if group_pk not in translation_maps
+    ]
+    if missing_group_pks:
+        unversioned_group_pks = [
+            group_pk for group_pk in missing_group_pks
+            if versions[group_pk] is None
+        ]
+        if unversioned_group_pks:
+            versions.update(get_group_versions(model, unversioned_group_pks))
+        built_translation_maps = build_translation_maps(
+            model, missing_group_pks
+        )
+        cache.set_many(
+            dict(
+                (keys[group_pk][0], (versions[group_pk], translation_map))
+                for group_pk, translation_map
+                in built_translation_maps.items()
+            ),
+            slim_settings.CACHE_TIMEOUT
+        )
+        translation_maps.update(built_translation_maps)
+
+    return translation_maps
+
+
+def invalidate_translation_map(model, group_pk):
+    """Invalidate translation map of the translation group.
+
+    :param model: Model class.
+    :param group_pk: Primary key of the original translation.
+    """
+    get_cache().delete(get_translation_map_key(model, group_pk))
+
+
+def invalidate_translation_maps(model, group_pks):
+    """Invalidate translation maps of multiple translation groups at once.
+
+    :param model: Model class.
+    :param iterable group_pks: Primary keys of the original translations.
+    """
+    get_cache().delete_many(
+        [get_translation_map_key(model, group_pk) for group_pk in group_pks]
+    )
+
+
+def _is_group_member(obj, group_pk):
+    """Check if object (still) belongs to the translation group."""
+    return (obj.translation_of_id or obj.pk) == group_pk
+
+
+def get_cached_translations(model, group_pk, languages):
+    """Get translations in the languages given, using the translation map.
+
+    Languages known not to be available cost no queries, the rest are
+    fetched by their primary keys using a single query.
+
+    :param model: Model class.
+    :param group_pk: Primary key of the original translation.
+    :param iterable languages: Language codes.
+    :return dict: Language codes as keys, objects or None as values.
+    """
+    translation_map = get_translation_map(model, group_pk)
+    translations = dict((language, None) for language in languages)
+
+    pks = dict(
+        (translation_map[language], language)
+        for language in translations
+        if language in translation_map
+    )
+    if not pks:
+        return translations
+
+    objects = model._default_manager.in_bulk(list(pks))
+    if len(objects) == len(pks) and all(
+        _is_group_member(obj, group_pk) and obj.language == pks[pk]
+        for pk, obj in objects.items()
+    ):
+        for obj in objects.values():
+            translations[obj.language] = obj
+        return translations
+
+    # The translation map is out of date (records changed bypassing the
+    # signals, using ``update`` for instance). Drop it and query directly.
+    from .models.managers import get_translation_group_lookup
+
+    invalidate_translation_map(model, group_pk)
+    queryset = model._default_manager.filter(
+        get_translation_group_lookup(model, [group_pk]),
+        language__in=list(translations)
+    )
+    for obj in queryset:
+        translations[obj.language] = obj
+
+    return translations
+
+
+def get_cached_translation(model, group_pk, language):
+    """Get translation in the language given, using the translation map.
+
+    :param model: Model class.
+    :param group_pk: Primary key of the original translation.
+    :param str language: Language code.
+    :return obj: Object or None.
+    """
+    return get_cached_translations(model, group_pk, [language])[language]
+
+
+def get_group_version_key(model, group_pk):
+    """Get cache key of the translation group version.
+
+    :param model: Model class.
+    :param group_pk: Primary key of the original translation.
+    :return str:
+    """
+    return 'slim.group_version.%s.%s.%s' % (
+        model._meta.app_label, model._meta.object_name.lower(), group_pk
+    )
+
+
+def _new_group_version():
+    """New version stamp.
+
+    Based on current time (plus some random digits), so that versions lost
+    (evicted from the cache) or replaced are never reused.
+    """
+    return int(time.time() * 1000) * 1000 + random.randint(0, 999)
+
+
+def get_group_version(model, group_pk):
+    """Get version of the translation group.
+
+    The version changes whenever any member of the translation group is
+    saved or deleted. Costs a single cache lookup.
+
+    :param model: Model class.
+    :param group_pk: Primary key of the original translation.
+    :return int:
+    """
+    return get_group_versions(model, [group_pk])[group_pk]
+
+
+def get_group_versions(model, group_pks):
+    """Get versions of multiple translation groups.
+
+    :param model: Model class.
+    :param iterable group_pks: Primary keys of the original translations.
+    :return dict: Primary keys of the original translations as keys,
+        versions as values.
+    """
+    cache = get_cache()
+    keys = dict(
+        (get_group_version_key(model, group_pk), group_pk)
+        for group_pk in group_pks
+    )
+
+    versions = dict(
+        (keys[key], version)
+        for key, version in cache.get_many(list(keys)).items()
+    )
+
+    missing = dict(
+        (key, _new_group_version())
+        for key, group_pk in keys.items()
+        if group_pk not in versions
+    )
+    if missing:
+        cache.set_many(missing, slim_settings.CACHE_VERSION_TIMEOUT)
+        for key, version in missing.items():
+            versions[keys[key]] = version
+
+    return versions
+
+
+def bump_group_version(model, group_pk):
+    """Change version of the translation group.
+
+    :param model: Model class.
+    :param group_pk: Primary key of the original translation.
+    """
+    cache = get_cache()
+    key = get_group_version_key(model, group_pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Not cached (any more)
+        cache.set(key,
+                  _new_group_version(),
+                  slim_settings.CACHE_VERSION_TIMEOUT)
+
+
+def bump_group_versions(model, group_pks):
+    """Change versions of multiple translation groups at once.
+
+    :param model: Model class.
+    :param iterable group_pks: Primary keys of the original translations.
+    """
+    get_cache().set_many(
+        dict(
+            (get_group_version_key(model, group_pk), _new_group_version())
+            for group_pk in group_pks
+        ),
+        slim_settings.CACHE_VERSION_TIMEOUT
+    )
+
+
+def get_page_path_key(path):
+    """Get cache key of the pages cached at the path given.
+
+    Holds a token (changed whenever the entry is created) and the names of
+    the request headers the pages vary on. Deleting it purges all the pages
+    cached at the path (of any host, in any variant).
+
+    :param str path: Path of the page (as in ``request.path``).
+    :return str:
+    """
+    return 'slim.page.%s' % hashlib.md5(path.encode('utf-8')).hexdigest()
+
+
+def new_page_path_entry(headers=()):
+    """Make a new entry of the pages cached at a path.
+
+    :param iterable headers: Names of the request headers the pages vary on
+        (as in ``request.META``).
+    :return tuple: Token and header names.
+    """
+    return '%x' % random.getrandbits(64), tuple(headers)
+
+
+def get_page_cache_key(request, entry):
+    """Get cache key of the page requested.
+
+    Pages are keyed by the host and the values of the request headers they
+    vary on (as listed in the ``entry``), along with the path.
+
+    :param django.http.HttpRequest request:
+    :param tuple entry: Token and header names (see
+        ``new_page_path_entry``).
+    :return str:
+    """
+    token, headers = entry
+    variant = [request.get_host()]
+    variant.extend(request.META.get(header, '') for header in headers)
+    return '%s.%s.%s' % (
+        get_page_path_key(request.path),
+        token,
+        hashlib.md5('\n'.join(variant).encode('utf-8')).hexdigest()
+    )
+
+
+def tag_translation_group_page(response, obj):
+    """Mark the response as a page of the object given.
+
+    Such responses are cached by the
+    ``slim.middleware.TranslationGroupPageCacheMiddleware`` and purged
+    whenever any member of the translation group of ``obj`` is saved or
+    deleted (see ``url_fields`` of ``slim.models.fields.LanguageField``).
+
+    :param django.http.HttpResponse response:
+    :param obj: Object (of a model with ``LanguageField``).
+    :return django.http.HttpResponse: Same response.
+    """
+    response._slim_translation_group = (
+        obj._meta.concrete_model, obj.translation_of_id or obj.pk
+    )
+    return response
+
+
+def get_object_url(obj):
+    """Get URL of the object, to purge cached pages of.
+
+    Errors building the URL (such as ``NoReverseMatch``, for values the URL
+    pattern does not accept) are ignored, since pages are purged while
+    objects are saved (or deleted), which shall never fail because of that.
+
+    :param obj: Object (of a model with ``LanguageField``).
+    :return str: Or None if the URL can't be built.
+    """
+    from django.db import DatabaseError
+
+    try:
+        return obj.get_absolute_url()
+    except DatabaseError:
+        raise
+    except Exception:
+        return None
+
+
+def get_translation_group_urls(model, group_pks, fields):
+    """Get URLs of all the objects of the translation groups given.
+
+    Objects are loaded using a single query, with only the ``language`` and
+    the ``fields`` given (other fields ``get_absolute_url`` needs are loaded
+    on access, one query per object). Objects whose URL can't be built are
+    skipped (see ``get_object_url``).
+
+    :param model: Model class.
+    :param iterable group_pks: Primary keys of the original translations.
+    :param tuple fields: Names of the fields ``get_absolute_url`` depends
+        on (besides ``language``).
+    :return list:
+    """
+    from .models.managers import get_translation_group_lookup
+
+    objs = model._default_manager.filter(
+        get_translation_group_lookup(model, list(group_pks))
+    ).only('translation_of', 'language', *fields)
+    urls = [get_object_url(obj) for obj in objs]
+    return [url for url in urls if url is not None]
+
+
+def purge_translation_group_pages(model, group_pks, fields, urls=()):
+    """Purge cached pages of all the objects of the translation groups given.
+
+    Uses a single query and a single cache operation.
+
+    :param model: Model class.
+    :param iterable group_pks: Primary keys of the original translations.
+    :param tuple fields: Names of the fields ``get_absolute_url`` depends
+        on (besides ``language``).
+    :param iterable urls: Additional URLs to purge (of deleted objects, for
+        instance).
+    """
+    urls = set(urls)
+    if group_pks:
+        urls.update(get_translation_group_urls(model, group_pks, fields))
+    if urls:
+        get_cache().delete_many([get_page_path_key(url) for url in urls])
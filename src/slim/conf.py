@@ -2,12 +2,19 @@ __title__ = 'slim.conf'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
 __copyright__ = '2013-2017 Artur Barseghyan'
 __license__ = 'GPL 2.0/LGPL 2.1'
-__all__ = ('get_setting',)
+__all__ = ('get_setting', 'LazySettings', 'settings',)
 
-from django.conf import settings
+from django.conf import settings as django_settings
+
+try:
+    from django.core.signals import setting_changed
+except ImportError:
+    # Django < 1.8
+    from django.test.signals import setting_changed
 
 from slim import defaults
 
+
 def get_setting(setting, override=None):
     """
     Get a setting from ``slim`` conf module, falling back to the default.
@@ -16,7 +23,46 @@ def get_setting(setting, override=None):
     """
     if override is not None:
         return override
-    if hasattr(settings, 'SLIM_%s' % setting):
-        return getattr(settings, 'SLIM_%s' % setting)
+    if hasattr(django_settings, 'SLIM_%s' % setting):
+        return getattr(django_settings, 'SLIM_%s' % setting)
     else:
         return getattr(defaults, setting)
+
+
+class LazySettings(object):
+    """Lazy ``slim`` settings.
+
+    Each setting is resolved (see ``get_setting``) on first access and
+    cached until the ``setting_changed`` signal is sent for it (by
+    ``override_settings`` in tests, for instance). Nothing is resolved at
+    import time.
+
+    Example::
+
+        from slim.conf import settings as slim_settings
+
+        slim_settings.USE_CACHE
+    """
+
+    def __getattr__(self, name):
+        if name.startswith('_') or not hasattr(defaults, name):
+            raise AttributeError(name)
+        value = get_setting(name)
+        self.__dict__[name] = value
+        return value
+
+    def reset(self, **kwargs):
+        """Drop cached values.
+
+        Connected to the ``setting_changed`` signal.
+        """
+        setting = kwargs.get('setting')
+        if setting is None:
+            self.__dict__.clear()
+        elif setting.startswith('SLIM_'):
+            self.__dict__.pop(setting[len('SLIM_'):], None)
+
+
+settings = LazySettings()
+
+setting_changed.connect(settings.reset)
@@ -0,0 +1,129 @@
+__title__ = 'slim.decorators'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2013-2017 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'get_translation_group_state',
+    'translation_group_condition',
+)
+
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+
+from six import text_type
+
+from .conf import settings as slim_settings
+from .cache import get_group_version
+from .helpers import get_language_from_request
+from .models.managers import get_translation_group_subquery_lookup
+
+
+def get_translation_group_state(model, lookup, last_modified_field=None):
+    """Get state of the translation group of the object matching ``lookup``.
+
+    Uses a single aggregate query.
+
+    :param model: Model class.
+    :param dict lookup: Lookup (such as ``{'slug': slug}``) identifying the
+        object.
+    :param str last_modified_field: Name of the field holding the
+        modification date. Defaults to ``SLIM_LAST_MODIFIED_FIELD``. If the
+        model has no such field, last modification date is not known.
+    :return dict: Keys are ``group_pk``, ``count``, ``last_modified``
+        and ``version``. None if no objects match ``lookup``.
+    """
+    if last_modified_field is None:
+        last_modified_field = slim_settings.LAST_MODIFIED_FIELD
+    field_names = [field.name for field in model._meta.fields]
+
+    aggregates = {
+        'translation_of_pk': Max('translation_of'),
+        'pk': Max('pk'),
+        'count': Count('pk'),
+    }
+    if last_modified_field in field_names:
+        aggregates['last_modified'] = Max(last_modified_field)
+
+    manager = model._default_manager
+    state = manager.filter(
+        get_translation_group_subquery_lookup(model,
+                                              manager.filter(**lookup))
+    ).aggregate(**aggregates)
+
+    if not state['count']:
+        return None
+
+    # Translations point to the original translation. Groups without
+    # translations consist of the original translation only.
+    group_pk = state['translation_of_pk'] or state['pk']
+    return {
+        'group_pk': group_pk,
+        'count': state['count'],
+        'last_modified': state.get('last_modified'),
+        'version': get_group_version(model, group_pk),
+    }
+
+
+def translation_group_condition(model, lookup_field='slug', url_kwarg=None,
+                                last_modified_field=None):
+    """Conditional GET for views showing an object and its' translations.
+
+    Sets the ``ETag`` (based on the translation group version, see
+    ``slim.cache.get_group_version``) and ``Last-Modified`` (based on the
+    latest modification date of the translation group) headers. Responds
+    with "304 Not Modified" without calling the view, if nothing in the
+    translation group has changed since. State of the translation group is
+    fetched using a single aggregate query.
+
+    Example usage::
+
+        @translation_group_condition(FooItem)
+        def detail(request, slug):
+            ...
+
+    :param model: Model class.
+    :param str lookup_field: Name of the field identifying the object.
+    :param str url_kwarg: Name of the URL keyword argument holding the
+        ``lookup_field`` value. Defaults to ``lookup_field``.
+    :param str last_modified_field: Name of the field holding the
+        modification date. Defaults to ``SLIM_LAST_MODIFIED_FIELD``.
+    """
+    if url_kwarg is None:
+        url_kwarg = lookup_field
+
+    def decorator(func):
+        @wraps(func)
+        def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') \
+                    or url_kwarg not in kwargs:
+                return func(request, *args, **kwargs)
+
+            state = get_translation_group_state(
+                model,
+                {lookup_field: kwargs[url_kwarg]},
+                last_modified_field=last_modified_field
+            )
+            if state is None:
+                # Let the view deal with it (404, most likely)
+                return func(request, *args, **kwargs)
+
+            etag = hashlib.md5(':'.join(text_type(part) for part in (
+                model._meta.app_label,
+                model._meta.object_name.lower(),
+                state['group_pk'],
+                state['version'],
+                state['count'],
+                state['last_modified'],
+                get_language_from_request(request),
+            )).encode('utf-8')).hexdigest()
+
+            return condition(
+                etag_func=lambda *args, **kwargs: etag,
+                last_modified_func=lambda *args, **kwargs:
+                    state['last_modified']
+            )(func)(request, *args, **kwargs)
+        return inner
+    return decorator
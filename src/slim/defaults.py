@@ -2,7 +2,22 @@ __title__ = 'slim.defaults'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
 __copyright__ = '2013-2017 Artur Barseghyan'
 __license__ = 'GPL 2.0/LGPL 2.1'
-__all__ = ('USE_LOCALEURL', 'USE_LOCAL_LANGUAGE_NAMES', 'ENABLE_MONKEY_PATCHING')
+__all__ = (
+    'USE_LOCALEURL',
+    'USE_LOCAL_LANGUAGE_NAMES',
+    'ENABLE_MONKEY_PATCHING',
+    'LANGUAGE_FALLBACKS',
+    'USE_CACHE',
+    'CACHE_ALIAS',
+    'CACHE_TIMEOUT',
+    'CACHE_LOCK_TIMEOUT',
+    'CACHE_LOCK_WAIT',
+    'CACHE_VERSION_TIMEOUT',
+    'LAST_MODIFIED_FIELD',
+    'PAGE_CACHE_TIMEOUT',
+    'LISTING_INDEX_TIMEOUT',
+    'TRANSLATION_GROUPS_FILLED',
+)
 
 # If set to False, `django-localeurl` usage in `slim` is force-disabled.
 USE_LOCALEURL = True
@@ -12,4 +27,55 @@ USE_LOCAL_LANGUAGE_NAMES = False
 
 # If set to True, class methods (``snart.models.Snart`` are monkey patched to the field, thus you don't have to
 # inherit from snart models.
-ENABLE_MONKEY_PATCHING = False
\ No newline at end of file
+ENABLE_MONKEY_PATCHING = False
+
+# Language fallback chains. Keys are language codes, values are lists of
+# language codes to fall back to (in the given order). For languages not
+# listed, the chain consists of the short language code (if listed in
+# ``LANGUAGES``) followed by the primary language. Example:
+#
+#     SLIM_LANGUAGE_FALLBACKS = {
+#         'de-at': ['de', 'en'],
+#         'pt-br': ['pt'],
+#     }
+LANGUAGE_FALLBACKS = {}
+
+# If set to True, translation maps ({language: pk} of each translation group)
+# are stored in the Django cache.
+USE_CACHE = False
+
+# Name of the cache (as in ``CACHES``) to use.
+CACHE_ALIAS = 'default'
+
+# Number of seconds translation maps are cached for.
+CACHE_TIMEOUT = 60 * 60
+
+# Number of seconds a cold translation map is locked for (while being built
+# by one of the processes), protecting the database from stampedes.
+CACHE_LOCK_TIMEOUT = 10
+
+# Number of seconds to wait for a locked translation map to be built by
+# another process, before querying the database anyway.
+CACHE_LOCK_WAIT = 1
+
+# Number of seconds translation group versions (see ``slim.cache``) are
+# cached for.
+CACHE_VERSION_TIMEOUT = 60 * 60 * 24 * 30
+
+# Name of the field holding the modification date of the objects, used by
+# the ``slim.decorators.translation_group_condition`` view decorator.
+LAST_MODIFIED_FIELD = 'date_updated'
+
+# Number of seconds pages are cached for by the
+# ``slim.middleware.TranslationGroupPageCacheMiddleware``.
+PAGE_CACHE_TIMEOUT = 60 * 10
+
+# Number of seconds listing indexes (see ``slim.listing``) are cached for.
+LISTING_INDEX_TIMEOUT = 60 * 5
+
+# Set to True once the translation group field
+# (``LanguageField(translation_group=True)``) is filled in for all the
+# existing records (see the ``slim_backfill_translation_groups`` management
+# command). Until then, records having no translation group are looked up
+# by ``translation_of`` as well.
+TRANSLATION_GROUPS_FILLED = False
@@ -0,0 +1,619 @@
+__title__ = 'slim.handlers'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2013-2017 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'SAVED_STATE_ATTR',
+    'SNAPSHOT_ATTR',
+    'TRANSLATION_GROUP_FIELD_NAME',
+    'URL_CACHE_ATTR',
+    'clear_url_cache',
+    'drop_listing_indexes',
+    'fill_translation_groups',
+    'get_changed_fields',
+    'get_group_pk',
+    'get_instance_group_pks',
+    'get_instance_listing_change',
+    'get_shared_fields',
+    'get_tracked_fields',
+    'get_url_fields',
+    'has_translation_group_field',
+    'invalidate_translation_group',
+    'invalidate_translation_groups',
+    'purge_translation_group_pages',
+    'purge_translation_groups_pages',
+    'push_shared_fields',
+    'remember_saved_state',
+    'run_now_and_on_commit',
+    'take_snapshot',
+    'update_translation_group',
+)
+
+import copy
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete
+
+from .bulk import get_bulk_context
+from .listing import get_listing_indexes
+
+# Name of the (optional) field holding the primary key of the original
+# translation. See ``slim.models.fields.LanguageField``.
+TRANSLATION_GROUP_FIELD_NAME = 'translation_group_pk'
+
+# Name of the instance attribute holding memoized URLs. See
+# ``slim.models.decorators.cached_auto_prepend_language``.
+URL_CACHE_ATTR = '_slim_url_cache'
+
+# Name of the instance attribute holding the translation group (and the URL)
+# the object had before being saved. See ``remember_saved_state``.
+SAVED_STATE_ATTR = '_slim_saved_state'
+
+# Name of the instance attribute holding values of the tracked fields, as
+# loaded (or last saved). See ``take_snapshot``.
+SNAPSHOT_ATTR = '_slim_snapshot'
+
+# Stands for values not loaded
+MISSING = object()
+
+# Fields tracked, by model. See ``get_tracked_fields``.
+_tracked_fields = {}
+
+
+def get_group_pk(instance):
+    """Get the primary key of the original translation of the instance.
+
+    :param instance: Instance of a model with ``LanguageField``.
+    :return mixed:
+    """
+    return instance.translation_of_id or instance.pk
+
+
+def has_translation_group_field(model):
+    """Check if model has the translation group field.
+
+    :param model: Model class.
+    :return bool:
+    """
+    for field in model._meta.fields:
+        if field.name == TRANSLATION_GROUP_FIELD_NAME:
+            return True
+    return False
+
+
+def get_url_fields(model):
+    """Get names of the fields ``get_absolute_url`` of the model depends on.
+
+    See ``url_fields`` of ``slim.models.fields.LanguageField``.
+
+    :param model: Model class.
+    :return tuple:
+    """
+    for field in model._meta.fields:
+        if getattr(field, 'url_fields', None):
+            return field.url_fields
+    return ()
+
+
+def get_shared_fields(model):
+    """Get names of the fields shared by all translations of the model.
+
+    See ``shared_fields`` of ``slim.models.fields.LanguageField``.
+
+    :param model: Model class.
+    :return tuple:
+    """
+    for field in model._meta.fields:
+        if getattr(field, 'shared_fields', None):
+            return field.shared_fields
+    return ()
+
+
+def get_tracked_fields(model):
+    """Get the fields slim tracks changes of.
+
+    :param model: Model class.
+    :return dict: Attribute names of the fields defining the translation
+        group (``'group'``), the language (``'language'``), the URL
+        (``'url'``: the language and the ``url_fields``, if specified), of
+        the ``shared_fields`` (``'shared'``) and of the fields listing
+        indexes are ordered by (``'listing'``). All of them (``'all'``),
+        mapped to the field names (``'names'``).
+    """
+    try:
+        return _tracked_fields[model]
+    except KeyError:
+        pass
+
+    opts = model._meta
+    language_names = [
+        field.name for field in opts.fields if hasattr(field, 'url_fields')
+    ]
+    url_names = []
+    if get_url_fields(model):
+        url_names.extend(language_names)
+        url_names.extend(get_url_fields(model))
+    listing_names = []
+    for index in get_listing_indexes(model):
+        if index.field_name not in listing_names:
+            listing_names.append(index.field_name)
+    names = {}
+    tracked = {}
+    for kind, kind_names in (('group', ['translation_of']),
+                             ('language', language_names),
+                             ('url', url_names),
+                             ('shared', get_shared_fields(model)),
+                             ('listing', listing_names)):
+        attnames = []
+        for name in kind_names:
+            attname = opts.get_field(name).attname
+            names[attname] = name
+            attnames.append(attname)
+        tracked[kind] = tuple(attnames)
+    tracked['all'] = tuple(names)
+    tracked['names'] = names
+
+    _tracked_fields[model] = tracked
+    return tracked
+
+
+def take_snapshot(sender, instance, **kwargs):
+    """Remember values of the tracked fields (see ``get_tracked_fields``).
+
+    Connected to the ``post_init`` and (as the last receiver) ``post_save``
+    signals of every model having a ``LanguageField``, so that changes are
+    told without queries (see ``get_changed_fields``). Fields not loaded
+    (deferred) are left out.
+    """
+    values = instance.__dict__
+    values.pop(SAVED_STATE_ATTR, None)
+    values[SNAPSHOT_ATTR] = dict(
+        (attname, values[attname])
+        for attname in get_tracked_fields(sender)['all']
+        if attname in values
+    )
+
+
+def get_changed_fields(instance, attnames, update_fields=None):
+    """Get the fields changed since the instance was loaded (or saved).
+
+    Compares the values with the ones remembered by ``take_snapshot``. No
+    queries are made. Fields not loaded (deferred) are not saved, thus
+    considered unchanged.
+
+    :param instance: Instance of a model with ``LanguageField``.
+    :param iterable attnames: Attribute names of the fields to check.
+    :param iterable update_fields: Names (or attribute names) of the fields
+        being saved, if not all of them.
+    :return tuple: Attribute names of the fields changed and of the fields
+        not known to be unchanged (loaded after the snapshot was taken).
+    """
+    values = instance.__dict__
+    snapshot = values.get(SNAPSHOT_ATTR, {})
+    names = get_tracked_fields(type(instance))['names']
+    if update_fields is not None:
+        update_fields = set(update_fields)
+
+    changed = []
+    unknown = []
+    for attname in attnames:
+        if update_fields is not None and attname not in update_fields \
+                and names[attname] not in update_fields:
+            continue
+        value = values.get(attname, MISSING)
+        if value is MISSING:
+            continue
+        old_value = snapshot.get(attname, MISSING)
+        if old_value is MISSING:
+            unknown.append(attname)
+        elif old_value != value:
+            changed.append(attname)
+    return changed, unknown
+
+
+def run_now_and_on_commit(func, using=None):
+    """Call ``func`` right away and, within a transaction, once more after
+    the transaction is committed.
+
+    Other processes may cache data read before the transaction is committed
+    (that is, the old data), thus shared caches are invalidated once more
+    after the commit (Django >= 1.9). Invalidating right away lets the
+    transaction see its own changes.
+
+    :param callable func:
+    :param str using: Database alias.
+    """
+    func()
+    if hasattr(transaction, 'on_commit') \
+            and transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(func, using=using)
+
+
+def invalidate_translation_groups(model, group_pks, using=None):
+    """Invalidate everything slim remembers about the translation groups.
+
+    Shared caches are dealt with using a single operation per kind (see
+    ``run_now_and_on_commit``).
+
+    :param model: Model class.
+    :param iterable group_pks: Primary keys of the original translations.
+    :param str using: Database alias.
+    """
+    from .cache import (
+        bump_group_version,
+        bump_group_versions,
+        invalidate_translation_maps,
+        is_cache_enabled
+    )
+    from .identity_map import get_identity_map
+
+    group_pks = [group_pk for group_pk in group_pks if group_pk is not None]
+    if not group_pks:
+        return
+
+    identity_map = get_identity_map()
+    if identity_map is not None:
+        for group_pk in group_pks:
+            identity_map.forget(model, group_pk)
+
+    def invalidate():
+        # Translation maps shared between processes
+        if is_cache_enabled():
+            invalidate_translation_maps(model, group_pks)
+
+        # Translation maps, cached fragments (see ``slim_cache`` template
+        # tag), conditional GET
+        if len(group_pks) == 1:
+            bump_group_version(model, group_pks[0])
+        else:
+            bump_group_versions(model, group_pks)
+
+    run_now_and_on_commit(invalidate, using=using)
+
+
+def purge_translation_groups_pages(model, group_pks, urls=(), using=None):
+    """Purge cached pages of the translation groups (if model has any).
+
+    See ``run_now_and_on_commit``.
+
+    :param model: Model class.
+    :param iterable group_pks: Primary keys of the original translations.
+    :param iterable urls: Additional URLs to purge.
+    :param str using: Database alias.
+    """
+    from .cache import purge_translation_group_pages as purge_pages
+
+    url_fields = get_url_fields(model)
+    if url_fields:
+        group_pks = [
+            group_pk for group_pk in group_pks if group_pk is not None
+        ]
+        run_now_and_on_commit(
+            lambda: purge_pages(model, group_pks, url_fields, urls=urls),
+            using=using
+        )
+
+
+def drop_listing_indexes(model, fields=None, languages=None, originals=True,
+                         using=None):
+    """Drop listing indexes of the model objects changed may move within
+    (to be rebuilt on next use).
+
+    Only indexes ordered by any of the fields changed are dropped (all of
+    them if the fields defining listings, the language or
+    ``translation_of``, are changed), and only for the languages of the
+    objects changed. Originals are listed in all languages lacking a
+    translation, thus indexes falling back to them are dropped for all
+    languages if any original is changed. Within ``slim.bulk``, indexes are
+    just recorded, to be dropped on exit. See
+    ``slim.listing.ListingIndex.drop`` and ``run_now_and_on_commit``. No
+    queries are made.
+
+    :param model: Model class.
+    :param iterable fields: Names (or attribute names) of the fields
+        changed. Defaults to any (objects created or deleted).
+    :param iterable languages: Languages of the objects changed (before and
+        after the change). Defaults to all languages.
+    :param bool originals: Whether any of the objects changed is (or was)
+        an original translation.
+    :param str using: Database alias.
+    """
+    tracked = get_tracked_fields(model)
+    if fields is not None:
+        fields = set(tracked['names'].get(field, field) for field in fields)
+        if fields & set(tracked['names'][attname] for attname
+                        in tracked['group'] + tracked['language']):
+            fields = None
+
+    indexes = {}
+    for index in get_listing_indexes(model):
+        if fields is not None and index.field_name not in fields:
+            continue
+        if languages is None or (originals and index.fallback):
+            indexes[index] = None
+        elif languages:
+            indexes[index] = set(languages)
+    if not indexes:
+        return
+
+    bulk_context = get_bulk_context()
+    if bulk_context is not None:
+        bulk_context.add_listing_indexes(indexes)
+    else:
+        run_now_and_on_commit(
+            lambda: [index.drop(index_languages)
+                     for index, index_languages in indexes.items()],
+            using=using
+        )
+
+
+def fill_translation_groups(model):
+    """Fill in the translation group field where it's not set yet.
+
+    Uses two ``UPDATE`` queries (one for originals, one for translations).
+
+    :param model: Model class.
+    """
+    if not has_translation_group_field(model):
+        return
+    queryset = model._default_manager.filter(
+        **{'%s__isnull' % TRANSLATION_GROUP_FIELD_NAME: True}
+    )
+    queryset.filter(translation_of__isnull=True) \
+            .update(**{TRANSLATION_GROUP_FIELD_NAME: F('pk')})
+    queryset.filter(translation_of__isnull=False) \
+            .update(**{TRANSLATION_GROUP_FIELD_NAME: F('translation_of')})
+
+
+def get_instance_group_pks(instance):
+    """Get primary keys of the translation groups the instance affects.
+
+    The current one and, if the instance has just been moved from another
+    translation group (see ``remember_saved_state``), the former one.
+
+    :param instance: Instance of a model with ``LanguageField``.
+    :return list:
+    """
+    group_pks = [get_group_pk(instance)]
+    state = instance.__dict__.get(SAVED_STATE_ATTR, {})
+    if state.get('group_pk', group_pks[0]) not in group_pks:
+        group_pks.append(state['group_pk'])
+    return group_pks
+
+
+def get_instance_listing_change(instance, created=False, deleted=False,
+                                update_fields=None):
+    """Tell which listings saving (or deleting) the instance may change.
+
+    Uses the snapshot (see ``take_snapshot``), thus shall be called before
+    it's taken again. No queries are made.
+
+    :param instance: Instance of a model with ``LanguageField``.
+    :param bool created: Whether the instance has just been created.
+    :param bool deleted: Whether the instance has just been deleted.
+    :param iterable update_fields: Names of the fields saved, if not all
+        of them.
+    :return dict: Keyword arguments of ``drop_listing_indexes``.
+    """
+    tracked = get_tracked_fields(type(instance))
+    values = instance.__dict__
+    states = [values]
+    fields = None
+    if not created:
+        # Values in the database (unless not known)
+        states.append(values.get(SNAPSHOT_ATTR, {}))
+        if not deleted:
+            changed, unknown = get_changed_fields(
+                instance,
+                tracked['listing'] + tracked['group'] + tracked['language'],
+                update_fields
+            )
+            fields = changed + unknown
+
+    # Not known ones stand for any
+    languages = set(
+        state.get(attname) for state in states
+        for attname in tracked['language']
+    )
+    if None in languages:
+        languages = None
+    originals = any(
+        state.get(attname) is None for state in states
+        for attname in tracked['group']
+    )
+    return {'fields': fields, 'languages': languages, 'originals': originals}
+
+
+def invalidate_translation_group(sender, instance, **kwargs):
+    """Invalidate everything slim remembers about the instance group.
+
+    Connected to ``post_save`` and ``post_delete`` signals of every model
+    having a ``LanguageField``. The translation group the instance has been
+    moved from (if so) is invalidated too, and so are the listing indexes
+    the instance may move within (see ``get_instance_listing_change``).
+    Within ``slim.bulk``, the groups are just recorded, to be invalidated
+    on exit.
+    """
+    # Available translations cached on the instance itself
+    instance.__dict__.pop('_slim_translation_set', None)
+
+    group_pks = get_instance_group_pks(instance)
+    using = instance._state.db
+    bulk_context = get_bulk_context()
+    if bulk_context is not None:
+        for group_pk in group_pks:
+            bulk_context.add_group(sender, group_pk)
+    else:
+        invalidate_translation_groups(sender, group_pks, using=using)
+    drop_listing_indexes(
+        sender,
+        using=using,
+        **get_instance_listing_change(
+            instance,
+            created=kwargs.get('created', False),
+            deleted=kwargs.get('signal') is post_delete,
+            update_fields=kwargs.get('update_fields')
+        )
+    )
+
+
+def remember_saved_state(sender, instance, raw=False, update_fields=None,
+                         **kwargs):
+    """Remember the translation group (and the URL) the object had before
+    being saved, if it changes.
+
+    Connected to the ``pre_save`` signal of every model having a
+    ``LanguageField``, so that the translation group the object is moved
+    from is invalidated as well, and so are cached pages of the old URL (if
+    ``url_fields`` are specified in the ``LanguageField``). Changes are told
+    using the snapshot (see ``take_snapshot``), without queries. Only values
+    of fields loaded after the snapshot was taken (deferred ones) are
+    fetched, using a single query. Within ``slim.bulk``, the former group
+    and URL are recorded, to be dealt with on exit.
+    """
+    values = instance.__dict__
+    values.pop(SAVED_STATE_ATTR, None)
+    if raw or instance._state.adding or instance.pk is None:
+        # Values given to the constructor, not the ones in the database
+        values.pop(SNAPSHOT_ATTR, None)
+        return
+
+    tracked = get_tracked_fields(sender)
+    changed, unknown = get_changed_fields(
+        instance, tracked['group'] + tracked['url'], update_fields
+    )
+    if not changed and not unknown:
+        return
+
+    snapshot = values.get(SNAPSHOT_ATTR, {})
+    old_values = dict((attname, snapshot[attname]) for attname in changed)
+    if unknown:
+        rows = list(
+            sender._base_manager.using(instance._state.db)
+                                .filter(pk=instance.pk)
+                                .values_list(*[tracked['names'][attname]
+                                               for attname in unknown])
+        )
+        if not rows:
+            return
+        for attname, old_value in zip(unknown, rows[0]):
+            if old_value != values[attname]:
+                old_values[attname] = old_value
+
+    state = {}
+    group_attname = tracked['group'][0]
+    if group_attname in old_values:
+        state['group_pk'] = old_values[group_attname] or instance.pk
+    if set(old_values) & set(tracked['url']):
+        from .cache import get_object_url
+
+        old = copy.copy(instance)
+        old.__dict__.update(old_values)
+        old.__dict__.pop(URL_CACHE_ATTR, None)
+        old_url = get_object_url(old)
+        if old_url is not None:
+            state['url'] = old_url
+    if not state:
+        return
+
+    bulk_context = get_bulk_context()
+    if bulk_context is not None:
+        # Dealt with on exit
+        if 'group_pk' in state:
+            bulk_context.add_group(sender, state['group_pk'])
+        if 'url' in state:
+            bulk_context.add_url(sender, state['url'])
+    else:
+        values[SAVED_STATE_ATTR] = state
+
+
+def purge_translation_group_pages(sender, instance, **kwargs):
+    """Purge cached pages of all the objects of the instance group.
+
+    Connected to ``post_save`` and ``post_delete`` signals of models having
+    ``url_fields`` specified in their ``LanguageField``. The URL the object
+    had before being saved and the translation group it has been moved from
+    (see ``remember_saved_state``) are purged too.
+    """
+    from .cache import get_object_url
+
+    # Deleted objects are not in the database any more
+    urls = set([get_object_url(instance)])
+    state = instance.__dict__.get(SAVED_STATE_ATTR, {})
+    if 'url' in state:
+        urls.add(state['url'])
+    urls.discard(None)
+    group_pks = get_instance_group_pks(instance)
+
+    bulk_context = get_bulk_context()
+    if bulk_context is not None:
+        for group_pk in group_pks:
+            bulk_context.add_group(sender, group_pk)
+        for url in urls:
+            bulk_context.add_url(sender, url)
+    else:
+        purge_translation_groups_pages(sender, group_pks, urls=urls,
+                                       using=instance._state.db)
+
+
+def clear_url_cache(sender, instance, **kwargs):
+    """Forget URLs memoized on the instance.
+
+    Connected to the ``post_save`` signal of models having the
+    ``LanguageField``.
+    """
+    instance.__dict__.pop(URL_CACHE_ATTR, None)
+
+
+def push_shared_fields(sender, instance, created=False, raw=False,
+                       update_fields=None, **kwargs):
+    """Copy shared fields of the original translation to its translations.
+
+    Connected to the ``post_save`` signal of models having ``shared_fields``
+    specified in their ``LanguageField``. A single ``UPDATE`` of the fields
+    changed is made (none for new originals, translations and saves not
+    changing the shared fields, see ``get_changed_fields``). Within
+    ``slim.bulk``, the original is just recorded, to be synced on exit.
+    Translations saved on their own are left as they are.
+    """
+    if raw or created or instance.translation_of_id is not None:
+        return
+
+    tracked = get_tracked_fields(sender)
+    changed, unknown = get_changed_fields(instance, tracked['shared'],
+                                          update_fields)
+    fields = [tracked['names'][attname] for attname in changed + unknown]
+    if not fields:
+        return
+
+    bulk_context = get_bulk_context()
+    if bulk_context is not None:
+        bulk_context.add_shared_group(sender, instance.pk)
+    else:
+        sender._default_manager.filter(translation_of=instance.pk).update(
+            **dict((field, getattr(instance, field)) for field in fields)
+        )
+        # Languages of the translations are not known without queries
+        drop_listing_indexes(sender, fields=fields, originals=False,
+                             using=instance._state.db)
+
+
+def update_translation_group(sender, instance, **kwargs):
+    """Make sure the translation group field is up to date.
+
+    Connected to the ``post_save`` signal of models having the translation
+    group field. Primary key of new originals isn't known until they are
+    saved, thus the value is stored with an extra ``UPDATE`` (within
+    ``slim.bulk``, a single ``UPDATE`` for all of them on exit).
+    """
+    group_pk = get_group_pk(instance)
+    if getattr(instance, TRANSLATION_GROUP_FIELD_NAME) != group_pk:
+        setattr(instance, TRANSLATION_GROUP_FIELD_NAME, group_pk)
+        bulk_context = get_bulk_context()
+        if bulk_context is not None:
+            bulk_context.add_ungrouped_model(sender)
+        else:
+            sender._default_manager \
+                  .filter(pk=instance.pk) \
+                  .update(**{TRANSLATION_GROUP_FIELD_NAME: group_pk})
@@ -7,8 +7,10 @@ __all__ = (
     'default_language',
     'get_languages',
     'get_languages_keys',
+    'get_languages_keys_set',
     'get_language_from_request',
     'get_languages_dict',
+    'reset_language_tables',
     'admin_change_url',
     'admin_add_url',
     'smart_resolve'
@@ -16,9 +18,26 @@ __all__ = (
 
 from django.conf import settings
 from django.core.urlresolvers import reverse
+from django.utils.functional import lazy
 from django.utils.translation import get_language_info
 
-from .settings import USE_LOCAL_LANGUAGE_NAMES
+try:
+    from django.core.signals import setting_changed
+except ImportError:
+    # Django < 1.8
+    from django.test.signals import setting_changed
+
+from six import text_type
+
+try:
+    from types import MappingProxyType
+except ImportError:
+    # Python 2
+    MappingProxyType = dict
+
+from .conf import get_setting
+
+_language_tables = None
 
 
 def get_default_language():
@@ -26,17 +45,25 @@ def get_default_language():
 
     :return str:
     """
-    return settings.LANGUAGES[0][0]
-default_language = get_default_language()
+    return _get_language_tables()['default']
 
 
-def get_languages():
-    """Get available languages.
+# Kept for backwards compatibility. Resolved on use, thus importing
+# ``slim`` does not require settings to be configured. Prefer
+# ``get_default_language``.
+default_language = lazy(get_default_language, text_type)()
+
 
-    :return iterable:
+def _build_language_tables():
+    """Build language tables out of ``LANGUAGES`` setting.
+
+    :return dict:
     """
-    if not USE_LOCAL_LANGUAGE_NAMES:
-        return settings.LANGUAGES
+    if not get_setting('USE_LOCAL_LANGUAGE_NAMES'):
+        languages = tuple(
+            (lang_code, lang_name)
+            for lang_code, lang_name in settings.LANGUAGES
+        )
     else:
         languages = []
         for lang_code, lang_name in settings.LANGUAGES:
@@ -45,34 +72,95 @@ def get_languages():
             except Exception as e:
                 pass
             languages.append((lang_code, lang_name))
-        return languages
+        languages = tuple(languages)
+
+    return {
+        'default': settings.LANGUAGES[0][0],
+        'languages': languages,
+        'keys': tuple(lang_code for lang_code, lang_name in languages),
+        'keys_set': frozenset(
+            lang_code for lang_code, lang_name in languages
+        ),
+        'dict': MappingProxyType(dict(languages)),
+    }
+
+
+def _get_language_tables():
+    """Get (cached) language tables.
+
+    :return dict:
+    """
+    global _language_tables
+    if _language_tables is None:
+        _language_tables = _build_language_tables()
+    return _language_tables
+
+
+def reset_language_tables(**kwargs):
+    """Drop cached language tables (to be rebuilt on next use).
+
+    Connected to the ``setting_changed`` signal.
+    """
+    global _language_tables
+    setting = kwargs.get('setting')
+    if setting is None \
+            or setting == 'LANGUAGES' \
+            or setting.startswith('SLIM_'):
+        _language_tables = None
+
+
+setting_changed.connect(reset_language_tables)
+
+
+def get_languages():
+    """Get available languages.
+
+    Computed once (until ``LANGUAGES`` or ``SLIM_*`` settings change).
+
+    :return tuple: Pairs of (language code, language name).
+    """
+    return _get_language_tables()['languages']
 
 
 def get_languages_keys():
     """Return just languages keys.
 
+    A new list is returned on each call (callers may modify it), built out
+    of the cached tuple. Use ``get_languages_keys_set`` for membership
+    checks.
+
     :return list:
     """
-    return [key for key, name in get_languages()]
+    return list(_get_language_tables()['keys'])
+
+
+def get_languages_keys_set():
+    """Return languages keys as a set, for fast membership checks.
+
+    :return frozenset:
+    """
+    return _get_language_tables()['keys_set']
 
 
 def get_languages_dict():
     """Return just languages dict.
 
-    :return dict:
+    :return dict: Read-only mapping of language codes to language names.
     """
-    return dict(get_languages())
+    return _get_language_tables()['dict']
 
 
-def get_language_from_request(request, default=default_language):
+def get_language_from_request(request, default=None):
     """Get language from HttpRequest.
 
     :param django.http.HttpRequest request:
-    :param str default:
+    :param str default: Defaults to the default language.
     :return str:
     """
     if hasattr(request, 'LANGUAGE_CODE') and request.LANGUAGE_CODE:
         return request.LANGUAGE_CODE
+    elif default is None:
+        return get_default_language()
     else:
         return default
 
@@ -0,0 +1,118 @@
+__title__ = 'slim.identity_map'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2013-2017 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'MISSING',
+    'TranslationIdentityMap',
+    'activate',
+    'deactivate',
+    'get_identity_map',
+    'translation_identity_map',
+)
+
+import threading
+from contextlib import contextmanager
+
+_local = threading.local()
+
+# Returned by ``TranslationIdentityMap.lookup`` when nothing is known yet
+# about the language asked for. Note, that ``None`` is a valid (cached) value,
+# which means "there is no translation in this language".
+MISSING = object()
+
+
+class TranslationIdentityMap(object):
+    """Translations resolved during a single request.
+
+    Entries are keyed by (model, original pk). Each entry maps a language
+    code either to the translated object or to None, if it is known that
+    the object has not been translated into that language.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._groups = {}
+
+    def lookup(self, model, pk, language):
+        """Look up the translation of the given original in ``language``.
+
+        :param model: Model class.
+        :param pk: Primary key of the original translation.
+        :param str language:
+        :return mixed: Translated object, None (for known misses) or
+            ``MISSING`` if nothing has been recorded yet.
+        """
+        group = self._groups.get((model._meta.concrete_model, pk))
+        if group is None:
+            return MISSING
+        return group.get(language, MISSING)
+
+    def remember(self, model, pk, language, translation):
+        """Record the translation of the given original in ``language``.
+
+        :param model: Model class.
+        :param pk: Primary key of the original translation.
+        :param str language:
+        :param translation: Translated object or None for a miss.
+        """
+        key = (model._meta.concrete_model, pk)
+        self._groups.setdefault(key, {})[language] = translation
+
+    def forget(self, model, pk):
+        """Forget everything recorded for the given translation group.
+
+        :param model: Model class.
+        :param pk: Primary key of the original translation.
+        """
+        self._groups.pop((model._meta.concrete_model, pk), None)
+
+    def clear(self):
+        """Forget everything."""
+        self._groups.clear()
+
+
+def get_identity_map():
+    """Get the currently active identity map.
+
+    :return slim.identity_map.TranslationIdentityMap: Or None if no identity
+        map is active in the current thread.
+    """
+    return getattr(_local, 'identity_map', None)
+
+
+def activate():
+    """Activate a new (empty) identity map in the current thread.
+
+    :return slim.identity_map.TranslationIdentityMap:
+    """
+    _local.identity_map = TranslationIdentityMap()
+    return _local.identity_map
+
+
+def deactivate():
+    """Deactivate the identity map of the current thread."""
+    _local.identity_map = None
+
+
+@contextmanager
+def translation_identity_map():
+    """Context manager for using the identity map outside of requests.
+
+    Nested usage re-uses the identity map that is already active.
+
+    Example::
+
+        with translation_identity_map():
+            for item in items:
+                item.get_translation_for('nl')
+    """
+    if get_identity_map() is not None:
+        yield get_identity_map()
+        return
+
+    identity_map = activate()
+    try:
+        yield identity_map
+    finally:
+        deactivate()
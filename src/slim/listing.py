@@ -0,0 +1,283 @@
+__title__ = 'slim.listing'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2013-2017 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'DEFAULT_LISTING_INDEX_SIZE',
+    'ListingIndex',
+    'get_listing_index',
+    'get_listing_indexes',
+)
+
+import random
+
+from django.utils.translation import get_language
+
+from .conf import settings as slim_settings
+
+# Number of objects kept in each listing index.
+DEFAULT_LISTING_INDEX_SIZE = 1000
+
+
+class ListingIndex(object):
+    """Precomputed ordered listing of the objects in a language.
+
+    For each language, primary keys of the first ``size`` objects of the
+    listing (see ``queryset``) are kept in the cache, along with the values
+    they are ordered by. Pages within are fetched with ``in_bulk``, thus
+    cost a single primary key lookup no matter how big the table is. Pages
+    beyond are fetched from the database as usual.
+
+    Indexes are dropped (to be rebuilt on next use) by changing their
+    generation, only when objects changed may move within them (see
+    ``slim.handlers.drop_listing_indexes``): for the languages of the
+    objects, or for all languages. Indexes built from data read before the
+    change are stored under the old generation, thus are never used.
+    Indexes are cached for
+    ``SLIM_LISTING_INDEX_TIMEOUT`` seconds. Use ``listing_indexes`` argument
+    of the ``slim.models.fields.LanguageField`` to register indexes.
+
+    Example::
+
+        index = get_listing_index(FooItem, '-date_published')
+        items = index.get_page('nl', number=1, per_page=20)
+    """
+
+    def __init__(self, model, ordering, size=DEFAULT_LISTING_INDEX_SIZE,
+                 fallback=True):
+        """Constructor.
+
+        :param model: Model class.
+        :param str ordering: Name of the field to order by, prefixed with
+            "-" for descending order. Ties are ordered by primary key.
+        :param int size: Number of objects to keep in the index.
+        :param bool fallback: If set to True, listings hold one object per
+            translation group, falling back to the original translation
+            (see ``slim.models.managers.SlimQuerySet.best_translations``).
+            Otherwise, just the objects in the language.
+        """
+        self.model = model
+        self.ordering = ordering
+        self.descending = ordering.startswith('-')
+        self.field_name = ordering.lstrip('-')
+        self.size = size
+        self.fallback = fallback
+
+    def __repr__(self):
+        return '<ListingIndex %s.%s %s>' % (
+            self.model._meta.app_label,
+            self.model._meta.object_name,
+            self.ordering
+        )
+
+    def get_generation_key(self, language=None):
+        """Get cache key of the generation of the indexes.
+
+        :param str language: If given, key of the generation of the index of
+            the language. Otherwise, of the indexes of all languages.
+        :return str:
+        """
+        key = 'slim.listing.%s.%s.%s.%s' % (
+            self.model._meta.app_label,
+            self.model._meta.object_name.lower(),
+            self.ordering,
+            int(self.fallback)
+        )
+        if language is not None:
+            key = '%s.%s' % (key, language)
+        return key
+
+    def get_generation(self, language):
+        """Get the generation of the index of the language.
+
+        Changed whenever the index (or the indexes of all languages) is
+        dropped. Uses a single cache operation.
+
+        :param str language:
+        :return str:
+        """
+        from .cache import get_cache
+
+        cache = get_cache()
+        keys = [self.get_generation_key(), self.get_generation_key(language)]
+        values = cache.get_many(keys)
+        generations = []
+        for key in keys:
+            generation = values.get(key)
+            if generation is None:
+                generation = '%x' % random.getrandbits(64)
+                if not cache.add(key, generation,
+                                 slim_settings.CACHE_VERSION_TIMEOUT):
+                    generation = cache.get(key, generation)
+            generations.append(generation)
+        return '.'.join(generations)
+
+    def get_cache_key(self, language, generation=None):
+        """Get cache key of the index.
+
+        :param str language:
+        :param str generation: Defaults to the current generation.
+        :return str:
+        """
+        if generation is None:
+            generation = self.get_generation(language)
+        return '%s.%s.%s' % (self.get_generation_key(), generation, language)
+
+    def queryset(self, language):
+        """Get the listing from the database.
+
+        :param str language:
+        :return django.db.models.query.QuerySet:
+        """
+        from .models.managers import SlimQuerySet
+
+        queryset = SlimQuerySet(self.model)
+        if self.fallback:
+            queryset = queryset.best_translations(language)
+        else:
+            queryset = queryset.filter(language=language)
+        return queryset.order_by(self.ordering,
+                                 '-pk' if self.descending else 'pk')
+
+    def build(self, language, generation=None):
+        """Build the index of the language and store it in the cache.
+
+        Uses a single query.
+
+        :param str language:
+        :param str generation: Generation read before the query. Defaults
+            to the current generation.
+        :return dict:
+        """
+        from .cache import get_cache
+
+        if generation is None:
+            generation = self.get_generation(language)
+        rows = list(
+            self.queryset(language).values_list(
+                self.field_name, 'pk', 'translation_of'
+            )[:self.size + 1]
+        )
+        index = {
+            # The whole listing fits into the index
+            'complete': len(rows) <= self.size,
+            # (value, pk, group pk) triples
+            'entries': [
+                (value, pk, translation_of_pk or pk)
+                for value, pk, translation_of_pk in rows[:self.size]
+            ],
+        }
+        get_cache().set(self.get_cache_key(language, generation),
+                        index,
+                        slim_settings.LISTING_INDEX_TIMEOUT)
+        return index
+
+    def get(self, language):
+        """Get the index of the language, building it if necessary.
+
+        :param str language:
+        :return dict:
+        """
+        from .cache import get_cache
+
+        generation = self.get_generation(language)
+        index = get_cache().get(self.get_cache_key(language, generation))
+        if index is None:
+            index = self.build(language, generation)
+        return index
+
+    def drop(self, languages=None):
+        """Drop the indexes (to be rebuilt on next use).
+
+        Uses a single cache operation.
+
+        :param iterable languages: Defaults to all languages.
+        """
+        from .cache import get_cache
+
+        if languages is None:
+            keys = [self.get_generation_key()]
+        else:
+            keys = [self.get_generation_key(language)
+                    for language in languages]
+        get_cache().set_many(
+            dict((key, '%x' % random.getrandbits(64)) for key in keys),
+            slim_settings.CACHE_VERSION_TIMEOUT
+        )
+
+    def get_pks(self, language, offset, limit):
+        """Get primary keys of the objects in the listing.
+
+        :param str language:
+        :param int offset:
+        :param int limit:
+        :return list: Or None if not within the index.
+        """
+        index = self.get(language)
+        if offset + limit > len(index['entries']) and not index['complete']:
+            return None
+        return [
+            pk for value, pk, group_pk
+            in index['entries'][offset:offset + limit]
+        ]
+
+    def get_objects(self, language, offset, limit):
+        """Get objects of the listing.
+
+        Costs a single ``in_bulk`` query within the index.
+
+        :param str language:
+        :param int offset:
+        :param int limit:
+        :return list:
+        """
+        pks = self.get_pks(language, offset, limit)
+        if pks is None:
+            return list(self.queryset(language)[offset:offset + limit])
+
+        objects = self.model._default_manager.in_bulk(pks)
+        return [objects[pk] for pk in pks if pk in objects]
+
+    def get_page(self, language=None, number=1, per_page=20):
+        """Get objects of a page of the listing.
+
+        :param str language: Defaults to the currently active language.
+        :param int number: Page number, starting from 1.
+        :param int per_page: Number of objects per page.
+        :return list:
+        """
+        if language is None:
+            language = get_language()
+        return self.get_objects(language, (number - 1) * per_page, per_page)
+
+
+def get_listing_indexes(model):
+    """Get listing indexes registered for the model.
+
+    See ``listing_indexes`` of ``slim.models.fields.LanguageField``.
+
+    :param model: Model class.
+    :return list:
+    """
+    for field in model._meta.fields:
+        if getattr(field, 'listing_indexes', None):
+            return field.get_listing_indexes()
+    return []
+
+
+def get_listing_index(model, ordering):
+    """Get listing index registered for the model.
+
+    :param model: Model class.
+    :param str ordering: Ordering, as given to the ``LanguageField``.
+    :return slim.listing.ListingIndex:
+    :raise LookupError: If no such index is registered.
+    """
+    for index in get_listing_indexes(model):
+        if index.ordering == ordering:
+            return index
+    raise LookupError(
+        "No listing index %s registered for %s." % (
+            ordering, model._meta.object_name
+        )
+    )
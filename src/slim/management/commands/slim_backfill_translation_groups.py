@@ -0,0 +1,169 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from nine import versions
+
+from ...handlers import (
+    TRANSLATION_GROUP_FIELD_NAME,
+    has_translation_group_field
+)
+from ...utils import get_model, get_slim_models
+
+__title__ = 'slim.management.commands.slim_backfill_translation_groups'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2013-2017 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = ('Command',)
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+class Command(BaseCommand):
+    """Fill in the translation group field of existing records.
+
+    Records are updated in batches of ``--batch-size`` (in primary key
+    order), using a ``SELECT`` and two ``UPDATE`` queries per batch (one for
+    originals, one for translations). The command can safely be interrupted
+    and run again. Once done, set ``SLIM_TRANSLATION_GROUPS_FILLED`` to True.
+
+    Usage::
+
+        ./manage.py slim_backfill_translation_groups
+        ./manage.py slim_backfill_translation_groups foo.FooItem
+        ./manage.py slim_backfill_translation_groups --batch-size=50000
+    """
+
+    help = "Fill in the translation group field of existing records."
+
+    if versions.DJANGO_LTE_1_7:
+        args = '[app_label.ModelName ...]'
+        option_list = BaseCommand.option_list + (
+            make_option('--batch-size',
+                        action='store',
+                        dest='batch_size',
+                        type='int',
+                        default=DEFAULT_BATCH_SIZE,
+                        help="Number of records per batch."),
+            make_option('--all',
+                        action='store_true',
+                        dest='all',
+                        default=False,
+                        help="Update all records, not only those missing "
+                             "the translation group."),
+        )
+
+    def add_arguments(self, parser):
+        """Add arguments."""
+        parser.add_argument('models',
+                            nargs='*',
+                            metavar='app_label.ModelName',
+                            help="Models to process. Defaults to all models "
+                                 "having the translation group field.")
+        parser.add_argument('--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            type=int,
+                            default=DEFAULT_BATCH_SIZE,
+                            help="Number of records per batch.")
+        parser.add_argument('--all',
+                            action='store_true',
+                            dest='all',
+                            default=False,
+                            help="Update all records, not only those missing "
+                                 "the translation group.")
+
+    def get_models(self, labels):
+        """Get models to process.
+
+        :param iterable labels: Model labels (``app_label.ModelName``).
+        :return list:
+        """
+        if not labels:
+            return [
+                model
+                for model
+                in get_slim_models()
+                if has_translation_group_field(model)
+            ]
+
+        models = []
+        for label in labels:
+            try:
+                app_label, model_name = label.split('.')
+            except ValueError:
+                raise CommandError(
+                    "Invalid model label %s. Use app_label.ModelName "
+                    "format." % label
+                )
+            model = get_model(app_label, model_name)
+            if model is None:
+                raise CommandError("Unknown model %s." % label)
+            if not has_translation_group_field(model):
+                raise CommandError(
+                    "Model %s has no translation group field. Use "
+                    "LanguageField(translation_group=True)." % label
+                )
+            models.append(model)
+        return models
+
+    def backfill(self, model, batch_size, update_all, verbosity):
+        """Backfill the translation group field of the model given.
+
+        Batches are taken in primary key order, starting after the last
+        primary key of the previous batch (thus, gaps in primary keys and
+        non-integer primary keys are fine).
+
+        :return int: Number of records updated.
+        """
+        queryset = model._default_manager.order_by('pk')
+        if not update_all:
+            queryset = queryset.filter(
+                **{'%s__isnull' % TRANSLATION_GROUP_FIELD_NAME: True}
+            )
+
+        updated = 0
+        last_pk = None
+        while True:
+            pending = queryset
+            if last_pk is not None:
+                pending = pending.filter(pk__gt=last_pk)
+            pks = list(pending.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            last_pk = pks[-1]
+
+            batch = model._default_manager.filter(pk__in=pks)
+            updated += batch.filter(translation_of__isnull=True) \
+                            .update(**{TRANSLATION_GROUP_FIELD_NAME: F('pk')})
+            updated += batch.filter(translation_of__isnull=False) \
+                            .update(**{TRANSLATION_GROUP_FIELD_NAME:
+                                       F('translation_of')})
+
+            if verbosity > 1:
+                self.stdout.write(
+                    "%s: processed primary keys up to %s (%s updated)" % (
+                        model._meta.object_name, last_pk, updated
+                    )
+                )
+
+        return updated
+
+    def handle(self, *args, **options):
+        """Handle."""
+        labels = options.get('models') or args
+        batch_size = options.get('batch_size') or DEFAULT_BATCH_SIZE
+        verbosity = int(options.get('verbosity', 1))
+
+        for model in self.get_models(labels):
+            updated = self.backfill(model,
+                                    batch_size=batch_size,
+                                    update_all=options.get('all', False),
+                                    verbosity=verbosity)
+            if verbosity > 0:
+                self.stdout.write(
+                    "%s: %s records updated" % (
+                        model._meta.object_name, updated
+                    )
+                )
@@ -0,0 +1,259 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+
+from nine import versions
+
+from ...conf import settings as slim_settings
+from ...cache import (
+    build_translation_maps,
+    get_cache,
+    get_group_versions,
+    get_translation_map_key,
+    is_cache_enabled
+)
+from ...helpers import get_languages_keys
+from ...utils import get_model, get_slim_models
+
+__title__ = 'slim.management.commands.slim_warm_cache'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2013-2017 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = ('Command',)
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class Command(BaseCommand):
+    """Store translation maps of existing records in the cache.
+
+    Records are streamed from the database in chunks of ``--chunk-size``.
+    For each chunk, translation maps of the translation groups are built
+    using a single query and stored using a single cache operation.
+
+    Usage::
+
+        ./manage.py slim_warm_cache
+        ./manage.py slim_warm_cache foo.FooItem --languages=en,nl
+        ./manage.py slim_warm_cache --recent=1000
+    """
+
+    help = "Store translation maps of existing records in the cache."
+
+    if versions.DJANGO_LTE_1_7:
+        args = '[app_label.ModelName ...]'
+        option_list = BaseCommand.option_list + (
+            make_option('--chunk-size',
+                        action='store',
+                        dest='chunk_size',
+                        type='int',
+                        default=DEFAULT_CHUNK_SIZE,
+                        help="Number of translation groups per chunk."),
+            make_option('--languages',
+                        action='store',
+                        dest='languages',
+                        default=None,
+                        help="Comma separated language codes. Only "
+                             "translation groups having objects in these "
+                             "languages are processed."),
+            make_option('--recent',
+                        action='store',
+                        dest='recent',
+                        type='int',
+                        default=None,
+                        help="Process the given number of the most recently "
+                             "updated translation groups only."),
+        )
+
+    def add_arguments(self, parser):
+        """Add arguments."""
+        parser.add_argument('models',
+                            nargs='*',
+                            metavar='app_label.ModelName',
+                            help="Models to process. Defaults to all models "
+                                 "having a LanguageField.")
+        parser.add_argument('--chunk-size',
+                            action='store',
+                            dest='chunk_size',
+                            type=int,
+                            default=DEFAULT_CHUNK_SIZE,
+                            help="Number of translation groups per chunk.")
+        parser.add_argument('--languages',
+                            action='store',
+                            dest='languages',
+                            default=None,
+                            help="Comma separated language codes. Only "
+                                 "translation groups having objects in "
+                                 "these languages are processed.")
+        parser.add_argument('--recent',
+                            action='store',
+                            dest='recent',
+                            type=int,
+                            default=None,
+                            help="Process the given number of the most "
+                                 "recently updated translation groups only.")
+
+    def get_models(self, labels):
+        """Get models to process.
+
+        :param iterable labels: Model labels (``app_label.ModelName``).
+        :return list:
+        """
+        if not labels:
+            return get_slim_models()
+
+        slim_models = get_slim_models()
+        models = []
+        for label in labels:
+            try:
+                app_label, model_name = label.split('.')
+            except ValueError:
+                raise CommandError(
+                    "Invalid model label %s. Use app_label.ModelName "
+                    "format." % label
+                )
+            model = get_model(app_label, model_name)
+            if model is None:
+                raise CommandError("Unknown model %s." % label)
+            if model not in slim_models:
+                raise CommandError(
+                    "Model %s has no LanguageField." % label
+                )
+            models.append(model)
+        return models
+
+    def get_languages(self, value):
+        """Get languages to process.
+
+        :param str value: Comma separated language codes.
+        :return list: Or None if all languages shall be processed.
+        """
+        if not value:
+            return None
+
+        languages = [
+            language.strip() for language in value.split(',')
+            if language.strip()
+        ]
+        languages_keys = get_languages_keys()
+        for language in languages:
+            if language not in languages_keys:
+                raise CommandError("Unknown language %s." % language)
+        return languages
+
+    def iter_group_pks(self, model, languages=None, recent=None,
+                       chunk_size=DEFAULT_CHUNK_SIZE):
+        """Stream primary keys of the original translations to process.
+
+        Unless ``languages`` are given, only originals are streamed (one
+        row per translation group), thus nothing is kept in memory.
+        Otherwise, any translation may stand for its group, so groups
+        already yielded are remembered in order to yield each once.
+
+        :return iterable: Each translation group is yielded once.
+        """
+        queryset = model._default_manager.all()
+        if languages:
+            queryset = queryset.filter(language__in=languages)
+        else:
+            queryset = queryset.filter(translation_of__isnull=True)
+
+        if recent:
+            field_names = [field.name for field in model._meta.fields]
+            if slim_settings.LAST_MODIFIED_FIELD in field_names:
+                queryset = queryset.order_by(
+                    '-%s' % slim_settings.LAST_MODIFIED_FIELD, '-pk'
+                )
+            else:
+                queryset = queryset.order_by('-pk')
+        else:
+            queryset = queryset.order_by()
+
+        queryset = queryset.values_list('pk', 'translation_of')
+        if versions.DJANGO_GTE_2_0:
+            rows = queryset.iterator(chunk_size=chunk_size)
+        else:
+            rows = queryset.iterator()
+
+        seen = set() if languages else None
+        yielded = 0
+        for pk, translation_of_pk in rows:
+            group_pk = translation_of_pk or pk
+            if seen is not None:
+                if group_pk in seen:
+                    continue
+                seen.add(group_pk)
+            yield group_pk
+            yielded += 1
+            if recent and yielded >= recent:
+                return
+
+    def warm(self, model, languages=None, recent=None,
+             chunk_size=DEFAULT_CHUNK_SIZE, verbosity=1):
+        """Store translation maps of the model given in the cache.
+
+        :return int: Number of translation maps stored.
+        """
+        cache = get_cache()
+        stored = 0
+
+        def store(group_pks):
+            # Read before building, see ``slim.cache.get_translation_map``
+            versions = get_group_versions(model, group_pks)
+            translation_maps = build_translation_maps(model, group_pks)
+            cache.set_many(
+                dict(
+                    (get_translation_map_key(model, group_pk),
+                     (versions[group_pk], translation_map))
+                    for group_pk, translation_map
+                    in translation_maps.items()
+                ),
+                slim_settings.CACHE_TIMEOUT
+            )
+            return len(translation_maps)
+
+        chunk = []
+        for group_pk in self.iter_group_pks(model,
+                                            languages=languages,
+                                            recent=recent,
+                                            chunk_size=chunk_size):
+            chunk.append(group_pk)
+            if len(chunk) >= chunk_size:
+                stored += store(chunk)
+                chunk = []
+                if verbosity > 1:
+                    self.stdout.write(
+                        "%s: %s translation maps stored" % (
+                            model._meta.object_name, stored
+                        )
+                    )
+        if chunk:
+            stored += store(chunk)
+
+        return stored
+
+    def handle(self, *args, **options):
+        """Handle."""
+        if not is_cache_enabled():
+            raise CommandError(
+                "Translation maps are not cached. Set SLIM_USE_CACHE to "
+                "True first."
+            )
+
+        labels = options.get('models') or args
+        chunk_size = options.get('chunk_size') or DEFAULT_CHUNK_SIZE
+        languages = self.get_languages(options.get('languages'))
+        verbosity = int(options.get('verbosity', 1))
+
+        for model in self.get_models(labels):
+            stored = self.warm(model,
+                               languages=languages,
+                               recent=options.get('recent'),
+                               chunk_size=chunk_size,
+                               verbosity=verbosity)
+            if verbosity > 0:
+                self.stdout.write(
+                    "%s: %s translation maps stored" % (
+                        model._meta.object_name, stored
+                    )
+                )
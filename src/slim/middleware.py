@@ -0,0 +1,142 @@
+__title__ = 'slim.middleware'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2013-2017 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'TranslationGroupPageCacheMiddleware',
+    'TranslationIdentityMapMiddleware',
+)
+
+try:
+    from django.utils.deprecation import MiddlewareMixin
+except ImportError:
+    MiddlewareMixin = object
+
+from django.utils.cache import cc_delim_re, has_vary_header
+
+from nine import versions
+
+from .conf import settings as slim_settings
+from .cache import (
+    get_cache,
+    get_page_cache_key,
+    get_page_path_key,
+    new_page_path_entry
+)
+from .identity_map import activate, deactivate
+
+
+class TranslationIdentityMapMiddleware(MiddlewareMixin):
+    """Keeps a translation identity map for the lifetime of a request.
+
+    While active, ``Slim.get_translation_for`` looks up every
+    (original, language) pair in the database at most once per request.
+    """
+
+    def process_request(self, request):
+        """Start with an empty identity map."""
+        activate()
+
+    def process_response(self, request, response):
+        """Throw the identity map away."""
+        deactivate()
+        return response
+
+
+class TranslationGroupPageCacheMiddleware(MiddlewareMixin):
+    """Caches pages of objects, purged when any translation changes.
+
+    Only responses marked with ``slim.cache.tag_translation_group_page``
+    are cached (for ``SLIM_PAGE_CACHE_TIMEOUT`` seconds). Pages are keyed by
+    their path, host and the values of the request headers listed in
+    ``Vary``, thus are meant for URLs holding the language (see
+    ``slim.models.decorators.auto_prepend_language``). Cached pages of all
+    the translations are purged at once whenever any of them is saved or
+    deleted (see ``url_fields`` of ``slim.models.fields.LanguageField``).
+
+    Requests of authenticated users are never cached (nor served from the
+    cache), neither are private responses and responses varying on
+    cookies. Shall be listed after the ``AuthenticationMiddleware``,
+    otherwise nothing is cached.
+    """
+
+    def _is_cacheable_request(self, request):
+        """Only plain GET (and HEAD) requests of anonymous users are served
+        from the cache.
+
+        Requests without ``user`` (the middleware listed before the
+        ``AuthenticationMiddleware``) are not, since the user isn't known.
+        """
+        if request.method not in ('GET', 'HEAD') \
+                or request.META.get('QUERY_STRING'):
+            return False
+
+        user = getattr(request, 'user', None)
+        if user is None:
+            return False
+        if versions.DJANGO_GTE_1_10:
+            return not user.is_authenticated
+        return not user.is_authenticated()
+
+    def _is_cacheable_response(self, response):
+        """Only public, successful responses, same for all users, are
+        cached."""
+        if response.status_code != 200 \
+                or getattr(response, 'streaming', False) \
+                or response.cookies \
+                or has_vary_header(response, 'Cookie') \
+                or has_vary_header(response, '*'):
+            return False
+
+        directives = cc_delim_re.split(response.get('Cache-Control', ''))
+        return 'private' not in [
+            directive.strip().lower() for directive in directives
+        ]
+
+    def _get_vary_headers(self, response):
+        """Get names of the request headers the response varies on.
+
+        :return tuple: Names, as in ``request.META``.
+        """
+        if not response.has_header('Vary'):
+            return ()
+        return tuple(sorted(set(
+            'HTTP_' + header.upper().replace('-', '_')
+            for header in cc_delim_re.split(response['Vary'])
+            if header
+        )))
+
+    def process_request(self, request):
+        """Serve the page from the cache."""
+        if not self._is_cacheable_request(request):
+            return None
+
+        cache = get_cache()
+        entry = cache.get(get_page_path_key(request.path))
+        if entry is None:
+            return None
+        response = cache.get(get_page_cache_key(request, entry))
+        # Served from the cache, not to be stored again
+        request._slim_page_cached = response is not None
+        return response
+
+    def process_response(self, request, response):
+        """Cache marked pages."""
+        if getattr(response, '_slim_translation_group', None) is None \
+                or getattr(request, '_slim_page_cached', False) \
+                or not self._is_cacheable_request(request) \
+                or not self._is_cacheable_response(response):
+            return response
+
+        cache = get_cache()
+        path_key = get_page_path_key(request.path)
+        headers = self._get_vary_headers(response)
+        entry = cache.get(path_key)
+        if entry is None or entry[1] != headers:
+            entry = new_page_path_entry(headers)
+            cache.set(path_key, entry, slim_settings.PAGE_CACHE_TIMEOUT)
+
+        cache.set(get_page_cache_key(request, entry),
+                  response,
+                  slim_settings.PAGE_CACHE_TIMEOUT)
+        return response
@@ -1,22 +1,35 @@
 from six import PY3, text_type
 
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
 
 from ..helpers import (
-    get_languages,
+    get_languages_dict,
     # default_language,
     get_languages_keys,
+    get_languages_keys_set,
     admin_change_url,
     admin_add_url
 )
-from ..translations import is_primary_language
+from ..translations import get_fallback_chain, is_primary_language
+from .managers import (
+    SlimManager,
+    SlimQuerySet,
+    build_translation_groups,
+    get_translation_group_lookup
+)
 
 __title__ = 'slim.models'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
 __copyright__ = '2013-2017 Artur Barseghyan'
 __license__ = 'GPL 2.0/LGPL 2.1'
-__all__ = ('Slim', 'SlimBaseModel')
+__all__ = (
+    'Slim',
+    'SlimBaseModel',
+    'SlimManager',
+    'SlimQuerySet',
+)
 
 
 class Slim(object):
@@ -38,25 +51,139 @@ class Slim(object):
         """
         return True
 
+    def _get_translation_group(self):
+        """Get the translation group of current object if already loaded.
+
+        The translation group is considered to be loaded if the queryset
+        used ``with_translation_groups`` or if translations of the original
+        translation have been prefetched (``prefetch_related('translations')``
+        for originals, ``select_related('translation_of')`` along with
+        ``prefetch_related('translation_of__translations')`` for
+        translations).
+
+        :return list: All objects of the translation group, the original
+            translation being the first one. None if not loaded.
+        """
+        group = getattr(self, '_slim_translation_group', None)
+        if group is not None:
+            return group
+
+        if is_primary_language(self.language):
+            original_translation = self
+        else:
+            field = self._meta.get_field('translation_of')
+            if hasattr(field, 'is_cached'):
+                is_cached = field.is_cached(self)
+            else:
+                is_cached = hasattr(self, field.get_cache_name())
+            if not is_cached:
+                return None
+            original_translation = self.translation_of
+            if original_translation is None:
+                return None
+
+        prefetched_objects = getattr(
+            original_translation, '_prefetched_objects_cache', {}
+        )
+        if 'translations' not in prefetched_objects:
+            return None
+        return [original_translation] + \
+            list(prefetched_objects['translations'])
+
     def available_translations(self):
-        """Returnavailable translations.
+        """Return available translations.
 
-        :return iterable: At this moment a list of objects.
+        :return slim.models.groups.TranslationSet: Lazy set of translations,
+            fetched (using at most one query) on first use and cached on the
+            object.
         """
+        translation_set = getattr(self, '_slim_translation_set', None)
+        if translation_set is None:
+            from .groups import TranslationSet
+
+            translation_set = TranslationSet(self)
+            self._slim_translation_set = translation_set
+        return translation_set
+
+    def _fetch_available_translations(self):
+        """Fetch available translations.
+
+        Used by the ``slim.models.groups.TranslationSet``.
+
+        :return list: Original translation (if current object is not the
+            original translation) first.
+        """
+        from ..cache import is_cache_enabled
+
         # New, unsaved pages have no translations
         if not self.id:
             return []
+
+        group = self._get_translation_group()
+        if group is not None:
+            if is_primary_language(self.language):
+                return [obj for obj in group if obj.pk != self.pk]
+            elif self.translation_of_id:
+                return [obj for obj in group if obj.language != self.language]
+            return []
+
+        if is_primary_language(self.language) or self.translation_of_id:
+            if is_cache_enabled():
+                return self._fetch_cached_available_translations()
+            return sorted(
+                self._get_available_translations_queryset(),
+                key=lambda obj: obj.pk != self.translation_of_id
+            )
+        return []
+
+    def _fetch_cached_available_translations(self):
+        """Fetch available translations using the shared translation map.
+
+        No queries are made if the translation map is cached and there are
+        no other translations.
+
+        :return list: Original translation first.
+        """
+        from ..cache import get_cached_translations, get_translation_map
+        from ..handlers import get_group_pk
+
+        group_pk = get_group_pk(self)
+        languages = [
+            language
+            for language
+            in get_translation_map(self.__class__, group_pk)
+            if language != self.language
+        ]
+        if not languages:
+            return []
+        translations = get_cached_translations(
+            self.__class__, group_pk, languages
+        )
+        return sorted(
+            [obj for obj in translations.values() if obj is not None],
+            key=lambda obj: obj.pk != group_pk
+        )
+
+    def _get_available_translations_queryset(self):
+        """Get queryset of available translations.
+
+        Used by the ``slim.models.groups.TranslationSet``.
+
+        :return django.db.models.query.QuerySet:
+        """
+        manager = self.__class__._default_manager
+        if not self.id:
+            return manager.none()
         if is_primary_language(self.language):
             return self.translations.all()
-        elif self.translation_of:
-            return [self.translation_of] + \
-                   list(
-                       self.translation_of.translations.exclude(
-                           language=self.language
-                       )
-                   )
-        else:
-            return []
+        elif self.translation_of_id:
+            # Original translation and its' translations, using one query.
+            return manager.filter(
+                get_translation_group_lookup(
+                    self.__class__, [self.translation_of_id]
+                )
+            ).exclude(language=self.language)
+        return manager.none()
 
     def get_original_translation(self, *args, **kwargs):
         """Get original translation of current object.
@@ -65,6 +192,10 @@ class Slim(object):
         """
         if is_primary_language(self.language):
             return self
+
+        group = self._get_translation_group()
+        if group and group[0].pk == self.translation_of_id:
+            return group[0]
         return self.translation_of
 
     def translation_admin(self, *args, **kwargs):
@@ -97,34 +228,34 @@ class Slim(object):
         try:
             original_translation = self.original_translation
             available_translations = list(self.available_translations())
-            languages_keys = get_languages_keys()
-            languages = dict(get_languages())
+            languages = get_languages_dict()
 
             if include_self:
                 available_translations.append(self)
 
             output = []
             # Processing all available translations. Adding edit links.
-            if available_translations:
-                url_title = text_type(languages[translation.language])
-                for translation in available_translations:
-
-                    output.append(
-                        admin_change_url(
-                            translation._meta.app_label,
-                            translation._meta.module_name,
-                            translation.id,
-                            url_title=url_title
-                        )
+            for translation in available_translations:
+                output.append(
+                    admin_change_url(
+                        translation._meta.app_label,
+                        translation._meta.module_name,
+                        translation.id,
+                        url_title=text_type(languages[translation.language])
                     )
-                    languages_keys.remove(translation.language)
+                )
 
-            if self.pk and self.language in languages_keys:
-                languages_keys.remove(self.language)
+            translated_languages = set(
+                translation.language for translation in available_translations
+            )
+            if self.pk:
+                translated_languages.add(self.language)
 
             # For all languages that are still available (original object has
             # no translations for).
-            for language in languages_keys:
+            for language in get_languages_keys():
+                if language in translated_languages:
+                    continue
                 url = admin_add_url(
                     self._meta.app_label,
                     self._meta.module_name,
@@ -182,30 +313,203 @@ class Slim(object):
         """
         return self.get_original_translation()
 
-    def get_translation_for(self, language):
+    def get_translation_for(self, language, fallback=False):
         """
         Get translation article in given language.
 
+        No queries are made if the translation group is already loaded
+        (see ``slim.models.managers.SlimQuerySet.with_translation_groups``).
+        If a ``slim.identity_map`` is active (see
+        ``slim.middleware.TranslationIdentityMapMiddleware``), each
+        (original, language) pair is looked up at most once. If
+        ``SLIM_USE_CACHE`` is set, missing translations cost no queries at
+        all once the translation map is cached (see ``slim.cache``).
+
         :param str language: Which shall be one of the languages specified
             in ``LANGUAGES`` in `settings.py`.
+        :param bool fallback: If set to True, the fallback chain of the
+            ``language`` is followed (see
+            ``slim.translations.get_fallback_chain``), all the candidate
+            languages being fetched using a single query. If none of them
+            is available, the original translation is returned.
         :return obj: Either object of the same class as or None if no
             translations are available for the given ``language``.
         """
-        if language not in get_languages_keys():
+        from ..cache import get_cached_translations, is_cache_enabled
+        from ..identity_map import MISSING, get_identity_map
+
+        if fallback:
+            chain = get_fallback_chain(language)
+            translations = self.get_translations_for(chain)
+            for candidate_language in chain:
+                if translations[candidate_language] is not None:
+                    return translations[candidate_language]
+            return self.original_translation
+
+        if language not in get_languages_keys_set():
             return None
         if str(self.language) == str(language):
             return self
-        if str(self.original_translation.language) == text_type(language):
-            return self.original_translation
-        try:
-            return self.original_translation.translations.get(language=language)
-        except Exception:
+        original_translation = self.original_translation
+        if str(original_translation.language) == text_type(language):
+            return original_translation
+
+        group = self._get_translation_group()
+        if group is not None:
+            for obj in group:
+                if obj.language == language:
+                    return obj
             return None
 
+        identity_map = get_identity_map()
+        if identity_map is not None:
+            translation = identity_map.lookup(
+                self.__class__, original_translation.pk, language
+            )
+            if translation is not MISSING:
+                return translation
+
+        if is_cache_enabled():
+            translation = get_cached_translations(
+                self.__class__, original_translation.pk, [language]
+            )[language]
+        else:
+            try:
+                translation = original_translation.translations.get(
+                    language=language
+                )
+            except ObjectDoesNotExist:
+                translation = None
+
+        if identity_map is not None:
+            identity_map.remember(
+                self.__class__, original_translation.pk, language, translation
+            )
+        return translation
+
+    def translation_group_version(self):
+        """Get version of the translation group.
+
+        Changes whenever any member of the translation group is saved or
+        deleted. No queries are made (see ``slim.cache.get_group_version``).
+
+        :return int:
+        """
+        from ..cache import get_group_version
+        from ..handlers import get_group_pk
+
+        return get_group_version(self.__class__, get_group_pk(self))
+
+    def translation_group(self, fields=None):
+        """Get lightweight representation of the translation group.
+
+        Only the ``fields`` given are fetched (no model instances are
+        created). No queries are made if the translation group is already
+        loaded.
+
+        :param tuple fields: Field names. Defaults to
+            ``slim.models.groups.DEFAULT_TRANSLATION_GROUP_FIELDS``.
+        :return slim.models.groups.TranslationGroup:
+        """
+        from ..handlers import get_group_pk
+        from .groups import DEFAULT_TRANSLATION_GROUP_FIELDS, TranslationGroup
+
+        if fields is None:
+            fields = DEFAULT_TRANSLATION_GROUP_FIELDS
+        group_pk = get_group_pk(self)
+        group = self._get_translation_group()
+        if group is not None \
+                and not any('__' in field for field in fields):
+            return TranslationGroup.from_objects(group_pk, fields, group)
+
+        if not self.pk:
+            return TranslationGroup.from_objects(group_pk, fields, [self])
+
+        return build_translation_groups(
+            self.__class__, [group_pk], fields=fields
+        )[group_pk]
+
+    def get_translations_for(self, languages=None):
+        """Get translations in all languages given using a single query.
+
+        Same shortcuts as in ``get_translation_for`` apply. No queries are
+        made for the current and the original translation, nor if the
+        translation group has already been loaded.
+
+        :param iterable languages: Language codes. If not given, all the
+            languages specified in ``LANGUAGES`` in `settings.py` are used.
+        :return dict: Language codes as keys and either objects of the same
+            class or None (if no translation is available for the language)
+            as values.
+        """
+        from ..cache import get_cached_translations, is_cache_enabled
+        from ..identity_map import MISSING, get_identity_map
+
+        languages_keys = get_languages_keys_set()
+        if languages is None:
+            languages = get_languages_keys()
+
+        translations = dict((language, None) for language in languages)
+        original_translation = self.original_translation
+        identity_map = get_identity_map()
+        group = self._get_translation_group()
+        if group is not None:
+            group = dict((obj.language, obj) for obj in group)
+
+        missing_languages = []
+        for language in translations:
+            if language not in languages_keys:
+                continue
+            if str(self.language) == str(language):
+                translations[language] = self
+            elif original_translation is None:
+                continue
+            elif str(original_translation.language) == text_type(language):
+                translations[language] = original_translation
+            elif group is not None:
+                translations[language] = group.get(language)
+            else:
+                translation = MISSING
+                if identity_map is not None:
+                    translation = identity_map.lookup(
+                        self.__class__, original_translation.pk, language
+                    )
+                if translation is MISSING:
+                    missing_languages.append(language)
+                else:
+                    translations[language] = translation
+
+        if missing_languages:
+            if is_cache_enabled():
+                translations.update(
+                    get_cached_translations(self.__class__,
+                                            original_translation.pk,
+                                            missing_languages)
+                )
+            else:
+                queryset = original_translation.translations.filter(
+                    language__in=missing_languages
+                )
+                for translation in queryset:
+                    translations[translation.language] = translation
+
+            if identity_map is not None:
+                for language in missing_languages:
+                    identity_map.remember(
+                        self.__class__,
+                        original_translation.pk,
+                        language,
+                        translations[language]
+                    )
+
+        return translations
+
 
 class SlimBaseModel(models.Model, Slim):
     """An abstract Django model."""
 
+    objects = SlimManager()
+
     class Meta:
         """Meta."""
 
@@ -1,13 +1,20 @@
-from ..exceptions import LocaleurlImportError
-from ..utils import locale_url_is_installed
+from string import ascii_lowercase
 
-LOCALE_URL_IS_IMPORTABLE = False
+from django.core.urlresolvers import NoReverseMatch, get_urlconf
+from django.utils.http import urlquote
+from django.utils.translation import get_language
 
 try:
-    from localeurl.templatetags.localeurl_tags import chlocale
-    LOCALE_URL_IS_IMPORTABLE = True
+    from django.core.signals import setting_changed
 except ImportError:
-    pass
+    # Django < 1.8
+    from django.test.signals import setting_changed
+
+from six import string_types, text_type
+
+from ..exceptions import LocaleurlImportError
+from ..handlers import URL_CACHE_ATTR, get_url_fields
+from ..utils import locale_url_is_installed
 
 __title__ = 'slim.models.decorators'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
@@ -16,9 +23,46 @@ __license__ = 'GPL 2.0/LGPL 2.1'
 __all__ = (
     'prepend_language',
     'localeurl_prepend_language',
-    'auto_prepend_language'
+    'auto_prepend_language',
+    'cached_auto_prepend_language',
+    'compile_url_template',
+    'reset_url_templates',
+)
+
+# ``chlocale`` of django-localeurl. Imported on first use, since importing
+# localeurl is not cheap (and fails if it's not installed). False if not
+# importable.
+_chlocale = None
+
+# URL templates compiled by ``compile_url_template``, keyed by (model,
+# function, active language, URLconf). None if not compilable.
+_url_templates = {}
+
+# Placeholders standing for field values while the URL is reversed. Letters
+# match slug-like patterns, digits match numeric ones.
+URL_PLACEHOLDERS = (
+    tuple('slimurlplaceholder%sz' % letter for letter in ascii_lowercase),
+    tuple('8302175%s9646' % digit for digit in range(10)),
 )
 
+# Characters ``reverse`` does not quote
+URL_SAFE_CHARACTERS = "!$&'()*+,;=/~:@"
+
+
+def get_chlocale():
+    """Get ``chlocale`` function of django-localeurl.
+
+    :return callable: Or None if localeurl is not importable.
+    """
+    global _chlocale
+    if _chlocale is None:
+        try:
+            from localeurl.templatetags.localeurl_tags import chlocale
+            _chlocale = chlocale
+        except ImportError:
+            _chlocale = False
+    return _chlocale or None
+
 
 def prepend_language(func, language_field='language'):
     """Prepend the language from the model to the path resolved."""
@@ -27,32 +71,193 @@ def prepend_language(func, language_field='language'):
                           func(self, *args, **kwargs))
     return inner
 
-if LOCALE_URL_IS_IMPORTABLE:
-    # Note, that ``localeurl_prepend_language`` is to be deprecated soon.
-
-    def localeurl_prepend_language(func, language_field='language'):
-        """Prepend the language from the model to the path resolved.
-
-        Used when `django-localeurl` package is used."""
-        def inner(self, *args, **kwargs):
-            return chlocale(func(self, *args, **kwargs),
-                            getattr(self, language_field))
-        return inner
 
-    # If `localeurl` is available gets the `localeurl` based decorator.
-    # Otherwise, gets `prepend_language` based decorator.
-    if locale_url_is_installed():
-        auto_prepend_language = localeurl_prepend_language
-    else:
-        auto_prepend_language = prepend_language
+# Note, that ``localeurl_prepend_language`` is to be deprecated soon.
+def localeurl_prepend_language(func, language_field='language'):
+    """Prepend the language from the model to the path resolved.
 
-else:
-
-    def localeurl_prepend_language(func, language_field=None):
-        """Prepend the language from the model to the path resolved."""
+    Used when `django-localeurl` package is used."""
+    chlocale = get_chlocale()
+    if chlocale is None:
         raise LocaleurlImportError(
             "You should have localeurl installed in order to use "
             "`slim.models.localeurl_prepend_language` decorator."
         )
-    # Fallback
-    auto_prepend_language = prepend_language
+
+    def inner(self, *args, **kwargs):
+        return chlocale(func(self, *args, **kwargs),
+                        getattr(self, language_field))
+    return inner
+
+
+def _auto_prepend(path, language):
+    """Prepend the language to the path given (see
+    ``auto_prepend_language``).
+
+    :param str path:
+    :param str language:
+    :return str:
+    """
+    if locale_url_is_installed() and get_chlocale() is not None:
+        return get_chlocale()(path, language)
+    return "/%s%s" % (language, path)
+
+
+def auto_prepend_language(func, language_field='language'):
+    """Prepend the language from the model to the path resolved.
+
+    If `localeurl` is available, uses the `localeurl` based decorator.
+    Otherwise, uses `prepend_language` based decorator. Decided on each
+    call (not at import time), so settings are not accessed and localeurl
+    is not imported until URLs are actually resolved.
+    """
+    def inner(self, *args, **kwargs):
+        return _auto_prepend(func(self, *args, **kwargs),
+                             getattr(self, language_field))
+    return inner
+
+
+class NotCompilable(Exception):
+    """Raised when a URL can't be compiled into a template."""
+
+
+class URLPlaceholders(object):
+    """Stands in for the model instance while the URL is compiled.
+
+    Attributes listed in ``fields`` are placeholders, access to anything
+    else makes the URL not compilable.
+    """
+
+    def __init__(self, fields, placeholders):
+        """Constructor.
+
+        :param tuple fields: Names of the fields the URL depends on.
+        :param tuple placeholders: Placeholders to use.
+        """
+        self._fields = fields
+        self._placeholders = placeholders
+        self.used = {}
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name not in self._fields:
+            raise NotCompilable(name)
+        if name not in self.used:
+            if len(self.used) >= len(self._placeholders):
+                raise NotCompilable(name)
+            self.used[name] = self._placeholders[len(self.used)]
+        return self.used[name]
+
+
+def compile_url_template(func, fields):
+    """Reverse the URL once into a format template.
+
+    ``func`` (such as the undecorated ``get_absolute_url``) is called with
+    placeholders standing for the ``fields`` values. Placeholders are then
+    replaced with named format fields.
+
+    :param callable func:
+    :param tuple fields: Names of the fields ``func`` depends on.
+    :return tuple: Template and names of the fields used in it. None if
+        ``func`` depends on anything else, or the URL pattern does not
+        accept the placeholders.
+    """
+    for placeholders in URL_PLACEHOLDERS:
+        proxy = URLPlaceholders(fields, placeholders)
+        try:
+            url = func(proxy)
+        except NotCompilable:
+            return None
+        except NoReverseMatch:
+            # The URL pattern does not accept the placeholders
+            continue
+
+        if not isinstance(url, string_types):
+            return None
+
+        template = url.replace('%', '%%')
+        for name, placeholder in proxy.used.items():
+            if template.count(placeholder) != 1:
+                template = None
+                break
+            template = template.replace(placeholder, '%%(%s)s' % name)
+        if template is not None:
+            return template, tuple(proxy.used)
+    return None
+
+
+def reset_url_templates(**kwargs):
+    """Drop compiled URL templates.
+
+    Connected to the ``setting_changed`` signal.
+    """
+    _url_templates.clear()
+
+
+setting_changed.connect(reset_url_templates)
+
+
+def _build_url(instance, func, fields):
+    """Build the URL of the instance using the compiled template.
+
+    Falls back to calling ``func``, if the URL is not compilable.
+
+    :return str:
+    """
+    key = (type(instance), func, get_language(), get_urlconf())
+    try:
+        compiled = _url_templates[key]
+    except KeyError:
+        compiled = compile_url_template(func, fields)
+        _url_templates[key] = compiled
+
+    if compiled is None:
+        return func(instance)
+
+    template, names = compiled
+    values = {}
+    for name in names:
+        value = getattr(instance, name)
+        # Let ``reverse`` complain about missing values
+        if value is None or value == '':
+            return func(instance)
+        values[name] = urlquote(text_type(value), safe=URL_SAFE_CHARACTERS)
+    return template % values
+
+
+def cached_auto_prepend_language(func, language_field='language'):
+    """Same as ``auto_prepend_language``, memoizing the URL on the instance.
+
+    URLs are kept until the instance is saved (or any of the fields it
+    depends on changes). If ``url_fields`` are specified in the
+    ``LanguageField`` of the model, URL patterns are reversed once per
+    model and language into format templates (see
+    ``compile_url_template``), so that building URLs costs a string
+    formatting instead of ``reverse``. Values are not checked against the
+    URL pattern (as ``reverse`` does), thus the fields shall always hold
+    values the pattern accepts (slugs, for instance).
+
+    Example usage::
+
+        @cached_auto_prepend_language
+        def get_absolute_url(self):
+            return reverse('foo.detail', kwargs={'slug': self.slug})
+    """
+    def inner(self, *args, **kwargs):
+        if args or kwargs or not hasattr(self, '_meta'):
+            return _auto_prepend(func(self, *args, **kwargs),
+                                 getattr(self, language_field))
+
+        url_fields = get_url_fields(type(self))
+        language = getattr(self, language_field)
+        key = (get_language(), language) + tuple(
+            getattr(self, name) for name in url_fields
+        )
+        urls = self.__dict__.setdefault(URL_CACHE_ATTR, {})
+        if key not in urls:
+            if url_fields:
+                path = _build_url(self, func, (language_field,) + url_fields)
+            else:
+                path = func(self)
+            urls[key] = _auto_prepend(path, language)
+        return urls[key]
+    return inner
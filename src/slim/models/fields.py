@@ -1,21 +1,25 @@
-from six import PY3, text_type
-
 from django.db import models
+from django.db.models import Q, signals
 from django.core import exceptions
 from django.utils.translation import ugettext_lazy as _
 
 from nine import versions
 
-from ..helpers import (
-    get_languages,
-    default_language,
-    get_languages_keys,
-    admin_change_url,
-    admin_add_url
+from ..helpers import get_languages, get_default_language
+from ..handlers import (
+    TRANSLATION_GROUP_FIELD_NAME,
+    clear_url_cache,
+    get_group_pk,
+    invalidate_translation_group,
+    purge_translation_group_pages,
+    push_shared_fields,
+    remember_saved_state,
+    take_snapshot,
+    update_translation_group
 )
-from ..monkey_patches import monkeypatch_method, monkeypatch_property
-from ..settings import ENABLE_MONKEY_PATCHING
-from ..translations import is_primary_language
+from ..listing import ListingIndex
+from ..conf import settings as slim_settings
+from . import Slim
 
 __title__ = 'slim.models.fields'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
@@ -23,7 +27,8 @@ __copyright__ = '2013-2017 Artur Barseghyan'
 __license__ = 'GPL 2.0/LGPL 2.1'
 __all__ = (
     'LanguageField',
-    'SimpleLanguageField'
+    'SimpleLanguageField',
+    'TranslationGroupField'
 )
 
 
@@ -42,20 +47,86 @@ class LanguageField(models.CharField):
         """Create new field.
 
         Argument ``populate`` will be sent as-is to the form field.
+
+        If ``translation_group`` is set to True, a ``translation_group_pk``
+        field (primary key of the original translation, see
+        ``TranslationGroupField``) is added to the model as well.
+
+        If ``translation_index`` is set to True, a composite index on
+        (``translation_of``, ``language``) is added to the model (and
+        (``translation_group_pk``, ``language``) if ``translation_group`` is
+        set to True). Use ``language_indexes`` to specify names of the fields
+        to add a composite index on (``language``, field) for. Indexes are
+        added to the ``index_together`` of the model, thus migrations pick
+        them up.
+
+        Use ``url_fields`` to specify names of the fields ``get_absolute_url``
+        of the model depends on (besides the language). If given, cached
+        pages of all the translations (see
+        ``slim.middleware.TranslationGroupPageCacheMiddleware``) are purged
+        whenever any of them is saved or deleted.
+
+        Use ``listing_indexes`` to specify orderings (such as
+        ``'-date_published'``) to keep precomputed listings for (see
+        ``slim.listing.ListingIndex``).
+
+        Use ``shared_fields`` to specify names of the fields (such as
+        ``'date_published'``) having the same value in all translations.
+        Whenever the original translation is saved, those are copied to
+        its translations (see ``slim.handlers.push_shared_fields`` and
+        ``slim.models.managers.SlimQuerySet.sync_shared_fields``).
+
+        If ``unique_translations`` is set to True, one translation per
+        language per translation group is enforced at the database level
+        (see ``add_unique_constraints``).
         """
         defaults = {
             'verbose_name': _('Language'),
             'populate': None,
             'max_length': 10,
             'choices': get_languages(),
-            'default': default_language
+            'default': get_default_language()
         }
         defaults.update(kwargs)
         self.populate = defaults.pop('populate', None)
+        self.add_translation_group = defaults.pop('translation_group', False)
+        self.translation_index = defaults.pop('translation_index', False)
+        self.language_indexes = tuple(defaults.pop('language_indexes', ()))
+        self.url_fields = tuple(defaults.pop('url_fields', ()))
+        self.listing_indexes = tuple(defaults.pop('listing_indexes', ()))
+        self.shared_fields = tuple(defaults.pop('shared_fields', ()))
+        self.unique_translations = defaults.pop('unique_translations', False)
+        self._listing_indexes = []
         self.name = None
         self.translation_of = None
+        self.translation_group = None
         super(LanguageField, self).__init__(*args, **defaults)
 
+    def check(self, **kwargs):
+        """Check the field (Django >= 1.7)."""
+        errors = super(LanguageField, self).check(**kwargs)
+        errors.extend(self._check_url_fields())
+        return errors
+
+    def _check_url_fields(self):
+        """Check that ``url_fields`` are fields of the model."""
+        from django.core import checks
+
+        names = set()
+        for field in self.model._meta.fields:
+            names.update((field.name, field.attname))
+        return [
+            checks.Error(
+                "url_fields refers to '%s', which is not a field of "
+                "'%s'." % (name, self.model._meta.object_name),
+                hint="List the fields get_absolute_url depends on.",
+                obj=self,
+                id='slim.E001',
+            )
+            for name in self.url_fields
+            if name not in names
+        ]
+
     def formfield(self, **kwargs):
         """Returns best form field to represent this model field."""
         defaults = {
@@ -68,48 +139,145 @@ class LanguageField(models.CharField):
     def validate(self, value, model_instance):
         """Validating the field.
 
-        We shall make sure that there are double translations for the same
-        language for the same object. That's why, in case if model is not yet
-        saved (``translated_object`` does not yet have a primary key), we check
-        if there are already translations of the same object in the language
-        we specify now.
+        We shall make sure that there are no double translations for the
+        same language for the same object. A single ``EXISTS`` query is made
+        for any other object of the translation group (the original
+        translation included) in the language given. New originals have
+        nothing to conflict with.
 
-        Otherwise, if ``model_instance`` already has a primary key, we anyway
-        try to get a ``translated_object`` and compare it with our
-        ``model_instance``. In case if ``translated_object`` exists and not
-        equal to our ``model_instance`` we raise an error.
+        Checking does not prevent concurrent saves from creating double
+        translations. Set ``unique_translations`` to True to enforce it at
+        the database level.
 
         NOTE: This has nothing to do with unique fields in the original
         ``model_instance``. Make sure you have properly specified all unique
         attributes with respect to ``LanguageField` of your original
         ``model_instance`` if you need those records to be unique.
         """
-        if model_instance.original_translation:
-            translated_object = model_instance \
-                .original_translation \
-                .get_translation_for(value)
-        else:
-            translated_object = None
-        if not model_instance.pk:
-            if translated_object and translated_object.pk:
-                raise exceptions.ValidationError(
-                    "Translation in language %s for this object "
-                    "already exists." % value
-                )
-        else:
-            if translated_object and translated_object.pk \
-                    and model_instance != translated_object:
+        group_pk = get_group_pk(model_instance)
+        if group_pk is not None:
+            queryset = type(model_instance)._default_manager.filter(
+                Q(pk=group_pk) | Q(translation_of=group_pk),
+                **{self.name: value}
+            )
+            if model_instance.pk is not None:
+                queryset = queryset.exclude(pk=model_instance.pk)
+            if queryset.exists():
                 raise exceptions.ValidationError(
                     "Translation in language %s for this object "
                     "already exists." % value
                 )
         super(LanguageField, self).validate(value, model_instance)
 
+    def get_indexes(self):
+        """Get composite indexes to add to the model.
+
+        :return list: List of tuples of field names.
+        """
+        indexes = []
+        if self.translation_index:
+            indexes.append(('translation_of', self.name))
+            if self.add_translation_group:
+                indexes.append((TRANSLATION_GROUP_FIELD_NAME, self.name))
+        for field_name in self.language_indexes:
+            indexes.append((self.name, field_name))
+        return indexes
+
+    def get_unique_translation_fields(self):
+        """Get field names to enforce unique translations on.
+
+        :return list: List of tuples of field names.
+        """
+        if not self.unique_translations:
+            return []
+        unique = [('translation_of', self.name)]
+        if self.add_translation_group:
+            unique.append((TRANSLATION_GROUP_FIELD_NAME, self.name))
+        return unique
+
+    def add_unique_constraints(self, cls):
+        """Enforce one translation per language per translation group.
+
+        On Django >= 2.2, conditional unique constraints (skipping the rows
+        not having the group field set) are added to the ``constraints`` of
+        the model. Otherwise, to the ``unique_together`` (``NULL`` values
+        never conflict on most databases). Either way, migrations pick them
+        up.
+
+        If the model has the translation group field, double originals are
+        caught as well. Otherwise, just double translations.
+
+        :param cls: Model class.
+        """
+        unique = self.get_unique_translation_fields()
+        if not unique:
+            return
+
+        if versions.DJANGO_GTE_2_2:
+            constraints = list(cls._meta.constraints)
+            names = [constraint.name for constraint in constraints]
+            for fields in unique:
+                name = '%s_%s_uniq' % (cls._meta.db_table, '_'.join(fields))
+                if name in names:
+                    continue
+                constraints.append(models.UniqueConstraint(
+                    fields=list(fields),
+                    condition=Q(**{'%s__isnull' % fields[0]: False}),
+                    name=name
+                ))
+            cls._meta.constraints = constraints
+            attr_name = 'constraints'
+        else:
+            unique_together = [
+                tuple(fields) for fields in cls._meta.unique_together
+            ]
+            for fields in unique:
+                if fields not in unique_together:
+                    unique_together.append(fields)
+            cls._meta.unique_together = tuple(unique_together)
+            attr_name = 'unique_together'
+
+        # Migrations read the original ``Meta`` attributes (Django >= 1.7).
+        if hasattr(cls._meta, 'original_attrs'):
+            cls._meta.original_attrs[attr_name] = \
+                getattr(cls._meta, attr_name)
+
+    def get_listing_indexes(self):
+        """Get listing indexes of the model.
+
+        :return list: ``slim.listing.ListingIndex`` instances.
+        """
+        return self._listing_indexes
+
+    def add_indexes(self, cls):
+        """Add composite indexes to the ``index_together`` of the model.
+
+        :param cls: Model class.
+        """
+        indexes = self.get_indexes()
+        if not indexes:
+            return
+
+        index_together = [
+            tuple(fields) for fields in cls._meta.index_together
+        ]
+        for index in indexes:
+            if index not in index_together:
+                index_together.append(index)
+
+        cls._meta.index_together = tuple(index_together)
+        # Migrations read the original ``Meta`` attributes (Django >= 1.7).
+        if hasattr(cls._meta, 'original_attrs'):
+            cls._meta.original_attrs['index_together'] = \
+                cls._meta.index_together
+
     def contribute_to_class(self, cls, name):
         """Language field consists of more than one database record.
 
         We have ``language`` (CharField) and ``translation_of`` (ForeignKey
         to ``cls``) in order to identify translated and primary objects.
+        Optionally, ``translation_group_pk`` is added for fetching the whole
+        translation group with a single equality lookup.
 
         We have a set of very useful methods implemented in order to get
         translations easily.
@@ -121,202 +289,90 @@ class LanguageField(models.CharField):
             null=True,
             verbose_name=_('Translation of'),
             related_name='translations',
-            limit_choices_to={'language': default_language},
+            limit_choices_to={'language': get_default_language()},
             help_text=_("Leave this empty for entries in the "
                         "primary language.")
         )
         cls.add_to_class('translation_of', self.translation_of)
+
+        if self.add_translation_group:
+            self.translation_group = TranslationGroupField()
+            cls.add_to_class(TRANSLATION_GROUP_FIELD_NAME,
+                             self.translation_group)
+
         super(LanguageField, self).contribute_to_class(cls, name)
 
-        if ENABLE_MONKEY_PATCHING:
-            @monkeypatch_property(cls)
-            def is_multilingual(self):
-                """Use on objects to find out whether they are multilinugal.
-
-                :return bool: Always returns boolean True
-                """
-                return True
-
-            @monkeypatch_method(cls)
-            def available_translations(self):
-                """Return available translations.
-
-                :return interable: At this moment a list of objects.
-                """
-                # New, unsaved pages have no translations
-                if not self.id:
-                    return []
-
-                if is_primary_language(self.language):
-                    return self.translations.all()
-                elif self.translation_of:
-                    return [self.translation_of] + \
-                           list(
-                                self.translation_of.translations.exclude(
-                                    language=self.language
-                                )
-                           )
-                else:
-                    return []
-
-            @monkeypatch_method(cls)
-            def get_original_translation(self, *args, **kwargs):
-                """Get original translation of current object.
-
-                :return obj: Object of the same class as the one queried.
-                """
-                if is_primary_language(self.language):
-                    return self
-                return self.translation_of
-
-            @monkeypatch_method(cls)
-            def translation_admin(self, *args, **kwargs):
-                """Get HTML with URL to the original translation if available.
-
-                For admin use.
-
-                :return str:
-                """
-                if self.translation_of:
-                    if not PY3:
-                        url_title = text_type(self.translation_of)
-                    else:
-                        url_title = self.translation_of
-
-                    return admin_change_url(
-                        self._meta.app_label,
-                        self._meta.module_name,
-                        self.translation_of.id,
-                        url_title=url_title
-                    )
-                return ''
-            translation_admin.allow_tags = True
-            translation_admin.short_description = _('Translation of')
-
-            @monkeypatch_method(cls)
-            def _available_translations_admin(self, include_self=True):
-                """Get a HTML with all available translation URLs.
-
-                Get a HTML with all available translation URLs for current
-                object if available. For admin use.
-
-                :return str:
-                """
-                try:
-                    original_translation = self.original_translation
-                    available_translations = list(
-                        self.available_translations()
-                    )
-                    languages_keys = get_languages_keys()
-                    languages = dict(get_languages())
-
-                    if include_self:
-                        available_translations.append(self)
-
-                    output = []
-                    # Processing all available translations. Adding edit links.
-                    if available_translations:
-                        for translation in available_translations:
-                            url_title = text_type(
-                                languages[translation.language]
-                            )
-                            output.append(
-                                admin_change_url(
-                                    translation._meta.app_label,
-                                    translation._meta.module_name,
-                                    translation.id,
-                                    url_title=url_title
-                                )
-                            )
-                            languages_keys.remove(translation.language)
-
-                    if self.pk and self.language in languages_keys:
-                        languages_keys.remove(self.language)
-
-                    # For all languages that are still available (original
-                    # object has no translations for).
-                    for language in languages_keys:
-                        url = admin_add_url(
-                                self._meta.app_label,
-                                self._meta.module_name,
-                                '?translation_of=%s&amp;language=%s' % (
-                                    text_type(original_translation.id),
-                                    language
-                                )
-                        )
-                        name = text_type(languages[language])
-
-                        output.append(
-                            u'<a href="%(url)s" '
-                            u'style="color:#baa">%(name)s</a>'
-                            u'' % {'url': url, 'name': name})
-                    return ' | '.join(output)
-                except Exception:
-                    return ''
-
-            @monkeypatch_method(cls)
-            def available_translations_admin(self, *args, **kwargs):
-                """Get HTML with all available translation URLs.
-
-                Get HTML with all available translation URLs for current
-                object if available. For admin use.
-
-                :return str:
-                """
-                return self._available_translations_admin(
-                    include_self=True, *args, **kwargs
-                )
-            available_translations_admin.allow_tags = True
-            available_translations_admin.short_description = _('Translations')
-
-            @monkeypatch_method(cls)
-            def available_translations_exclude_current_admin(self,
-                                                             *args,
-                                                             **kwargs):
-                """Same as `available_translations_admin`.
-                 Same as `available_translations_admin`, but does not include
-                 itself to the list.
-
-                :return str:
-                """
-                return self._available_translations_admin(
-                    include_self=False, *args, **kwargs
-                )
-            available_translations_exclude_current_admin.allow_tags = True
-            available_translations_exclude_current_admin.short_description = _(
-                'Translations'
-            )
+        if not cls._meta.abstract:
+            self.add_indexes(cls)
+            self.add_unique_constraints(cls)
+            self._listing_indexes = [
+                ListingIndex(cls, ordering)
+                for ordering in self.listing_indexes
+            ]
+
+            # Values of the tracked fields (see ``take_snapshot``) and the
+            # translation group (and URL) the object had, if it's moved
+            signals.post_init.connect(take_snapshot, sender=cls)
+            signals.pre_save.connect(remember_saved_state, sender=cls)
+            # Memoized URLs and the translation group field shall be up to
+            # date before anything else is done
+            signals.post_save.connect(clear_url_cache, sender=cls)
+            if self.add_translation_group:
+                signals.post_save.connect(update_translation_group,
+                                          sender=cls)
+            # Pushed before the invalidation, since listing indexes are
+            # updated from the database
+            if self.shared_fields:
+                signals.post_save.connect(push_shared_fields, sender=cls)
+            signals.post_save.connect(invalidate_translation_group,
+                                      sender=cls)
+            signals.post_delete.connect(invalidate_translation_group,
+                                        sender=cls)
+            if self.url_fields:
+                signals.post_save.connect(purge_translation_group_pages,
+                                          sender=cls)
+                signals.post_delete.connect(purge_translation_group_pages,
+                                            sender=cls)
+            # Values saved are the ones compared on the next save
+            signals.post_save.connect(take_snapshot, sender=cls)
+
+        if slim_settings.ENABLE_MONKEY_PATCHING:
+            # Copy all the ``slim.models.Slim`` methods and properties to the
+            # model class, so that it doesn't have to inherit from ``Slim``.
+            for attr_name, attr_value in vars(Slim).items():
+                if not attr_name.startswith('__'):
+                    setattr(cls, attr_name, attr_value)
+
+
+class TranslationGroupField(models.IntegerField):
+    """Primary key of the original translation.
+
+    Added by the ``LanguageField`` when ``translation_group`` is set to True.
+    Original translations point to themselves, thus all the objects of the
+    same translation group share the same value.
+    """
 
-            @monkeypatch_property(cls)
-            def original_translation(self):
-                """Property for ``get_original_translation`` method.
-
-                :return obj: Object of the same class as the one queried.
-                """
-                return self.get_original_translation()
-
-            @monkeypatch_method(cls)
-            def get_translation_for(self, language):
-                """Get translation article in given language.
-
-                :param str language: Which shall be one of the languages
-                specified in ``LANGUAGES``
-                    in `settings.py`.
-                :return obj: Either object of the same class as or None if no
-                translations are available for the given ``language``.
-                """
-                if language not in get_languages_keys():
-                    return None
-                if str(self.language) == str(language):
-                    return self
-                if str(self.original_translation.language) == str(language):
-                    return self.original_translation
-                try:
-                    return self.original_translation.translations.get(
-                        language=language
-                    )
-                except Exception:
-                    return None
+    def __init__(self, *args, **kwargs):
+        """Create new field."""
+        defaults = {
+            'verbose_name': _('Translation group'),
+            'blank': True,
+            'null': True,
+            'editable': False,
+            'db_index': True,
+        }
+        defaults.update(kwargs)
+        super(TranslationGroupField, self).__init__(*args, **defaults)
+
+    def pre_save(self, model_instance, add):
+        """Set the primary key of the original translation.
+
+        Not known yet for new originals. Those are handled by
+        ``slim.handlers.update_translation_group``.
+        """
+        value = get_group_pk(model_instance)
+        setattr(model_instance, self.attname, value)
+        return value
 
 
 class SimpleLanguageField(models.CharField):
@@ -334,7 +390,7 @@ class SimpleLanguageField(models.CharField):
             'populate': None,
             'max_length': 10,
             'choices': get_languages(),
-            'default': default_language
+            'default': get_default_language()
         }
         defaults.update(kwargs)
         self.populate = defaults.pop('populate', None)
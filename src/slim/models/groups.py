@@ -0,0 +1,227 @@
+from collections import namedtuple
+
+__title__ = 'slim.models.groups'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2013-2017 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'DEFAULT_TRANSLATION_GROUP_FIELDS',
+    'TranslationGroup',
+    'TranslationSet',
+    'get_row_class',
+)
+
+DEFAULT_TRANSLATION_GROUP_FIELDS = ('pk', 'language')
+
+_row_classes = {}
+
+
+def get_row_class(fields):
+    """Get (cached) row class for the fields given.
+
+    :param tuple fields: Field names.
+    :return type: A ``namedtuple`` class.
+    """
+    fields = tuple(fields)
+    if fields not in _row_classes:
+        _row_classes[fields] = namedtuple(
+            'TranslationGroupRow',
+            [field.replace('__', '_') for field in fields]
+        )
+    return _row_classes[fields]
+
+
+class TranslationGroup(object):
+    """Lightweight, read-only representation of a translation group.
+
+    Maps language codes to rows (named tuples holding the requested field
+    values only) of the objects of the translation group. Meant for language
+    switchers and alike, where full model instances are not needed.
+
+    Example::
+
+        group = foo.translation_group(fields=('pk', 'slug'))
+        group['nl'].slug
+        group.languages()
+    """
+
+    __slots__ = ('group_pk', 'fields', '_languages', '_rows')
+
+    def __init__(self, group_pk, fields, rows):
+        """Constructor.
+
+        :param group_pk: Primary key of the original translation.
+        :param tuple fields: Field names.
+        :param iterable rows: Pairs of (language, row), the original
+            translation being the first one.
+        """
+        rows = list(rows)
+        object.__setattr__(self, 'group_pk', group_pk)
+        object.__setattr__(self, 'fields', tuple(fields))
+        object.__setattr__(self, '_languages',
+                           tuple(language for language, row in rows))
+        object.__setattr__(self, '_rows', dict(rows))
+
+    @classmethod
+    def from_objects(cls, group_pk, fields, objects):
+        """Build translation group from already loaded objects.
+
+        :param group_pk: Primary key of the original translation.
+        :param tuple fields: Field names (attributes of the objects).
+        :param iterable objects: Objects of the translation group, the
+            original translation being the first one.
+        :return slim.models.groups.TranslationGroup:
+        """
+        row_class = get_row_class(fields)
+        return cls(
+            group_pk,
+            fields,
+            (
+                (obj.language,
+                 row_class(*[getattr(obj, field) for field in fields]))
+                for obj in objects
+            )
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TranslationGroup is read-only.")
+
+    def __getitem__(self, language):
+        return self._rows[language]
+
+    def __contains__(self, language):
+        return language in self._rows
+
+    def __iter__(self):
+        return iter(self._languages)
+
+    def __len__(self):
+        return len(self._languages)
+
+    def __repr__(self):
+        return '<TranslationGroup %s: %s>' % (
+            self.group_pk, ', '.join(self._languages)
+        )
+
+    def get(self, language, default=None):
+        """Get row of the object in ``language``.
+
+        :param str language:
+        :param default:
+        :return tuple:
+        """
+        return self._rows.get(language, default)
+
+    def languages(self):
+        """Get languages of the translation group, original first.
+
+        :return tuple:
+        """
+        return self._languages
+
+    def items(self):
+        """Get (language, row) pairs, original first.
+
+        :return list:
+        """
+        return [(language, self._rows[language])
+                for language in self._languages]
+
+    @property
+    def original(self):
+        """Row of the original translation.
+
+        :return tuple:
+        """
+        if not self._languages:
+            return None
+        return self._rows[self._languages[0]]
+
+
+class TranslationSet(object):
+    """Lazy set of translations available for an object.
+
+    Returned by ``Slim.available_translations``. Translations are fetched
+    (using at most one query, none if the translation group is already
+    loaded) on first use. After that, iterating, ``len``, ``bool`` and
+    ``languages`` do not hit the database any more. Use ``queryset`` (or
+    ``filter`` and ``exclude`` shortcuts) for further chaining.
+    """
+
+    __slots__ = ('_obj', '_result_cache')
+
+    def __init__(self, obj):
+        """Constructor.
+
+        :param obj: Object to get the translations for.
+        """
+        self._obj = obj
+        self._result_cache = None
+
+    def _fetch_all(self):
+        if self._result_cache is None:
+            self._result_cache = list(
+                self._obj._fetch_available_translations()
+            )
+        return self._result_cache
+
+    def __iter__(self):
+        return iter(self._fetch_all())
+
+    def __len__(self):
+        return len(self._fetch_all())
+
+    def __bool__(self):
+        return bool(self._fetch_all())
+
+    # Python 2
+    __nonzero__ = __bool__
+
+    def __getitem__(self, index):
+        return self._fetch_all()[index]
+
+    def __repr__(self):
+        return '<TranslationSet %r>' % self._fetch_all()
+
+    def all(self):
+        """For compatibility with querysets.
+
+        :return slim.models.groups.TranslationSet:
+        """
+        return self
+
+    def count(self):
+        """Number of translations.
+
+        :return int:
+        """
+        return len(self)
+
+    def exists(self):
+        """If there are any translations.
+
+        :return bool:
+        """
+        return bool(self)
+
+    def languages(self):
+        """Get languages of the translations.
+
+        :return tuple:
+        """
+        return tuple(obj.language for obj in self._fetch_all())
+
+    def queryset(self):
+        """Get queryset of the translations, for further chaining.
+
+        :return django.db.models.query.QuerySet:
+        """
+        return self._obj._get_available_translations_queryset()
+
+    def filter(self, *args, **kwargs):
+        """Shortcut for ``queryset().filter(...)``."""
+        return self.queryset().filter(*args, **kwargs)
+
+    def exclude(self, *args, **kwargs):
+        """Shortcut for ``queryset().exclude(...)``."""
+        return self.queryset().exclude(*args, **kwargs)
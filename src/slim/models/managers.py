@@ -0,0 +1,880 @@
+from django.core.exceptions import ValidationError
+from django.db import connections, models, transaction
+from django.db.models import Q
+from django.db.models.sql.subqueries import DeleteQuery
+from django.utils.translation import get_language
+
+from six import string_types
+
+from ..bulk import bulk
+from ..conf import settings as slim_settings
+from ..handlers import (
+    TRANSLATION_GROUP_FIELD_NAME,
+    drop_listing_indexes,
+    get_group_pk,
+    get_shared_fields,
+    get_url_fields,
+    has_translation_group_field,
+    invalidate_translation_groups,
+    purge_translation_groups_pages
+)
+from ..helpers import get_languages_keys_set
+from ..translations import get_fallback_chain
+
+__title__ = 'slim.models.managers'
+__author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
+__copyright__ = '2013-2017 Artur Barseghyan'
+__license__ = 'GPL 2.0/LGPL 2.1'
+__all__ = (
+    'attach_translation_groups',
+    'build_translation_groups',
+    'GROUP_CHUNK_SIZE',
+    'has_dependent_objects',
+    'get_translation_group_lookup',
+    'get_translation_group_subquery_lookup',
+    'ON_CONFLICT_SKIP',
+    'ON_CONFLICT_UPDATE',
+    'SlimManager',
+    'SlimQuerySet',
+    'translate_objects',
+    'trust_translation_group_field',
+)
+
+# What ``bulk_create_translations`` does with translations already existing
+ON_CONFLICT_SKIP = 'skip'
+ON_CONFLICT_UPDATE = 'update'
+
+# Number of translation groups ``delete_groups`` and ``update_groups`` deal
+# with at once
+GROUP_CHUNK_SIZE = 500
+
+
+def trust_translation_group_field(model):
+    """Check if lookups may rely on the translation group field alone.
+
+    Only if the model has got the field and ``SLIM_TRANSLATION_GROUPS_FILLED``
+    is set (that is, ``slim_backfill_translation_groups`` has been run).
+    Otherwise, records having no translation group yet are looked up by
+    ``translation_of``.
+
+    :param model: Model class.
+    :return bool:
+    """
+    return has_translation_group_field(model) \
+        and slim_settings.TRANSLATION_GROUPS_FILLED
+
+
+def get_translation_group_lookup(model, group_pks):
+    """Get lookup for all objects of the translation groups given.
+
+    Note, that ``QuerySet.update(translation_of=...)`` does not update the
+    translation group field (no signals are sent). Run
+    ``slim_backfill_translation_groups --all`` afterwards.
+
+    :param model: Model class.
+    :param iterable group_pks: Primary keys of the original translations.
+    :return django.db.models.Q:
+    """
+    if not has_translation_group_field(model):
+        return Q(pk__in=group_pks) | Q(translation_of__in=group_pks)
+
+    lookup = Q(**{'%s__in' % TRANSLATION_GROUP_FIELD_NAME: group_pks})
+    if trust_translation_group_field(model):
+        return lookup
+    return lookup | (
+        Q(**{'%s__isnull' % TRANSLATION_GROUP_FIELD_NAME: True})
+        & (Q(pk__in=group_pks) | Q(translation_of__in=group_pks))
+    )
+
+
+def get_translation_group_subquery_lookup(model, queryset):
+    """Get lookup for all objects of the translation groups of ``queryset``.
+
+    Unlike ``get_translation_group_lookup``, the primary keys of the original
+    translations do not need to be known; ``queryset`` is used as a
+    subquery, thus everything is done in a single query.
+
+    :param model: Model class.
+    :param django.db.models.query.QuerySet queryset: Objects of the model.
+    :return django.db.models.Q:
+    """
+    if trust_translation_group_field(model):
+        return Q(**{
+            '%s__in' % TRANSLATION_GROUP_FIELD_NAME:
+                queryset.values(TRANSLATION_GROUP_FIELD_NAME)
+        })
+    return Q(pk__in=queryset.values('pk')) \
+        | Q(pk__in=queryset.values('translation_of')) \
+        | Q(translation_of__in=queryset.values('pk')) \
+        | Q(translation_of__in=queryset.values('translation_of'))
+
+
+def has_dependent_objects(model):
+    """Check if deleting objects of the model may affect other objects.
+
+    Translations (``translation_of``) do not count.
+
+    :param model: Model class.
+    :return bool: True if objects of other models (or parent models) may
+        have to be deleted (or updated) too.
+    """
+    opts = model._meta
+    private_fields = getattr(opts, 'private_fields',
+                             getattr(opts, 'virtual_fields', []))
+    if opts.parents or opts.many_to_many or any(
+        hasattr(field, 'bulk_related_objects') for field in private_fields
+    ):
+        return True
+
+    if hasattr(opts, 'get_fields'):
+        relations = [
+            field for field in opts.get_fields(include_hidden=True)
+            if field.auto_created and not field.concrete
+            and (field.one_to_one or field.one_to_many
+                 or field.many_to_many)
+        ]
+    else:
+        # Django < 1.8
+        relations = opts.get_all_related_objects(include_hidden=True) \
+            + opts.get_all_related_many_to_many_objects()
+
+    for relation in relations:
+        if relation.field.name == 'translation_of' \
+                and getattr(relation.field, 'model', model) is model:
+            continue
+        return True
+    return False
+
+
+def translate_objects(objects, language, fallback=False):
+    """Translate all objects given into ``language`` using a single query.
+
+    :param iterable objects: Objects of the same multi-lingual model.
+    :param str language: Language code.
+    :param bool fallback: If set to True, the fallback chain of the
+        ``language`` is followed for objects that have not been translated
+        into ``language`` (see ``slim.translations.get_fallback_chain``) and
+        the original translation is used as a last resort. Otherwise, None is
+        put in their place.
+    :return list: Translated objects, in the same order as ``objects``.
+    """
+    from ..identity_map import get_identity_map
+
+    objects = list(objects)
+    if not objects:
+        return []
+
+    if fallback:
+        languages = get_fallback_chain(language)
+    else:
+        languages = (language,)
+
+    model = objects[0]._meta.concrete_model
+    group_pks = set(
+        get_group_pk(obj) for obj in objects if obj.language != language
+    )
+
+    translations = dict((group_pk, {}) for group_pk in group_pks)
+    originals = {}
+    if group_pks:
+        language_lookup = Q(language__in=languages)
+        if fallback:
+            language_lookup |= Q(translation_of__isnull=True)
+        lookup = get_translation_group_lookup(model, group_pks) \
+            & language_lookup
+
+        for obj in model._default_manager.filter(lookup):
+            group_pk = get_group_pk(obj)
+            translations[group_pk][obj.language] = obj
+            if obj.pk == group_pk:
+                originals[group_pk] = obj
+
+        identity_map = get_identity_map()
+        if identity_map is not None:
+            for group_pk in group_pks:
+                for candidate_language in languages:
+                    identity_map.remember(
+                        model,
+                        group_pk,
+                        candidate_language,
+                        translations[group_pk].get(candidate_language)
+                    )
+
+    result = []
+    for obj in objects:
+        if obj.language == language:
+            result.append(obj)
+            continue
+
+        group_pk = get_group_pk(obj)
+        translation = None
+        for candidate_language in languages:
+            translation = translations[group_pk].get(candidate_language)
+            if translation is not None:
+                break
+
+        if translation is None and fallback:
+            translation = originals.get(group_pk, obj)
+        result.append(translation)
+
+    return result
+
+
+def attach_translation_groups(objects):
+    """Load translation groups of all objects given using a single query.
+
+    Every object gets all the members of its translation group (the original
+    translation and all its translations) attached, so that
+    ``available_translations``, ``original_translation`` and
+    ``get_translation_for`` do not hit the database any more.
+
+    :param iterable objects: Objects of the same multi-lingual model.
+    """
+    objects = [obj for obj in objects if isinstance(obj, models.Model)]
+    if not objects:
+        return
+
+    model = objects[0]._meta.concrete_model
+    loaded = dict((obj.pk, obj) for obj in objects)
+    group_pks = set(get_group_pk(obj) for obj in objects)
+
+    groups = dict((group_pk, []) for group_pk in group_pks)
+    queryset = model._default_manager.filter(
+        get_translation_group_lookup(model, group_pks)
+    )
+    for obj in queryset:
+        # Already loaded objects are re-used, so that each object is a
+        # member of its own group.
+        obj = loaded.get(obj.pk, obj)
+        group = groups[get_group_pk(obj)]
+        if obj.pk == get_group_pk(obj):
+            group.insert(0, obj)
+        else:
+            group.append(obj)
+
+    for obj in objects:
+        obj._slim_translation_group = groups[get_group_pk(obj)]
+
+
+def build_translation_groups(model, group_pks, fields=None):
+    """Build lightweight translation groups using a single query.
+
+    No model instances are created, just the ``fields`` are fetched (using
+    ``values_list``).
+
+    :param model: Model class.
+    :param iterable group_pks: Primary keys of the original translations.
+    :param tuple fields: Field names. Defaults to
+        ``slim.models.groups.DEFAULT_TRANSLATION_GROUP_FIELDS``.
+    :return dict: Primary keys of the original translations as keys,
+        ``slim.models.groups.TranslationGroup`` instances as values.
+    """
+    from .groups import (
+        DEFAULT_TRANSLATION_GROUP_FIELDS,
+        TranslationGroup,
+        get_row_class
+    )
+
+    if fields is None:
+        fields = DEFAULT_TRANSLATION_GROUP_FIELDS
+    fields = tuple(fields)
+    row_class = get_row_class(fields)
+    rows = dict((group_pk, []) for group_pk in group_pks)
+    if not rows:
+        return {}
+
+    queryset = model._default_manager \
+                    .filter(get_translation_group_lookup(model, list(rows))) \
+                    .values_list('pk', 'translation_of', 'language', *fields)
+
+    for values in queryset:
+        pk, translation_of_pk, language = values[:3]
+        row = (language, row_class(*values[3:]))
+        if translation_of_pk is None:
+            rows[pk].insert(0, row)
+        else:
+            rows[translation_of_pk].append(row)
+
+    return dict(
+        (group_pk, TranslationGroup(group_pk, fields, group_rows))
+        for group_pk, group_rows in rows.items()
+    )
+
+
+class SlimQuerySet(models.query.QuerySet):
+    """QuerySet for multi-lingual models."""
+
+    _slim_translation_groups = False
+
+    def _clone(self, *args, **kwargs):
+        """Clone the queryset, keeping the slim specific options."""
+        clone = super(SlimQuerySet, self)._clone(*args, **kwargs)
+        clone._slim_translation_groups = self._slim_translation_groups
+        return clone
+
+    def _fetch_all(self):
+        """Fetch all the results, loading translation groups if asked to."""
+        load_translation_groups = self._result_cache is None \
+            and self._slim_translation_groups
+        super(SlimQuerySet, self)._fetch_all()
+        if load_translation_groups:
+            attach_translation_groups(self._result_cache)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Create objects, taking care of what signals would otherwise do.
+
+        Translation groups of the created objects are invalidated (and
+        listing indexes of their languages dropped) and the translation group
+        field of new originals is filled in, all in batches (see
+        ``slim.bulk``).
+
+        :return list: Created objects.
+        """
+        with bulk() as bulk_context:
+            objs = super(SlimQuerySet, self).bulk_create(objs, *args,
+                                                         **kwargs)
+            has_group_field = has_translation_group_field(self.model)
+            for obj in objs:
+                bulk_context.add_group(self.model, get_group_pk(obj))
+                if has_group_field \
+                        and getattr(obj, TRANSLATION_GROUP_FIELD_NAME) is None:
+                    bulk_context.add_ungrouped_model(self.model)
+            drop_listing_indexes(
+                self.model,
+                languages=set(obj.language for obj in objs),
+                originals=any(obj.translation_of_id is None for obj in objs)
+            )
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """Update fields of the objects, taking care of what signals would do.
+
+        Translation groups of the updated objects are invalidated (and
+        listing indexes ordered by the fields dropped) in batches (see
+        ``slim.bulk``). On Django versions not having ``bulk_update``, an
+        ``UPDATE`` query (without signals sent) is made per object.
+
+        :param iterable objs: Objects to update.
+        :param iterable fields: Names of the fields to update.
+        """
+        objs = list(objs)
+        fields = list(fields)
+        with bulk() as bulk_context:
+            parent = super(SlimQuerySet, self)
+            if hasattr(parent, 'bulk_update'):
+                result = parent.bulk_update(objs, fields, *args, **kwargs)
+            else:
+                result = None
+                for obj in objs:
+                    self.model._default_manager.filter(pk=obj.pk).update(
+                        **dict((field, getattr(obj, field))
+                               for field in fields)
+                    )
+            for obj in objs:
+                obj.__dict__.pop('_slim_translation_set', None)
+                bulk_context.add_group(self.model, get_group_pk(obj))
+            # Values in the database (languages, for instance) are not known
+            drop_listing_indexes(self.model, fields=fields)
+        return result
+
+    def bulk_create_translations(self, originals, translations=None,
+                                 on_conflict=None, batch_size=None):
+        """Create translations of many objects at once.
+
+        All the (translation group, language) pairs are validated using a
+        single query. Translations are then inserted with ``bulk_create``
+        (and updated with ``bulk_update``), within a transaction. Unlike
+        ``save``, objects are not validated one by one.
+
+        Example::
+
+            FooItem.objects.bulk_create_translations(
+                [1, 2, 3],
+                {'nl': {'title': 'Titel'}, 'ru': {'title': 'Title RU'}}
+            )
+
+            FooItem.objects.bulk_create_translations(
+                dict(
+                    (original, {'nl': {'title': original.title + ' NL'}})
+                    for original in originals
+                ),
+                on_conflict=ON_CONFLICT_UPDATE
+            )
+
+        :param originals: Original translation (or its primary key), an
+            iterable of those, or a dict mapping those to translations of
+            their own (``translations`` shall be omitted then).
+        :param dict translations: Field values (dict) of the translations,
+            keyed by language.
+        :param str on_conflict: What to do with translations already
+            existing. If None, ``ValidationError`` is raised. If
+            ``ON_CONFLICT_SKIP``, those are left as is. Where supported
+            (Django >= 2.2, ``unique_translations`` of the ``LanguageField``
+            set), rows violating unique constraints (created concurrently,
+            for instance) are skipped by the database as well. If
+            ``ON_CONFLICT_UPDATE``, those are updated with the field values
+            given.
+        :param int batch_size: Passed to ``bulk_create`` and
+            ``bulk_update``.
+        :return tuple: Lists of created and updated objects.
+        :raise ValueError: If any of the ``originals`` is not an original
+            translation or any of the languages is not available.
+        """
+        if on_conflict not in (None, ON_CONFLICT_SKIP, ON_CONFLICT_UPDATE):
+            raise ValueError("Invalid on_conflict value %s." % on_conflict)
+
+        if translations is None:
+            pairs = originals.items()
+        else:
+            if isinstance(originals, (models.Model,) + string_types) \
+                    or not hasattr(originals, '__iter__'):
+                originals = [originals]
+            pairs = [(original, translations) for original in originals]
+
+        to_python = self.model._meta.pk.to_python
+        languages = get_languages_keys_set()
+        # {(group pk, language): field values}
+        planned = {}
+        for original, original_translations in pairs:
+            if isinstance(original, models.Model):
+                original = original.pk
+            group_pk = to_python(original)
+            for language, values in original_translations.items():
+                if language not in languages:
+                    raise ValueError("Unknown language %s." % language)
+                planned[(group_pk, language)] = dict(values)
+        if not planned:
+            return [], []
+
+        # {(group pk, language): pk}
+        existing = {}
+        group_pks = set(group_pk for group_pk, language in planned)
+        found = set()
+        rows = self.model._default_manager.filter(
+            Q(pk__in=group_pks) | Q(translation_of__in=group_pks)
+        ).values_list('pk', 'translation_of', 'language')
+        for pk, translation_of_pk, language in rows:
+            if pk in group_pks:
+                if translation_of_pk is not None:
+                    raise ValueError(
+                        "Object %s is not an original translation." % pk
+                    )
+                found.add(pk)
+            existing[(translation_of_pk or pk, language)] = pk
+
+        if group_pks - found:
+            raise ValueError(
+                "Original translations %s do not exist." % ', '.join(
+                    sorted(str(pk) for pk in group_pks - found)
+                )
+            )
+
+        conflicts = [pair for pair in planned if pair in existing]
+        if conflicts and on_conflict is None:
+            raise ValidationError(
+                "Translations %s already exist." % ', '.join(
+                    sorted('%s:%s' % pair for pair in conflicts)
+                )
+            )
+
+        new_objs = [
+            self.model(translation_of_id=group_pk,
+                       language=language,
+                       **planned[(group_pk, language)])
+            for group_pk, language in planned
+            if (group_pk, language) not in existing
+        ]
+        updated = []
+        if on_conflict == ON_CONFLICT_UPDATE:
+            for group_pk, language in conflicts:
+                pk = existing[(group_pk, language)]
+                updated.append(self.model(
+                    pk=pk,
+                    translation_of_id=None if pk == group_pk else group_pk,
+                    language=language,
+                    **planned[(group_pk, language)]
+                ))
+
+        bulk_create_kwargs = {'batch_size': batch_size}
+        if on_conflict == ON_CONFLICT_SKIP \
+                and self._has_unique_translations() \
+                and getattr(connections[self.db].features,
+                            'supports_ignore_conflicts',
+                            False):
+            bulk_create_kwargs['ignore_conflicts'] = True
+
+        with transaction.atomic(using=self.db):
+            with bulk():
+                created = self.bulk_create(new_objs, **bulk_create_kwargs) \
+                    if new_objs else []
+                # Objects updating the same fields are updated together
+                by_fields = {}
+                for obj in updated:
+                    fields = tuple(sorted(
+                        planned[(get_group_pk(obj), obj.language)]
+                    ))
+                    by_fields.setdefault(fields, []).append(obj)
+                for fields, objs in by_fields.items():
+                    if fields:
+                        self.bulk_update(objs, fields, batch_size=batch_size)
+
+        return created, updated
+
+    def _has_unique_translations(self):
+        """Check if unique translations are enforced by the database.
+
+        :return bool:
+        """
+        for field in self.model._meta.fields:
+            if getattr(field, 'unique_translations', False):
+                return True
+        return False
+
+    def sync_shared_fields(self, fields=None, batch_size=None):
+        """Copy shared fields of the originals in the queryset to their
+        translations.
+
+        Bulk variant of ``slim.handlers.push_shared_fields``, for many
+        translation groups at once (after ``update`` or ``bulk_update`` of
+        the originals, for instance). Values of the originals and the
+        translations are fetched using a single query. Translations having
+        different values are then updated with ``bulk_update``.
+
+        :param iterable fields: Names of the fields to copy. Defaults to
+            ``shared_fields`` of the ``LanguageField``.
+        :param int batch_size: Passed to ``bulk_update``.
+        :return int: Number of translations updated.
+        """
+        if fields is None:
+            fields = get_shared_fields(self.model)
+        fields = list(fields)
+        if not fields:
+            return 0
+
+        attnames = dict(
+            (field, self.model._meta.get_field(field).attname)
+            for field in fields
+        )
+        originals = self.filter(translation_of__isnull=True) \
+                        .order_by().values('pk')
+        rows = self.model._default_manager.filter(
+            translation_of__in=originals
+        ).values_list(
+            'pk',
+            'translation_of',
+            *(fields + ['translation_of__%s' % field for field in fields])
+        )
+
+        # Objects updating the same fields are updated together
+        by_fields = {}
+        for row in rows:
+            pk, translation_of_pk = row[:2]
+            values = row[2:2 + len(fields)]
+            shared_values = row[2 + len(fields):]
+            changed = {}
+            for field, value, shared_value in zip(fields, values,
+                                                  shared_values):
+                if value != shared_value:
+                    changed[field] = shared_value
+            if changed:
+                obj = self.model(
+                    pk=pk,
+                    translation_of_id=translation_of_pk,
+                    **dict((attnames[field], value)
+                           for field, value in changed.items())
+                )
+                by_fields.setdefault(tuple(sorted(changed)), []).append(obj)
+
+        updated = 0
+        with bulk():
+            for changed_fields, objs in by_fields.items():
+                self.bulk_update(objs, changed_fields, batch_size=batch_size)
+                updated += len(objs)
+        return updated
+
+    def _get_group_pks(self):
+        """Get primary keys of the original translations of the queryset.
+
+        :return list:
+        """
+        return sorted(set(
+            translation_of_pk or pk
+            for pk, translation_of_pk
+            in self.order_by().values_list('pk', 'translation_of')
+        ))
+
+    def _iter_group_chunks(self):
+        """Iterate over the translation groups of the queryset in chunks.
+
+        :return iterable: Lists of primary keys of the original translations.
+        """
+        group_pks = self._get_group_pks()
+        for start in range(0, len(group_pks), GROUP_CHUNK_SIZE):
+            yield group_pks[start:start + GROUP_CHUNK_SIZE]
+
+    def _get_group_urls(self, group_pks):
+        """Get URLs of all the objects of the translation groups given.
+
+        :return list: Empty if model has no ``url_fields``.
+        """
+        from ..cache import get_translation_group_urls
+
+        url_fields = get_url_fields(self.model)
+        if not url_fields:
+            return []
+        return get_translation_group_urls(self.model, group_pks, url_fields)
+
+    def delete_groups(self, send_signals=False):
+        """Delete whole translation groups of the objects in the queryset.
+
+        Instead of collecting (and loading) the objects to delete one by
+        one, as ``delete`` does, objects are deleted with a ``DELETE`` query
+        on the primary keys of the translation groups (translations first,
+        then the originals), ``GROUP_CHUNK_SIZE`` translation groups at a
+        time, within a single transaction. Caches are invalidated once per
+        chunk.
+
+        Note, that by default no ``pre_delete`` and ``post_delete`` signals
+        are sent, thus receivers of other apps (cleaning up files or search
+        indexes, for instance) are bypassed. If ``send_signals`` is True, or
+        objects of other models depend on the objects deleted (see
+        ``has_dependent_objects``), ``delete`` is used instead.
+
+        :param bool send_signals: If set to True, objects are deleted with
+            ``delete``, sending the signals.
+        :return int: Number of objects deleted.
+        """
+        model = self.model
+        manager = model._base_manager.using(self.db)
+        if send_signals or has_dependent_objects(model):
+            queryset = manager.filter(
+                get_translation_group_subquery_lookup(model, self)
+            )
+            result = queryset.delete()
+            # Django < 1.9 returns nothing
+            return result[0] if result else 0
+
+        deleted = 0
+        with transaction.atomic(using=self.db):
+            for group_pks in self._iter_group_chunks():
+                urls = self._get_group_urls(group_pks)
+                originals = []
+                translations = []
+                rows = manager.filter(
+                    Q(pk__in=group_pks) | Q(translation_of__in=group_pks)
+                ).values_list('pk', 'translation_of')
+                for pk, translation_of_pk in rows:
+                    if translation_of_pk is None:
+                        originals.append(pk)
+                    else:
+                        translations.append(pk)
+
+                for pks in (translations, originals):
+                    if pks:
+                        DeleteQuery(model).delete_batch(pks, self.db)
+                deleted += len(translations) + len(originals)
+
+                invalidate_translation_groups(model, group_pks, using=self.db)
+                drop_listing_indexes(model, using=self.db)
+                purge_translation_groups_pages(model, (), urls=urls,
+                                               using=self.db)
+        return deleted
+
+    def update_groups(self, **fields):
+        """Update fields of whole translation groups of the objects in the
+        queryset.
+
+        An ``UPDATE`` query is made on the primary keys of the translation
+        groups, ``GROUP_CHUNK_SIZE`` translation groups at a time, within a
+        single transaction. Caches are invalidated once per chunk. Like
+        ``update``, no signals are sent.
+
+        Example::
+
+            FooItem.objects.filter(pk__in=pks).update_groups(
+                is_published=False
+            )
+
+        :return int: Number of objects updated.
+        :raise ValueError: If any of the fields defines translation groups
+            (``translation_of``, the language or the translation group
+            field).
+        """
+        model = self.model
+        opts = model._meta
+        group_fields = set(['translation_of', TRANSLATION_GROUP_FIELD_NAME])
+        group_fields.update(
+            field.name for field in opts.fields
+            if hasattr(field, 'url_fields')
+        )
+        group_fields.update(
+            field.attname for field in opts.fields
+            if field.name in group_fields
+        )
+        if group_fields & set(fields):
+            raise ValueError(
+                "Fields defining translation groups (%s) can't be updated "
+                "using update_groups." % ', '.join(
+                    sorted(group_fields & set(fields))
+                )
+            )
+
+        manager = model._base_manager.using(self.db)
+        url_fields = get_url_fields(model)
+        updated = 0
+        with transaction.atomic(using=self.db):
+            for group_pks in self._iter_group_chunks():
+                # URLs of the objects may change
+                if set(fields) & set(url_fields):
+                    urls = self._get_group_urls(group_pks)
+                else:
+                    urls = ()
+                updated += manager.filter(
+                    Q(pk__in=group_pks) | Q(translation_of__in=group_pks)
+                ).update(**fields)
+
+                invalidate_translation_groups(model, group_pks, using=self.db)
+                drop_listing_indexes(model, fields=fields, using=self.db)
+                purge_translation_groups_pages(model, group_pks, urls=urls,
+                                               using=self.db)
+        return updated
+
+    def with_translation_groups(self):
+        """Load translation groups of all the objects in the queryset.
+
+        Results in exactly one extra query when the queryset is evaluated.
+        See ``slim.models.managers.attach_translation_groups`` for details.
+
+        :return slim.models.managers.SlimQuerySet:
+        """
+        clone = self._clone()
+        clone._slim_translation_groups = True
+        return clone
+
+    def best_translations(self, language=None):
+        """Get one object per translation group, preferably in ``language``.
+
+        For each translation group, either the object in ``language`` is
+        taken or, if the group has not been translated into ``language``, the
+        original translation. Filtering is done in the database (using a
+        subquery), thus the queryset can still be ordered, sliced and
+        paginated as usual.
+
+        :param str language: Language code. Defaults to the currently active
+            language.
+        :return slim.models.managers.SlimQuerySet:
+        """
+        if language is None:
+            language = get_language()
+
+        translated_group_pks = self.model._default_manager.filter(
+            language=language,
+            translation_of__isnull=False
+        ).values('translation_of')
+
+        return self.filter(
+            Q(language=language) |
+            (Q(translation_of__isnull=True) &
+             ~Q(pk__in=translated_group_pks))
+        )
+
+    def translation_groups(self, fields=None):
+        """Get lightweight translation groups of all objects of the queryset.
+
+        Costs two queries (one for the primary keys of the queryset objects
+        and one for their translation groups), no model instances are
+        created.
+
+        :param tuple fields: Field names. Defaults to
+            ``slim.models.groups.DEFAULT_TRANSLATION_GROUP_FIELDS``.
+        :return dict: Primary keys of the queryset objects as keys,
+            ``slim.models.groups.TranslationGroup`` instances as values.
+        """
+        group_pks = dict(
+            (pk, translation_of_pk or pk)
+            for pk, translation_of_pk
+            in self.values_list('pk', 'translation_of')
+        )
+        groups = build_translation_groups(
+            self.model, set(group_pks.values()), fields=fields
+        )
+        return dict(
+            (pk, groups[group_pk]) for pk, group_pk in group_pks.items()
+        )
+
+    def translated_to(self, language, fallback=False):
+        """Get all objects of the queryset translated into ``language``.
+
+        Costs a single query (on top of evaluating the queryset itself) no
+        matter how many objects there are. See
+        ``slim.models.managers.translate_objects`` for details.
+
+        :param str language: Language code.
+        :param bool fallback: If set to True, language fallback chain is
+            followed for missing translations, originals being used as a last
+            resort.
+        :return list:
+        """
+        return translate_objects(self, language, fallback=fallback)
+
+
+class SlimManager(models.Manager):
+    """Manager for multi-lingual models.
+
+    Example::
+
+        class FooItem(models.Model, Slim):
+            # Some fields.
+            language = LanguageField()
+
+            objects = SlimManager()
+    """
+
+    def get_queryset(self):
+        """Get queryset."""
+        return SlimQuerySet(self.model, using=self._db)
+
+    # Django < 1.6
+    get_query_set = get_queryset
+
+    def best_translations(self, *args, **kwargs):
+        """See ``slim.models.managers.SlimQuerySet.best_translations``."""
+        return self.get_queryset().best_translations(*args, **kwargs)
+
+    def bulk_create(self, *args, **kwargs):
+        """See ``slim.models.managers.SlimQuerySet.bulk_create``."""
+        return self.get_queryset().bulk_create(*args, **kwargs)
+
+    def bulk_update(self, *args, **kwargs):
+        """See ``slim.models.managers.SlimQuerySet.bulk_update``."""
+        return self.get_queryset().bulk_update(*args, **kwargs)
+
+    def bulk_create_translations(self, *args, **kwargs):
+        """See ``slim.models.managers.SlimQuerySet.bulk_create_translations``.
+        """
+        return self.get_queryset().bulk_create_translations(*args, **kwargs)
+
+    def delete_groups(self, *args, **kwargs):
+        """See ``slim.models.managers.SlimQuerySet.delete_groups``."""
+        return self.get_queryset().delete_groups(*args, **kwargs)
+
+    def update_groups(self, *args, **kwargs):
+        """See ``slim.models.managers.SlimQuerySet.update_groups``."""
+        return self.get_queryset().update_groups(*args, **kwargs)
+
+    def sync_shared_fields(self, *args, **kwargs):
+        """See ``slim.models.managers.SlimQuerySet.sync_shared_fields``."""
+        return self.get_queryset().sync_shared_fields(*args, **kwargs)
+
+    def translated_to(self, *args, **kwargs):
+        """See ``slim.models.managers.SlimQuerySet.translated_to``."""
+        return self.get_queryset().translated_to(*args, **kwargs)
+
+    def translation_groups(self, *args, **kwargs):
+        """See ``slim.models.managers.SlimQuerySet.translation_groups``."""
+        return self.get_queryset().translation_groups(*args, **kwargs)
+
+    def with_translation_groups(self, *args, **kwargs):
+        """See ``slim.models.managers.SlimQuerySet.with_translation_groups``.
+        """
+        return self.get_queryset().with_translation_groups(*args, **kwargs)
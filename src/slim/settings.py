@@ -5,11 +5,37 @@ __license__ = 'GPL 2.0/LGPL 2.1'
 __all__ = (
     'USE_LOCALEURL',
     'USE_LOCAL_LANGUAGE_NAMES',
-    'ENABLE_MONKEY_PATCHING'
+    'ENABLE_MONKEY_PATCHING',
+    'LANGUAGE_FALLBACKS',
+    'USE_CACHE',
+    'CACHE_ALIAS',
+    'CACHE_TIMEOUT',
+    'CACHE_LOCK_TIMEOUT',
+    'CACHE_LOCK_WAIT',
+    'CACHE_VERSION_TIMEOUT',
+    'LAST_MODIFIED_FIELD',
+    'PAGE_CACHE_TIMEOUT',
+    'LISTING_INDEX_TIMEOUT',
+    'TRANSLATION_GROUPS_FILLED',
 )
 
 from .conf import get_setting
 
+# Values below are resolved once, at import time, and do not follow
+# changes made with ``override_settings``. Kept for backwards
+# compatibility only, use ``slim.conf.settings`` instead.
+
 USE_LOCALEURL = get_setting('USE_LOCALEURL')
 USE_LOCAL_LANGUAGE_NAMES = get_setting('USE_LOCAL_LANGUAGE_NAMES')
 ENABLE_MONKEY_PATCHING = get_setting('ENABLE_MONKEY_PATCHING')
+LANGUAGE_FALLBACKS = get_setting('LANGUAGE_FALLBACKS')
+USE_CACHE = get_setting('USE_CACHE')
+CACHE_ALIAS = get_setting('CACHE_ALIAS')
+CACHE_TIMEOUT = get_setting('CACHE_TIMEOUT')
+CACHE_LOCK_TIMEOUT = get_setting('CACHE_LOCK_TIMEOUT')
+CACHE_LOCK_WAIT = get_setting('CACHE_LOCK_WAIT')
+CACHE_VERSION_TIMEOUT = get_setting('CACHE_VERSION_TIMEOUT')
+LAST_MODIFIED_FIELD = get_setting('LAST_MODIFIED_FIELD')
+PAGE_CACHE_TIMEOUT = get_setting('PAGE_CACHE_TIMEOUT')
+LISTING_INDEX_TIMEOUT = get_setting('LISTING_INDEX_TIMEOUT')
+TRANSLATION_GROUPS_FILLED = get_setting('TRANSLATION_GROUPS_FILLED')
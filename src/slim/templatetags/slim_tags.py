@@ -1,3 +1,4 @@
+import hashlib
 import re
 
 from django import template
@@ -7,11 +8,13 @@ from django.utils.translation import ugettext_lazy as _
 
 from six import text_type
 
+from ..cache import get_cache
 from ..helpers import (
     smart_resolve,
-    default_language,
+    get_default_language,
     get_language_from_request,
     get_languages_keys,
+    get_languages_keys_set,
     get_languages_dict
 )
 
@@ -24,6 +27,7 @@ __all__ = (
     'get_translated_objects_for',
     'set_language',
     'multiling_is_enabled',
+    'slim_cache',
     'slim_language_name'
 )
 
@@ -79,7 +83,7 @@ class GetTranslatedObjectForNode(template.Node):
         if language is None:
             language = get_language_from_request(request)
             if not language:
-                language = default_language
+                language = get_default_language()
         else:
             language = text_type(language)
 
@@ -212,8 +216,8 @@ class SetLanguageNode(template.Node):
 
         if not language:
             language = smart_resolve(self.language, context)
-            if language not in get_languages_keys():
-                language = default_language
+            if language not in get_languages_keys_set():
+                language = get_default_language()
 
         translation.activate(language)
         return ''
@@ -293,6 +297,103 @@ def multiling_is_enabled(parser, token):
     return MultilinIsEnabledNode(as_var=as_var)
 
 
+class SlimCacheNode(template.Node):
+    """Node for ``slim_cache`` tag."""
+
+    def __init__(self, nodelist, timeout, obj, vary_on):
+        """Constructor.
+
+        :param nodelist: Nodes to render and cache.
+        :param timeout: Number of seconds to cache the fragment for.
+        :param obj: Object (of a model with ``LanguageField``) the fragment
+            depends on.
+        :param list vary_on: Additional values to vary the fragment on.
+        """
+        self.nodelist = nodelist
+        self.timeout = timeout
+        self.obj = obj
+        self.vary_on = vary_on
+
+    def get_cache_key(self, context):
+        """Get cache key of the fragment.
+
+        :return str:
+        """
+        obj = self.obj.resolve(context)
+        try:
+            version = obj.translation_group_version()
+        except AttributeError:
+            raise template.TemplateSyntaxError(
+                "Invalid usage of ``slim_cache``. Object shall be "
+                "multilingual."
+            )
+
+        parts = [
+            obj._meta.app_label,
+            obj._meta.object_name.lower(),
+            obj.translation_of_id or obj.pk,
+            version,
+            translation.get_language(),
+        ] + [var.resolve(context) for var in self.vary_on]
+        digest = hashlib.md5(
+            ':'.join(text_type(part) for part in parts).encode('utf-8')
+        ).hexdigest()
+        return 'slim.template.cache.%s' % digest
+
+    def render(self, context):
+        """Render."""
+        try:
+            timeout = int(self.timeout.resolve(context))
+        except (ValueError, TypeError):
+            raise template.TemplateSyntaxError(
+                "Invalid usage of ``slim_cache``. Timeout shall be an "
+                "integer."
+            )
+
+        cache = get_cache()
+        cache_key = self.get_cache_key(context)
+        value = cache.get(cache_key)
+        if value is None:
+            value = self.nodelist.render(context)
+            cache.set(cache_key, value, timeout)
+        return value
+
+
+@register.tag
+def slim_cache(parser, token):
+    """Cache the fragment until any translation of the object changes.
+
+    Cache key includes the version of the translation group of the object
+    (see ``slim.cache.get_group_version``) and the active language.
+
+    Syntax::
+        {% slim_cache [timeout] [object] [vary_on ...] %}
+        ...
+        {% endslim_cache %}
+
+    Example usage::
+        {% slim_cache 3600 article %}
+            {% get_translated_objects_for article as translations %}
+            ...
+        {% endslim_cache %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            "'%s' tag requires at least two arguments: timeout and "
+            "object." % bits[0]
+        )
+    nodelist = parser.parse(('endslim_cache',))
+    parser.delete_first_token()
+
+    return SlimCacheNode(
+        nodelist=nodelist,
+        timeout=parser.compile_filter(bits[1]),
+        obj=parser.compile_filter(bits[2]),
+        vary_on=[parser.compile_filter(bit) for bit in bits[3:]]
+    )
+
+
 @register.filter
 def slim_language_name(lang_code):
     """Not all languages are available in Django yet.
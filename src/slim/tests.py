@@ -1,6 +1,8 @@
 from __future__ import print_function
 
+import datetime
 import logging
+import operator
 import os
 import unittest
 
@@ -47,8 +49,64 @@ def log_info(func):
 # Skipping from non-Django tests.
 if os.environ.get("DJANGO_SETTINGS_MODULE", None):
 
+    from django.core.exceptions import PermissionDenied, ValidationError
+    from django.contrib import admin
+    from django.contrib.admin.models import CHANGE, DELETION, LogEntry
+    from django.contrib.auth.models import AnonymousUser, User
+    from django.core.management import call_command
+    from django.core.urlresolvers import NoReverseMatch, reverse
+    from django.db import IntegrityError, connection, transaction
+    from django.db.models.signals import post_delete
+    from django.template import Context, Template
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from django.test.utils import CaptureQueriesContext, override_settings
+    from django.utils import translation
+
     from foo.models import FooItem
 
+    import slim
+    from slim.admin import SlimAdmin
+    from slim.conf import settings as slim_settings
+    from slim.cache import (
+        bump_group_version,
+        get_cache,
+        get_group_version,
+        get_translation_map_key,
+        get_translation_group_urls,
+        get_translation_map,
+        tag_translation_group_page
+    )
+    from slim.decorators import translation_group_condition
+    from slim.handlers import (
+        SAVED_STATE_ATTR,
+        TRANSLATION_GROUP_FIELD_NAME,
+        URL_CACHE_ATTR,
+        has_translation_group_field,
+        remember_saved_state
+    )
+    from slim.cache import is_cache_enabled
+    from slim.helpers import (
+        default_language,
+        get_default_language,
+        get_language_from_request,
+        get_languages,
+        get_languages_dict,
+        get_languages_keys,
+        get_languages_keys_set
+    )
+    from slim.identity_map import translation_identity_map
+    from slim.listing import get_listing_index
+    from slim.middleware import TranslationGroupPageCacheMiddleware
+    from slim.models.decorators import compile_url_template
+    from slim.models.fields import LanguageField
+    from slim.models.managers import (
+        ON_CONFLICT_SKIP,
+        ON_CONFLICT_UPDATE,
+        has_dependent_objects
+    )
+    from slim.translations import get_fallback_chain
+
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -79,6 +137,10 @@ if os.environ.get("DJANGO_SETTINGS_MODULE", None):
             self.FOO_ITEM_RU_SLUG = "foo-title-ru"
             self.FOO_ITEM_RU_LANGUAGE = "ru"
 
+            self.FOO_ITEM_UNTRANSLATED_TITLE = "Untranslated title EN"
+            self.FOO_ITEM_UNTRANSLATED_BODY = "Untranslated body EN"
+            self.FOO_ITEM_UNTRANSLATED_SLUG = "untranslated-title-en"
+
         def __get_or_create_foo_items(self):
             # *************************************
             # ******** Creating main item *********
@@ -153,6 +215,32 @@ if os.environ.get("DJANGO_SETTINGS_MODULE", None):
 
             return foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru
 
+        def __get_or_create_untranslated_foo_item(self):
+            try:
+                foo_item = FooItem._default_manager.get(
+                    slug=self.FOO_ITEM_UNTRANSLATED_SLUG
+                )
+            except Exception:
+                foo_item = FooItem(
+                    title=self.FOO_ITEM_UNTRANSLATED_TITLE,
+                    body=self.FOO_ITEM_UNTRANSLATED_BODY,
+                    slug=self.FOO_ITEM_UNTRANSLATED_SLUG,
+                    language=self.FOO_ITEM_EN_LANGUAGE
+                )
+                foo_item.save()
+
+            return foo_item
+
+        def __get_or_create_superuser(self):
+            try:
+                user = User._default_manager.get(username='slim-admin')
+            except User.DoesNotExist:
+                user = User._default_manager.create_superuser(
+                    'slim-admin', 'slim-admin@example.com', 'test'
+                )
+
+            return user
+
         @log_info
         def test_01_get_translations(self):
             """Test ``get_translation_for`` method."""
@@ -262,6 +350,1510 @@ if os.environ.get("DJANGO_SETTINGS_MODULE", None):
             self.assertEqual(foo_item_nl.original_translation, foo_item_en)
             self.assertEqual(foo_item_ru.original_translation, foo_item_en)
 
+        @log_info
+        def test_05_translation_identity_map(self):
+            """Test ``get_translation_for`` with an active identity map."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+
+            foo_item_en = FooItem._default_manager.get(pk=foo_item_en.pk)
+
+            with translation_identity_map():
+                with CaptureQueriesContext(connection) as captured:
+                    self.assertEqual(foo_item_en.get_translation_for('hy'),
+                                     foo_item_hy)
+                    self.assertEqual(foo_item_en.get_translation_for('hy'),
+                                     foo_item_hy)
+                self.assertEqual(len(captured), 1)
+
+                # Misses are remembered as well
+                foo_item_hy.delete()
+                with CaptureQueriesContext(connection) as captured:
+                    self.assertIsNone(foo_item_en.get_translation_for('hy'))
+                    self.assertIsNone(foo_item_en.get_translation_for('hy'))
+                self.assertEqual(len(captured), 1)
+
+            # Without identity map every call hits the database
+            with CaptureQueriesContext(connection) as captured:
+                foo_item_en.get_translation_for('nl')
+                foo_item_en.get_translation_for('nl')
+            self.assertEqual(len(captured), 2)
+
+        @log_info
+        def test_06_translated_to(self):
+            """Test ``translated_to`` queryset method."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+            untranslated_item = self.__get_or_create_untranslated_foo_item()
+
+            queryset = FooItem._default_manager.filter(
+                pk__in=[untranslated_item.pk, foo_item_hy.pk]
+            ).order_by('-pk')
+
+            with CaptureQueriesContext(connection) as captured:
+                translated = queryset.translated_to('nl')
+            self.assertEqual(len(captured), 2)
+            self.assertEqual(translated, [None, foo_item_nl])
+
+            translated = queryset.translated_to('nl', fallback=True)
+            self.assertEqual(translated, [untranslated_item, foo_item_nl])
+
+            translated = queryset.translated_to('en')
+            self.assertEqual(translated, [untranslated_item, foo_item_en])
+
+            return translated
+
+        @log_info
+        def test_07_with_translation_groups(self):
+            """Test ``with_translation_groups`` queryset method."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+            untranslated_item = self.__get_or_create_untranslated_foo_item()
+
+            pks = [foo_item_en.pk, foo_item_hy.pk, foo_item_nl.pk,
+                   foo_item_ru.pk, untranslated_item.pk]
+
+            expected = {}
+            for foo_item in FooItem._default_manager.filter(pk__in=pks):
+                expected[foo_item.pk] = (
+                    sorted(
+                        obj.pk for obj in foo_item.available_translations()
+                    ),
+                    foo_item.original_translation,
+                    foo_item.get_translation_for('ru'),
+                )
+
+            with CaptureQueriesContext(connection) as captured:
+                queryset = FooItem._default_manager \
+                                  .filter(pk__in=pks) \
+                                  .with_translation_groups()
+                for foo_item in queryset:
+                    self.assertEqual(
+                        (
+                            sorted(
+                                obj.pk
+                                for obj in foo_item.available_translations()
+                            ),
+                            foo_item.original_translation,
+                            foo_item.get_translation_for('ru'),
+                        ),
+                        expected[foo_item.pk]
+                    )
+            self.assertEqual(len(captured), 2)
+
+            return expected
+
+        @log_info
+        def test_08_get_translations_for(self):
+            """Test ``get_translations_for`` method."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+
+            foo_item_en = FooItem._default_manager.get(pk=foo_item_en.pk)
+
+            with CaptureQueriesContext(connection) as captured:
+                translations = foo_item_en.get_translations_for()
+            self.assertEqual(len(captured), 1)
+            self.assertEqual(
+                translations,
+                {
+                    'en': foo_item_en,
+                    'hy': foo_item_hy,
+                    'nl': foo_item_nl,
+                    'ru': foo_item_ru,
+                }
+            )
+
+            untranslated_item = self.__get_or_create_untranslated_foo_item()
+            self.assertEqual(
+                untranslated_item.get_translations_for(['en', 'nl', 'xx']),
+                {'en': untranslated_item, 'nl': None, 'xx': None}
+            )
+
+            return translations
+
+        @log_info
+        def test_09_translation_group_field(self):
+            """Test the translation group field and its' backfill command."""
+            if not has_translation_group_field(FooItem):
+                self.skipTest("Translation group field is not enabled.")
+
+            foo_items = self.__get_or_create_foo_items()
+            foo_item_en = foo_items[0]
+            pks = [foo_item.pk for foo_item in foo_items]
+
+            def get_translation_groups():
+                queryset = FooItem._default_manager.filter(pk__in=pks)
+                return list(
+                    queryset.values_list('translation_group_pk', flat=True)
+                )
+
+            self.assertEqual(get_translation_groups(), [foo_item_en.pk] * 4)
+
+            FooItem._default_manager.update(translation_group_pk=None)
+
+            # Not filled in yet, looked up by ``translation_of``
+            foo_item = FooItem._default_manager.get(pk=foo_item_en.pk)
+            self.assertEqual(
+                sorted(obj.pk for obj in foo_item.available_translations()),
+                sorted(pks[1:])
+            )
+
+            call_command('slim_backfill_translation_groups',
+                         batch_size=2,
+                         verbosity=0)
+
+            self.assertEqual(get_translation_groups(), [foo_item_en.pk] * 4)
+
+            return get_translation_groups()
+
+        @log_info
+        def test_10_composite_indexes(self):
+            """Test composite indexes added by the ``LanguageField``."""
+            index_together = [
+                tuple(fields) for fields in FooItem._meta.index_together
+            ]
+            self.assertIn(('translation_of', 'language'), index_together)
+            self.assertIn(('language', 'date_published'), index_together)
+
+            return index_together
+
+        @log_info
+        def test_11_best_translations(self):
+            """Test ``best_translations`` queryset method."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+            untranslated_item = self.__get_or_create_untranslated_foo_item()
+
+            pks = [foo_item_en.pk, foo_item_hy.pk, foo_item_nl.pk,
+                   foo_item_ru.pk, untranslated_item.pk]
+            queryset = FooItem._default_manager.filter(pk__in=pks)
+
+            with CaptureQueriesContext(connection) as captured:
+                best_translations = list(
+                    queryset.best_translations('nl').order_by('-pk')
+                )
+            self.assertEqual(len(captured), 1)
+            self.assertEqual(best_translations,
+                             [untranslated_item, foo_item_nl])
+
+            best_translations = list(
+                queryset.best_translations('en').order_by('pk')[:1]
+            )
+            self.assertEqual(best_translations, [foo_item_en])
+
+            return best_translations
+
+        @log_info
+        def test_12_language_fallbacks(self):
+            """Test language fallback chains."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+            untranslated_item = self.__get_or_create_untranslated_foo_item()
+
+            self.assertEqual(get_fallback_chain('nl'), ('nl', 'en'))
+            self.assertEqual(get_fallback_chain('nl-be'),
+                             ('nl-be', 'nl', 'en'))
+
+            self.assertEqual(
+                foo_item_hy.get_translation_for('nl-be', fallback=True),
+                foo_item_nl
+            )
+
+            with CaptureQueriesContext(connection) as captured:
+                self.assertEqual(
+                    untranslated_item.get_translation_for('ru', fallback=True),
+                    untranslated_item
+                )
+            self.assertEqual(len(captured), 1)
+
+            translated = FooItem._default_manager \
+                                .filter(pk__in=[untranslated_item.pk,
+                                                foo_item_hy.pk]) \
+                                .order_by('-pk') \
+                                .translated_to('nl-be', fallback=True)
+            self.assertEqual(translated, [untranslated_item, foo_item_nl])
+
+            return translated
+
+        @log_info
+        def test_13_translation_group(self):
+            """Test ``translation_group`` method."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+
+            with CaptureQueriesContext(connection) as captured:
+                group = foo_item_nl.translation_group(fields=('pk', 'slug'))
+            self.assertEqual(len(captured), 1)
+
+            self.assertEqual(group.languages()[0], 'en')
+            self.assertEqual(sorted(group.languages()),
+                             ['en', 'hy', 'nl', 'ru'])
+            self.assertEqual(group['hy'].slug, foo_item_hy.slug)
+            self.assertEqual(group.original.pk, foo_item_en.pk)
+            self.assertIsNone(group.get('xx'))
+            self.assertRaises(AttributeError, setattr, group, 'fields', ())
+
+            groups = FooItem._default_manager \
+                            .filter(pk__in=[foo_item_en.pk, foo_item_ru.pk]) \
+                            .translation_groups(fields=('slug',))
+            self.assertEqual(groups[foo_item_ru.pk]['nl'].slug,
+                             foo_item_nl.slug)
+            self.assertIs(groups[foo_item_ru.pk], groups[foo_item_en.pk])
+
+            return group
+
+        @log_info
+        def test_14_translation_set(self):
+            """Test ``TranslationSet`` returned by ``available_translations``.
+            """
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+
+            foo_item_nl = FooItem._default_manager.get(pk=foo_item_nl.pk)
+
+            with CaptureQueriesContext(connection) as captured:
+                translations = foo_item_nl.available_translations()
+                self.assertEqual(len(translations), 3)
+                self.assertTrue(translations)
+                self.assertEqual(translations[0], foo_item_en)
+                self.assertEqual(sorted(translations.languages()),
+                                 ['en', 'hy', 'ru'])
+                self.assertIs(foo_item_nl.available_translations(),
+                              translations)
+            self.assertEqual(len(captured), 1)
+
+            self.assertEqual(
+                translations.filter(language='hy').get(),
+                foo_item_hy
+            )
+            self.assertFalse(FooItem().available_translations())
+
+            return translations
+
+        @log_info
+        def test_15_translation_map_cache(self):
+            """Test translation maps stored in the shared cache."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+            untranslated_item = self.__get_or_create_untranslated_foo_item()
+
+            cache_enabled = override_settings(SLIM_USE_CACHE=True)
+            cache_enabled.enable()
+            get_cache().clear()
+            try:
+                # Cold cache: translation map is built
+                with CaptureQueriesContext(connection) as captured:
+                    self.assertEqual(
+                        get_translation_map(FooItem, foo_item_en.pk),
+                        {'en': foo_item_en.pk, 'hy': foo_item_hy.pk,
+                         'nl': foo_item_nl.pk, 'ru': foo_item_ru.pk}
+                    )
+                self.assertEqual(len(captured), 1)
+
+                # Warm cache: translations are fetched by primary key
+                foo_item_hy = FooItem._default_manager \
+                                     .select_related('translation_of') \
+                                     .get(pk=foo_item_hy.pk)
+                with CaptureQueriesContext(connection) as captured:
+                    self.assertEqual(foo_item_hy.get_translation_for('nl'),
+                                     foo_item_nl)
+                    self.assertEqual(len(foo_item_hy.available_translations()),
+                                     3)
+                self.assertEqual(len(captured), 2)
+
+                # Missing translations cost no queries
+                get_translation_map(FooItem, untranslated_item.pk)
+                untranslated_item = FooItem._default_manager.get(
+                    pk=untranslated_item.pk
+                )
+                with CaptureQueriesContext(connection) as captured:
+                    self.assertIsNone(
+                        untranslated_item.get_translation_for('nl')
+                    )
+                    self.assertFalse(
+                        untranslated_item.available_translations()
+                    )
+                self.assertEqual(len(captured), 0)
+
+                # Saving invalidates the translation map
+                translation = FooItem._default_manager.create(
+                    title='Untranslated title NL',
+                    slug='untranslated-title-nl',
+                    body=self.FOO_ITEM_UNTRANSLATED_BODY,
+                    language='nl',
+                    translation_of=untranslated_item
+                )
+                untranslated_item = FooItem._default_manager.get(
+                    pk=untranslated_item.pk
+                )
+                self.assertEqual(untranslated_item.get_translation_for('nl'),
+                                 translation)
+                translation.delete()
+                self.assertEqual(
+                    get_translation_map(FooItem, untranslated_item.pk),
+                    {'en': untranslated_item.pk}
+                )
+
+                # Maps built before the group changed are ignored
+                version = get_group_version(FooItem, untranslated_item.pk)
+                bump_group_version(FooItem, untranslated_item.pk)
+                get_cache().set(
+                    get_translation_map_key(FooItem, untranslated_item.pk),
+                    (version, {'en': untranslated_item.pk,
+                               'nl': foo_item_nl.pk})
+                )
+                self.assertEqual(
+                    get_translation_map(FooItem, untranslated_item.pk),
+                    {'en': untranslated_item.pk}
+                )
+
+                # Moving a translation invalidates both groups
+                other_item = FooItem._default_manager.create(
+                    title='Other title EN',
+                    slug='other-title-en',
+                    body=self.FOO_ITEM_UNTRANSLATED_BODY,
+                    language='en'
+                )
+                translation = FooItem._default_manager.create(
+                    title='Untranslated title NL',
+                    slug='untranslated-title-nl',
+                    body=self.FOO_ITEM_UNTRANSLATED_BODY,
+                    language='nl',
+                    translation_of=untranslated_item
+                )
+                get_translation_map(FooItem, untranslated_item.pk)
+                get_translation_map(FooItem, other_item.pk)
+                translation.translation_of = other_item
+                translation.save()
+                self.assertEqual(
+                    get_translation_map(FooItem, untranslated_item.pk),
+                    {'en': untranslated_item.pk}
+                )
+                self.assertEqual(
+                    get_translation_map(FooItem, other_item.pk),
+                    {'en': other_item.pk, 'nl': translation.pk}
+                )
+                translation.delete()
+                other_item.delete()
+
+                # Moves are told without queries (values loaded later are
+                # fetched using a single query)
+                translation = FooItem._default_manager.get(pk=foo_item_nl.pk)
+                with CaptureQueriesContext(connection) as captured:
+                    remember_saved_state(FooItem, translation)
+                    self.assertNotIn(SAVED_STATE_ATTR, translation.__dict__)
+                    translation.translation_of_id = untranslated_item.pk
+                    remember_saved_state(FooItem, translation)
+                self.assertEqual(len(captured), 0)
+                self.assertEqual(
+                    translation.__dict__[SAVED_STATE_ATTR],
+                    {'group_pk': foo_item_en.pk}
+                )
+                translation = FooItem._default_manager.only('title') \
+                                                      .get(pk=foo_item_nl.pk)
+                translation.translation_of_id = untranslated_item.pk
+                with CaptureQueriesContext(connection) as captured:
+                    remember_saved_state(FooItem, translation)
+                self.assertEqual(len(captured), 1)
+                self.assertEqual(
+                    translation.__dict__[SAVED_STATE_ATTR],
+                    {'group_pk': foo_item_en.pk}
+                )
+            finally:
+                cache_enabled.disable()
+                get_cache().clear()
+
+            return foo_item_hy
+
+        @log_info
+        def test_16_slim_cache_tag(self):
+            """Test translation group versions and ``slim_cache`` tag."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+            untranslated_item = self.__get_or_create_untranslated_foo_item()
+
+            template = Template(
+                "{% load slim_tags %}"
+                "{% slim_cache 60 item %}{{ value }}{% endslim_cache %}"
+            )
+
+            def render(item, value):
+                return template.render(Context({'item': item,
+                                                'value': value}))
+
+            version = foo_item_en.translation_group_version()
+            self.assertEqual(foo_item_nl.translation_group_version(), version)
+            self.assertEqual(render(foo_item_en, 'first'), 'first')
+            self.assertEqual(render(foo_item_nl, 'second'), 'first')
+            self.assertEqual(render(untranslated_item, 'third'), 'third')
+
+            # Varies on the active language
+            translation.activate('nl')
+            try:
+                self.assertEqual(render(foo_item_en, 'fourth'), 'fourth')
+            finally:
+                translation.deactivate()
+
+            # Saving any translation changes the version
+            foo_item_ru.save()
+            self.assertNotEqual(foo_item_en.translation_group_version(),
+                                version)
+            self.assertEqual(render(foo_item_en, 'fifth'), 'fifth')
+            self.assertEqual(render(untranslated_item, 'sixth'), 'third')
+
+            return version
+
+        @log_info
+        def test_17_translation_group_condition(self):
+            """Test ``translation_group_condition`` view decorator."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+            calls = []
+
+            @translation_group_condition(FooItem)
+            def detail(request, slug):
+                calls.append(slug)
+                return HttpResponse(slug)
+
+            factory = RequestFactory()
+
+            with CaptureQueriesContext(connection) as captured:
+                response = detail(factory.get('/'), slug=foo_item_nl.slug)
+            self.assertEqual(len(captured), 1)
+            self.assertEqual(response.status_code, 200)
+            etag = response['ETag']
+            self.assertTrue(response.has_header('Last-Modified'))
+
+            # Not modified: the view is not called
+            response = detail(factory.get('/', HTTP_IF_NONE_MATCH=etag),
+                              slug=foo_item_nl.slug)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(len(calls), 1)
+
+            # Same group, same tag
+            response = detail(factory.get('/'), slug=foo_item_en.slug)
+            self.assertEqual(response['ETag'], etag)
+
+            # Saving a sibling changes the tag
+            foo_item_ru.save()
+            response = detail(factory.get('/', HTTP_IF_NONE_MATCH=etag),
+                              slug=foo_item_nl.slug)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+
+            # Unknown objects are left to the view
+            response = detail(factory.get('/'), slug='does-not-exist')
+            self.assertFalse(response.has_header('ETag'))
+
+            return etag
+
+        @log_info
+        def test_18_translation_group_page_cache(self):
+            """Test ``TranslationGroupPageCacheMiddleware``."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+
+            with CaptureQueriesContext(connection) as captured:
+                urls = get_translation_group_urls(FooItem,
+                                                  [foo_item_en.pk],
+                                                  fields=('slug',))
+            self.assertEqual(len(captured), 1)
+            self.assertEqual(
+                sorted(urls),
+                sorted(obj.get_absolute_url() for obj in
+                       (foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru))
+            )
+
+            middleware = TranslationGroupPageCacheMiddleware()
+            factory = RequestFactory()
+            get_cache().clear()
+
+            def get(obj, content, user=None, vary=None, cache_control=None,
+                    **extra):
+                request = factory.get(obj.get_absolute_url(), **extra)
+                request.user = user or AnonymousUser()
+                response = middleware.process_request(request)
+                if response is None:
+                    response = tag_translation_group_page(
+                        HttpResponse(content), obj
+                    )
+                    if vary:
+                        response['Vary'] = vary
+                    if cache_control:
+                        response['Cache-Control'] = cache_control
+                    response = middleware.process_response(request, response)
+                return response.content.decode('utf-8')
+
+            self.assertEqual(get(foo_item_nl, 'first'), 'first')
+            self.assertEqual(get(foo_item_nl, 'second'), 'first')
+            self.assertEqual(get(foo_item_hy, 'third'), 'third')
+
+            # Pages are cached per host
+            with override_settings(ALLOWED_HOSTS=['testserver',
+                                                  'example.com']):
+                self.assertEqual(
+                    get(foo_item_nl, 'other', HTTP_HOST='example.com'),
+                    'other'
+                )
+                self.assertEqual(
+                    get(foo_item_nl, 'another', HTTP_HOST='example.com'),
+                    'other'
+                )
+
+            # Saving any translation purges pages of the whole group
+            foo_item_en.save()
+            self.assertEqual(get(foo_item_nl, 'fourth'), 'fourth')
+            self.assertEqual(get(foo_item_hy, 'fifth'), 'fifth')
+
+            # Pages of the old URL are purged too
+            foo_item_hy.slug = self.FOO_ITEM_HY_SLUG + '-renamed'
+            foo_item_hy.save()
+            try:
+                foo_item_hy.slug = self.FOO_ITEM_HY_SLUG
+                self.assertEqual(get(foo_item_hy, 'renamed'), 'renamed')
+            finally:
+                foo_item_hy.save()
+
+            # Fields not listed are loaded on access
+            self.assertEqual(
+                sorted(get_translation_group_urls(FooItem, [foo_item_en.pk],
+                                                  fields=())),
+                sorted(urls)
+            )
+            field = LanguageField(url_fields=('slug', 'unknown'))
+            field.model = FooItem
+            self.assertEqual(
+                [error.id for error in field._check_url_fields()],
+                ['slim.E001']
+            )
+
+            # Nor for unknown users (``AuthenticationMiddleware`` missing)
+            request = factory.get(foo_item_nl.get_absolute_url())
+            self.assertIsNone(middleware.process_request(request))
+            middleware.process_response(
+                request,
+                tag_translation_group_page(HttpResponse('unknown'),
+                                           foo_item_nl)
+            )
+            self.assertEqual(get(foo_item_nl, 'known'), 'known')
+            get_cache().clear()
+
+            # Objects whose URL can't be built are skipped (reversed
+            # without compiled URL templates, which do not check values)
+            def get_absolute_url(obj):
+                return '/%s%s' % (
+                    obj.language,
+                    reverse('foo.detail', kwargs={'slug': obj.slug})
+                )
+
+            compiled_get_absolute_url = FooItem.get_absolute_url
+            FooItem.get_absolute_url = get_absolute_url
+            try:
+                unreversible = FooItem._default_manager.create(
+                    title='Overview NL', slug='overview-nl',
+                    body='Overview body', language='nl'
+                )
+                self.assertRaises(NoReverseMatch,
+                                  unreversible.get_absolute_url)
+                reversible = FooItem._default_manager.create(
+                    title='Overview EN', slug='en-overview',
+                    body='Overview body', language='en',
+                    translation_of=unreversible
+                )
+                self.assertEqual(
+                    get_translation_group_urls(FooItem, [unreversible.pk],
+                                               fields=('slug',)),
+                    [reversible.get_absolute_url()]
+                )
+                reversible.slug = 'overview-en'
+                reversible.save()
+                reversible.delete()
+                unreversible.delete()
+            finally:
+                FooItem.get_absolute_url = compiled_get_absolute_url
+                FooItem._default_manager.filter(
+                    title__startswith='Overview'
+                ).delete()
+
+            # Not for authenticated users
+            user = self.__get_or_create_superuser()
+            self.assertEqual(get(foo_item_nl, 'sixth', user=user), 'sixth')
+            self.assertEqual(get(foo_item_nl, 'seventh'), 'seventh')
+            self.assertEqual(get(foo_item_nl, 'eighth', user=user), 'eighth')
+            self.assertEqual(get(foo_item_nl, 'ninth'), 'seventh')
+
+            # Nor for private pages and pages varying on cookies
+            get_cache().clear()
+            self.assertEqual(get(foo_item_nl, 'a', vary='Cookie'), 'a')
+            self.assertEqual(get(foo_item_nl, 'b', cache_control='private'),
+                             'b')
+            self.assertEqual(get(foo_item_nl, 'c'), 'c')
+
+            # Pages are keyed by the headers they vary on
+            get_cache().clear()
+            self.assertEqual(
+                get(foo_item_nl, 'nl', vary='Accept-Language',
+                    HTTP_ACCEPT_LANGUAGE='nl'),
+                'nl'
+            )
+            self.assertEqual(
+                get(foo_item_nl, 'ru', vary='Accept-Language',
+                    HTTP_ACCEPT_LANGUAGE='ru'),
+                'ru'
+            )
+            self.assertEqual(
+                get(foo_item_nl, 'xx', vary='Accept-Language',
+                    HTTP_ACCEPT_LANGUAGE='nl'),
+                'nl'
+            )
+
+            get_cache().clear()
+
+            return urls
+
+        @log_info
+        def test_19_bulk(self):
+            """Test ``slim.bulk`` and bulk operations."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+            untranslated_item = self.__get_or_create_untranslated_foo_item()
+
+            version = foo_item_en.translation_group_version()
+            with slim.bulk():
+                foo_item_nl.save()
+                foo_item_ru.save()
+                with slim.bulk():
+                    untranslated_item.save()
+                # Nothing invalidated yet
+                self.assertEqual(foo_item_en.translation_group_version(),
+                                 version)
+            self.assertNotEqual(foo_item_en.translation_group_version(),
+                                version)
+
+            # Saving N objects costs N queries, moves and URL changes
+            # included
+            items = [foo_item_hy, foo_item_nl, foo_item_ru]
+            version = foo_item_en.translation_group_version()
+            foo_item_ru.translation_of = untranslated_item
+            foo_item_hy.slug = 'foo-title-hy-moved'
+            with slim.bulk():
+                with CaptureQueriesContext(connection) as captured:
+                    for item in items:
+                        item.save()
+                self.assertEqual(
+                    len([query for query in captured.captured_queries
+                         if 'BEGIN' not in query['sql']]),
+                    len(items)
+                )
+                self.assertEqual(foo_item_en.translation_group_version(),
+                                 version)
+            # The group ``foo_item_ru`` has been moved from is invalidated
+            self.assertNotEqual(foo_item_en.translation_group_version(),
+                                version)
+            self.assertEqual(
+                sorted(FooItem._default_manager.get(pk=foo_item_en.pk)
+                       .available_translations().languages()),
+                ['hy', 'nl']
+            )
+            foo_item_ru.translation_of = foo_item_en
+            foo_item_hy.slug = self.FOO_ITEM_HY_SLUG
+            with slim.bulk():
+                for item in items:
+                    item.save()
+            self.assertEqual(
+                sorted(FooItem._default_manager.get(pk=foo_item_en.pk)
+                       .available_translations().languages()),
+                ['hy', 'nl', 'ru']
+            )
+
+            # Signals are not sent by ``bulk_create``
+            version = untranslated_item.translation_group_version()
+            translations = FooItem._default_manager.bulk_create([
+                FooItem(title='Untranslated title %s' % language,
+                        slug='untranslated-title-%s' % language,
+                        body=self.FOO_ITEM_UNTRANSLATED_BODY,
+                        language=language,
+                        translation_of=untranslated_item)
+                for language in ('hy', 'nl')
+            ])
+            self.assertNotEqual(untranslated_item.translation_group_version(),
+                                version)
+            self.assertEqual(
+                sorted(untranslated_item.available_translations().languages()),
+                ['hy', 'nl']
+            )
+
+            # Nor by ``bulk_update``
+            translations = list(
+                untranslated_item.available_translations().queryset()
+            )
+            version = untranslated_item.translation_group_version()
+            for item in translations:
+                item.title = 'Updated title %s' % item.language
+            FooItem._default_manager.bulk_update(translations, ['title'])
+            self.assertNotEqual(untranslated_item.translation_group_version(),
+                                version)
+            self.assertEqual(
+                FooItem._default_manager.filter(
+                    title__startswith='Updated title'
+                ).count(),
+                2
+            )
+
+            # Originals get their translation group field filled in
+            if has_translation_group_field(FooItem):
+                FooItem._default_manager.bulk_create([
+                    FooItem(title='Bulk title', slug='bulk-title',
+                            body='Bulk body', language='en')
+                ])
+                original = FooItem._default_manager.get(slug='bulk-title')
+                self.assertEqual(
+                    getattr(original, TRANSLATION_GROUP_FIELD_NAME),
+                    original.pk
+                )
+                original.delete()
+
+            # Caches are invalidated on errors as well
+            version = foo_item_en.translation_group_version()
+            try:
+                with slim.bulk():
+                    foo_item_hy.save()
+                    raise ValueError
+            except ValueError:
+                pass
+            self.assertNotEqual(foo_item_en.translation_group_version(),
+                                version)
+
+            FooItem._default_manager.filter(
+                pk__in=[translation.pk for translation in translations]
+            ).delete()
+
+            return translations
+
+        @log_info
+        def test_20_warm_cache(self):
+            """Test ``slim_warm_cache`` management command."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+            untranslated_item = self.__get_or_create_untranslated_foo_item()
+            keys = [get_translation_map_key(FooItem, foo_item_en.pk),
+                    get_translation_map_key(FooItem, untranslated_item.pk)]
+
+            cache_enabled = override_settings(SLIM_USE_CACHE=True)
+            cache_enabled.enable()
+            get_cache().clear()
+            try:
+                call_command('slim_warm_cache', 'foo.FooItem',
+                             chunk_size=1, verbosity=0)
+                self.assertEqual(len(get_cache().get_many(keys)), 2)
+                with CaptureQueriesContext(connection) as captured:
+                    translation_map = get_translation_map(FooItem,
+                                                          foo_item_en.pk)
+                self.assertEqual(len(captured), 0)
+                self.assertEqual(translation_map['nl'], foo_item_nl.pk)
+
+                get_cache().clear()
+                call_command('slim_warm_cache', languages='nl',
+                             verbosity=0)
+                self.assertEqual(list(get_cache().get_many(keys)),
+                                 [keys[0]])
+
+                untranslated_item.save()
+                get_cache().clear()
+                call_command('slim_warm_cache', recent=1, verbosity=0)
+                self.assertEqual(list(get_cache().get_many(keys)),
+                                 [keys[1]])
+            finally:
+                cache_enabled.disable()
+                get_cache().clear()
+
+            return translation_map
+
+        @log_info
+        def test_21_listing_index(self):
+            """Test listing indexes."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+            self.__get_or_create_untranslated_foo_item()
+
+            index = get_listing_index(FooItem, '-date_published')
+            get_cache().clear()
+
+            def get_page(language):
+                return index.get_page(language, number=1, per_page=10)
+
+            def get_expected_page(language):
+                return list(index.queryset(language)[:10])
+
+            with CaptureQueriesContext(connection) as captured:
+                items = get_page('nl')
+            self.assertEqual(len(captured), 2)
+            self.assertEqual(items, get_expected_page('nl'))
+            self.assertIn(foo_item_nl, items)
+            self.assertNotIn(foo_item_en, items)
+
+            with CaptureQueriesContext(connection) as captured:
+                self.assertEqual(get_page('nl'), items)
+            self.assertEqual(len(captured), 1)
+
+            # Indexes built from data read before a change are not used
+            for languages in (None, ['nl']):
+                generation = index.get_generation('nl')
+                index.drop(languages)
+                index.build('nl', generation)
+                with CaptureQueriesContext(connection) as captured:
+                    self.assertEqual(get_page('nl'), items)
+                self.assertEqual(len(captured), 2)
+
+            def count_queries(language):
+                with CaptureQueriesContext(connection) as captured:
+                    page = get_page(language)
+                self.assertEqual(page, get_expected_page(language))
+                return len(captured)
+
+            # Saves not moving objects within listings keep the indexes
+            get_page('en')
+            foo_item_nl = FooItem._default_manager.get(pk=foo_item_nl.pk)
+            foo_item_nl.title = 'Listing title NL'
+            foo_item_nl.save()
+            FooItem.objects.bulk_update([foo_item_nl], ['title'])
+            self.assertEqual(count_queries('nl'), 1)
+
+            # Translations moving drop the index of their language only
+            foo_item_nl.date_published = datetime.datetime(1990, 1, 1)
+            foo_item_nl.save()
+            self.assertEqual(count_queries('nl'), 2)
+            self.assertEqual(count_queries('en'), 1)
+
+            # Originals are listed in all languages lacking a translation
+            foo_item_en = FooItem._default_manager.get(pk=foo_item_en.pk)
+            foo_item_en.date_published = datetime.datetime(1990, 1, 1)
+            with slim.bulk():
+                foo_item_en.save()
+            self.assertEqual(count_queries('nl'), 2)
+            self.assertEqual(count_queries('en'), 2)
+            items = get_page('nl')
+
+            # Saves drop the index
+            original = FooItem._default_manager.create(
+                title='Listing title EN', slug='listing-title-en',
+                body='Listing body EN', language='en'
+            )
+            self.assertEqual(index.get_pks('nl', 0, 1), [original.pk])
+            self.assertEqual(get_page('nl'), get_expected_page('nl'))
+
+            translation = FooItem._default_manager.create(
+                title='Listing title NL', slug='listing-title-nl',
+                body='Listing body NL', language='nl',
+                translation_of=original
+            )
+            self.assertEqual(index.get_pks('nl', 0, 1), [translation.pk])
+            self.assertEqual(get_page('nl'), get_expected_page('nl'))
+
+            translation.delete()
+            original.delete()
+            self.assertEqual(get_page('nl'), items)
+
+            # So does ``bulk_create`` (even if primary keys are not returned)
+            created = FooItem.objects.bulk_create([
+                FooItem(title='Listing title EN', slug='listing-title-en',
+                        body='Listing body EN', language='en')
+            ])
+            try:
+                self.assertEqual(get_page('nl'), get_expected_page('nl'))
+                self.assertNotEqual(get_page('nl'), items)
+            finally:
+                FooItem._default_manager.filter(
+                    slug='listing-title-en'
+                ).delete()
+            self.assertEqual(len(created), 1)
+
+            get_cache().clear()
+
+            return items
+
+        @log_info
+        def test_22_language_tables(self):
+            """Test cached language tables."""
+            languages = get_languages()
+            self.assertIs(get_languages(), languages)
+            self.assertIsInstance(languages, tuple)
+            self.assertEqual(get_languages_keys(),
+                             [code for code, name in languages])
+            get_languages_keys().append('xx')
+            self.assertNotIn('xx', get_languages_keys())
+            self.assertIn('nl', get_languages_keys_set())
+            self.assertIs(get_languages_dict(), get_languages_dict())
+            if PY3:
+                self.assertRaises(TypeError,
+                                  operator.setitem,
+                                  get_languages_dict(), 'xx', 'Xx')
+
+            with override_settings(LANGUAGES=(('en', 'English'),
+                                              ('de', 'German'))):
+                self.assertEqual(get_languages_keys(), ['en', 'de'])
+                self.assertEqual(get_fallback_chain('de-at'),
+                                 ('de-at', 'de', 'en'))
+                self.assertNotIn('nl', get_languages_keys_set())
+
+            with override_settings(SLIM_LANGUAGE_FALLBACKS={'nl': ['ru']}):
+                self.assertEqual(get_fallback_chain('nl'), ('nl', 'ru'))
+
+            self.assertEqual(get_languages(), languages)
+            self.assertIn('nl', get_languages_keys_set())
+            self.assertEqual(get_fallback_chain('nl'), ('nl', 'en'))
+
+            return languages
+
+        @log_info
+        def test_23_lazy_settings(self):
+            """Test settings resolved on use, following overrides."""
+            request = RequestFactory().get('/')
+            self.assertEqual(get_default_language(), 'en')
+            self.assertEqual(default_language, 'en')
+            self.assertEqual(get_language_from_request(request), 'en')
+
+            with override_settings(SLIM_USE_CACHE=True,
+                                   SLIM_CACHE_TIMEOUT=42,
+                                   LANGUAGES=(('nl', 'Dutch'),
+                                              ('en', 'English'))):
+                self.assertTrue(slim_settings.USE_CACHE)
+                self.assertTrue(is_cache_enabled())
+                self.assertEqual(slim_settings.CACHE_TIMEOUT, 42)
+                self.assertEqual(get_default_language(), 'nl')
+                self.assertEqual(default_language, 'nl')
+                self.assertEqual(get_language_from_request(request), 'nl')
+
+            self.assertFalse(slim_settings.USE_CACHE)
+            self.assertFalse(is_cache_enabled())
+            self.assertEqual(get_default_language(), 'en')
+            self.assertEqual(get_language_from_request(request, 'ru'), 'ru')
+            self.assertRaises(AttributeError,
+                              getattr, slim_settings, 'NO_SUCH_SETTING')
+
+            return slim_settings
+
+        @log_info
+        def test_24_cached_auto_prepend_language(self):
+            """Test the ``cached_auto_prepend_language`` model decorator."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+
+            def get_url(obj):
+                return reverse('foo.detail', kwargs={'slug': obj.slug})
+
+            self.assertEqual(compile_url_template(get_url, ('slug',)),
+                             ('/foo/%(slug)s/', ('slug',)))
+            # Depends on a field not listed
+            self.assertIsNone(compile_url_template(get_url, ('title',)))
+
+            url = foo_item_nl.get_absolute_url()
+            self.assertEqual(url, '/nl' + get_url(foo_item_nl))
+            self.assertEqual(list(foo_item_nl.__dict__[URL_CACHE_ATTR]
+                                  .values()),
+                             [url])
+            self.assertEqual(foo_item_nl.get_absolute_url(), url)
+
+            # Changed fields are not served from the memo
+            slug = foo_item_nl.slug
+            foo_item_nl.slug = 'cached-url-nl'
+            self.assertEqual(foo_item_nl.get_absolute_url(),
+                             '/nl/foo/cached-url-nl/')
+
+            # Memo is cleared on save
+            foo_item_nl.slug = slug
+            foo_item_nl.__dict__[URL_CACHE_ATTR] = {'stale': 'stale'}
+            foo_item_nl.save()
+            self.assertNotIn('stale',
+                             foo_item_nl.__dict__.get(URL_CACHE_ATTR, {}))
+            self.assertEqual(foo_item_nl.get_absolute_url(), url)
+
+            return url
+
+        @log_info
+        def test_25_language_field_validate(self):
+            """Test ``LanguageField.validate`` and unique translations."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+            untranslated_item = self.__get_or_create_untranslated_foo_item()
+            field = FooItem._meta.get_field('language')
+
+            def validate(value, obj):
+                with CaptureQueriesContext(connection) as captured:
+                    try:
+                        field.validate(value, obj)
+                    except ValidationError:
+                        valid = False
+                    else:
+                        valid = True
+                return valid, len(captured)
+
+            # Double translation
+            self.assertEqual(
+                validate('nl', FooItem(translation_of=foo_item_en)),
+                (False, 1)
+            )
+            # Same language as the original
+            self.assertEqual(validate('en', foo_item_nl), (False, 1))
+            # Itself
+            self.assertEqual(validate('nl', foo_item_nl), (True, 1))
+            self.assertEqual(validate('en', foo_item_en), (True, 1))
+            self.assertEqual(
+                validate('hy', FooItem(translation_of=untranslated_item)),
+                (True, 1)
+            )
+            # New originals
+            self.assertEqual(validate('en', FooItem()), (True, 0))
+
+            unique_together = [
+                tuple(fields) for fields in FooItem._meta.unique_together
+            ]
+            self.assertIn(('translation_of', 'language'), unique_together)
+            with self.assertRaises(IntegrityError):
+                with transaction.atomic():
+                    FooItem._default_manager.create(
+                        title='Double title NL', slug='double-title-nl',
+                        body='Double body NL', language='nl',
+                        translation_of=foo_item_en
+                    )
+
+            language_field = LanguageField(translation_group=True,
+                                           unique_translations=True)
+            language_field.set_attributes_from_name('language')
+            self.assertEqual(
+                language_field.get_unique_translation_fields(),
+                [('translation_of', 'language'),
+                 (TRANSLATION_GROUP_FIELD_NAME, 'language')]
+            )
+
+            return unique_together
+
+        @log_info
+        def test_26_bulk_create_translations(self):
+            """Test ``bulk_create_translations`` manager method."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+            untranslated_item = self.__get_or_create_untranslated_foo_item()
+            translations = {
+                'hy': {'title': 'Bulk title HY', 'slug': 'bulk-title-hy',
+                       'body': 'Bulk body HY'},
+                'nl': {'title': 'Bulk title NL', 'slug': 'bulk-title-nl',
+                       'body': 'Bulk body NL'},
+            }
+
+            try:
+                created, updated = FooItem.objects.bulk_create_translations(
+                    untranslated_item.pk, translations
+                )
+                self.assertEqual(len(created), 2)
+                self.assertEqual(updated, [])
+                self.assertEqual(
+                    untranslated_item.get_translation_for('nl').title,
+                    'Bulk title NL'
+                )
+
+                # Translations already exist
+                self.assertRaises(ValidationError,
+                                  FooItem.objects.bulk_create_translations,
+                                  [untranslated_item],
+                                  translations)
+                self.assertEqual(
+                    FooItem.objects.bulk_create_translations(
+                        {untranslated_item: translations},
+                        on_conflict=ON_CONFLICT_SKIP
+                    ),
+                    ([], [])
+                )
+
+                translations['nl']['title'] = 'Bulk title NL updated'
+                translations['ru'] = {'title': 'Bulk title RU',
+                                      'slug': 'bulk-title-ru',
+                                      'body': 'Bulk body RU'}
+                with CaptureQueriesContext(connection) as captured:
+                    created, updated = \
+                        FooItem.objects.bulk_create_translations(
+                            untranslated_item, translations,
+                            on_conflict=ON_CONFLICT_UPDATE
+                        )
+                self.assertEqual([obj.language for obj in created], ['ru'])
+                self.assertEqual(
+                    sorted(obj.language for obj in updated), ['hy', 'nl']
+                )
+                # Validated with a single query, inserted with another one
+                self.assertIn('translation_of', captured[0]['sql'])
+                self.assertEqual(
+                    len([query for query in captured
+                         if 'INSERT' in query['sql']]),
+                    1
+                )
+                self.assertEqual(
+                    FooItem._default_manager.get(
+                        slug='bulk-title-nl'
+                    ).title,
+                    'Bulk title NL updated'
+                )
+
+                # Not originals
+                self.assertRaises(ValueError,
+                                  FooItem.objects.bulk_create_translations,
+                                  foo_item_nl.pk,
+                                  {'hy': {}})
+                self.assertRaises(ValueError,
+                                  FooItem.objects.bulk_create_translations,
+                                  foo_item_en,
+                                  {'xx': {}})
+            finally:
+                FooItem._default_manager.filter(
+                    translation_of=untranslated_item
+                ).delete()
+
+            return translations
+
+        @log_info
+        def test_27_shared_fields(self):
+            """Test ``shared_fields`` of the ``LanguageField``."""
+            foo_item_en, foo_item_hy, foo_item_nl, foo_item_ru = \
+                self.__get_or_create_foo_items()
+            translations = FooItem._default_manager.filter(
+                translation_of=foo_item_en
+            )
+
+            def get_dates():
+                return set(
+                    FooItem._default_manager.filter(
+                        pk__in=[foo_item_en.pk, foo_item_hy.pk,
+                                foo_item_nl.pk, foo_item_ru.pk]
+                    ).values_list('date_published', flat=True)
+                )
+
+            # Pushed on save of the original
+            foo_item_en.date_published = datetime.datetime(2017, 1, 1)
+            foo_item_en.save()
+            self.assertEqual(len(get_dates()), 1)
+
+            # Not touching the shared fields
+            translations.update(date_published=datetime.datetime(2016, 1, 1))
+            foo_item_en.save(update_fields=['title'])
+            self.assertEqual(len(get_dates()), 2)
+
+            def get_updates(captured):
+                return [query['sql'] for query in captured.captured_queries
+                        if 'UPDATE' in query['sql']]
+
+            # Not changing the shared fields
+            with CaptureQueriesContext(connection) as captured:
+                foo_item_en.save()
+            self.assertEqual(len(get_updates(captured)), 1)
+            self.assertEqual(len(get_dates()), 2)
+
+            # Copied on exit of ``slim.bulk``
+            with slim.bulk():
+                with CaptureQueriesContext(connection) as captured:
+                    foo_item_en.date_published = datetime.datetime(2017, 1, 2)
+                    foo_item_en.save()
+                self.assertEqual(len(get_updates(captured)), 1)
+                self.assertFalse(
+                    [query for query in captured.captured_queries
+                     if 'SELECT' in query['sql']]
+                )
+                self.assertEqual(len(get_dates()), 2)
+            self.assertEqual(get_dates(),
+                             set([datetime.datetime(2017, 1, 2)]))
+            translations.update(date_published=datetime.datetime(2016, 1, 1))
+
+            # Bulk variant
+            with CaptureQueriesContext(connection) as captured:
+                updated = FooItem.objects.filter(
+                    pk=foo_item_en.pk
+                ).sync_shared_fields()
+            self.assertEqual(updated, 3)
+            self.assertEqual(len(get_dates()), 1)
+            self.assertEqual(
+                FooItem.objects.all().sync_shared_fields(),
+                0
+            )
+
+            # Translations saved on their own are left as they are
+            foo_item_nl.date_published = datetime.datetime(2016, 1, 1)
+            foo_item_nl.save()
+            self.assertEqual(len(get_dates()), 2)
+            FooItem.objects.filter(pk=foo_item_en.pk).sync_shared_fields()
+
+            return captured
+
+        @log_info
+        def test_28_create_missing_translations_admin_action(self):
+            """Test ``create_missing_translations`` admin action."""
+            untranslated_item = self.__get_or_create_untranslated_foo_item()
+            request = RequestFactory().get('/admin/foo/fooitem/')
+            request.user = self.__get_or_create_superuser()
+
+            class FooItemAdmin(SlimAdmin):
+                translation_chunk_size = 1
+                user_messages = []
+
+                def message_user(self, request, message, *args, **kwargs):
+                    self.user_messages.append(message)
+
+            model_admin = FooItemAdmin(FooItem, admin.site)
+            self.assertIn('create_missing_translations',
+                          model_admin.get_actions(request))
+            func, name, description = model_admin.get_actions(
+                request
+            )['create_missing_translations_nl']
+            queryset = FooItem._default_manager.filter(
+                pk=untranslated_item.pk
+            )
+
+            # Not allowed without the add permission
+            anonymous_request = RequestFactory().get('/admin/foo/fooitem/')
+            anonymous_request.user = AnonymousUser()
+            self.assertFalse([
+                name for name in model_admin.get_actions(anonymous_request)
+                if name.startswith('create_missing_translations')
+            ])
+            self.assertRaises(PermissionDenied,
+                              model_admin.create_missing_translations,
+                              anonymous_request, queryset)
+
+            try:
+                func(model_admin, request, queryset)
+                translation = untranslated_item.get_translation_for('nl')
+                self.assertEqual(translation.translation_of_id,
+                                 untranslated_item.pk)
+                self.assertEqual(translation.title, untranslated_item.title)
+                self.assertEqual(translation.slug,
+                                 untranslated_item.slug + '-nl')
+
+                # Selected translations stand for their originals
+                with CaptureQueriesContext(connection) as captured:
+                    model_admin.create_missing_translations(
+                        request,
+                        FooItem._default_manager.filter(pk=translation.pk)
+                    )
+                self.assertEqual(
+                    sorted(FooItem._default_manager.filter(
+                        translation_of=untranslated_item
+                    ).values_list('language', flat=True)),
+                    ['hy', 'nl', 'ru']
+                )
+                self.assertEqual(
+                    len([query for query in captured
+                         if 'INSERT' in query['sql']]),
+                    1
+                )
+
+                # Nothing is missing
+                model_admin.create_missing_translations(request, queryset)
+                self.assertEqual(
+                    FooItem._default_manager.filter(
+                        translation_of=untranslated_item
+                    ).count(),
+                    3
+                )
+                self.assertEqual(len(model_admin.user_messages), 3)
+            finally:
+                FooItem._default_manager.filter(
+                    translation_of=untranslated_item
+                ).delete()
+
+            return model_admin.user_messages
+
+        @log_info
+        def test_29_group_delete_and_update(self):
+            """Test ``delete_groups`` and ``update_groups``."""
+            user = self.__get_or_create_superuser()
+            request = RequestFactory().post('/admin/foo/fooitem/')
+            request.user = user
+            confirmed_request = RequestFactory().post('/admin/foo/fooitem/',
+                                                      {'post': 'yes'})
+            confirmed_request.user = user
+            anonymous_request = RequestFactory().post('/admin/foo/fooitem/',
+                                                      {'post': 'yes'})
+            anonymous_request.user = AnonymousUser()
+            manager = FooItem._default_manager
+            original = manager.create(
+                title='Group title EN', slug='group-title-en',
+                body='Group body EN', language='en'
+            )
+            translations = [
+                manager.create(
+                    title='Group title %s' % language.upper(),
+                    slug='group-title-%s' % language,
+                    body='Group body %s' % language.upper(),
+                    language=language,
+                    translation_of=original
+                )
+                for language in ('nl', 'ru')
+            ]
+            other = manager.create(
+                title='Other title EN', slug='other-title-en',
+                body='Other body EN', language='en'
+            )
+            pks = [original.pk] + [obj.pk for obj in translations]
+
+            class FooItemAdmin(SlimAdmin):
+                actions = ['delete_translation_groups']
+                group_update_actions = (
+                    ('clear_body', "Clear body", {'body': ''}),
+                )
+                translation_groups_title_field = 'title'
+
+                def message_user(self, request, message, *args, **kwargs):
+                    pass
+
+            model_admin = FooItemAdmin(FooItem, admin.site)
+            index = get_listing_index(FooItem, '-date_published')
+            get_cache().clear()
+
+            try:
+                self.assertFalse(has_dependent_objects(FooItem))
+
+                # Selected translations stand for the whole group
+                self.assertEqual(
+                    FooItem.objects.filter(
+                        pk=translations[0].pk
+                    ).update_groups(body='Updated body'),
+                    3
+                )
+                self.assertEqual(
+                    set(manager.filter(pk__in=pks)
+                        .values_list('body', flat=True)),
+                    set(['Updated body'])
+                )
+                self.assertEqual(manager.get(pk=other.pk).body,
+                                 'Other body EN')
+
+                # Not allowed without permissions
+                self.assertFalse(
+                    set(['clear_body', 'delete_translation_groups'])
+                    & set(model_admin.get_actions(anonymous_request))
+                )
+                self.assertRaises(PermissionDenied,
+                                  model_admin.delete_translation_groups,
+                                  anonymous_request,
+                                  manager.filter(pk=original.pk))
+                self.assertRaises(PermissionDenied,
+                                  model_admin.update_translation_groups,
+                                  anonymous_request,
+                                  manager.filter(pk=original.pk),
+                                  'clear_body')
+
+                func, name, description = model_admin.get_actions(
+                    request
+                )['clear_body']
+
+                # All the objects of the group are listed for confirmation
+                response = func(model_admin, request,
+                                manager.filter(pk=original.pk))
+                response.render()
+                for obj in [original] + translations:
+                    self.assertIn(obj.title, response.rendered_content)
+                self.assertIn('value="clear_body"', response.rendered_content)
+                self.assertNotIn(other.title, response.rendered_content)
+
+                # Only as many objects as the limit allows are listed
+                model_admin.translation_groups_confirmation_limit = 2
+                with CaptureQueriesContext(connection) as captured:
+                    groups, more = model_admin.get_translation_group_objects(
+                        manager.filter(pk=original.pk)
+                    )
+                self.assertEqual(len(captured), 2)
+                self.assertEqual(
+                    groups,
+                    [['%s (%s)' % (obj.title, obj.language)
+                      for obj in [original, translations[0]]]]
+                )
+                self.assertEqual(more, 1)
+                model_admin.translation_groups_confirmation_limit = 100
+                self.assertEqual(
+                    set(manager.filter(pk__in=pks)
+                        .values_list('body', flat=True)),
+                    set(['Updated body'])
+                )
+
+                self.assertIsNone(
+                    func(model_admin, confirmed_request,
+                         manager.filter(pk=original.pk))
+                )
+                self.assertEqual(
+                    set(manager.filter(pk__in=pks)
+                        .values_list('body', flat=True)),
+                    set([''])
+                )
+                # Logged once per translation group
+                self.assertEqual(
+                    list(LogEntry._default_manager.filter(
+                        user=user, action_flag=CHANGE
+                    ).values_list('object_id', 'object_repr')),
+                    [(text_type(original.pk), original.title)]
+                )
+
+                # Fields defining translation groups are not updated
+                field_names = ['language', 'translation_of',
+                               'translation_of_id']
+                if has_translation_group_field(FooItem):
+                    field_names.append(TRANSLATION_GROUP_FIELD_NAME)
+                for field_name in field_names:
+                    self.assertRaises(
+                        ValueError,
+                        FooItem.objects.filter(pk=original.pk).update_groups,
+                        **{field_name: None}
+                    )
+
+                self.assertIn(original.pk, index.get_pks('en', 0, 1000))
+                self.assertEqual(
+                    FooItem.objects.filter(
+                        pk=translations[1].pk
+                    ).delete_groups(),
+                    3
+                )
+                self.assertFalse(manager.filter(pk__in=pks).exists())
+                self.assertTrue(manager.filter(pk=other.pk).exists())
+                self.assertNotIn(original.pk, index.get_pks('en', 0, 1000))
+
+                # Signals are sent on demand only
+                deleted_pks = []
+
+                def collect(sender, instance, **kwargs):
+                    deleted_pks.append(instance.pk)
+
+                post_delete.connect(collect, sender=FooItem)
+                try:
+                    signalled = manager.create(
+                        title='Signalled title EN', slug='signalled-title-en',
+                        body='Signalled body EN', language='en'
+                    )
+                    pks.append(signalled.pk)
+                    FooItem.objects.filter(pk=signalled.pk).delete_groups(
+                        send_signals=True
+                    )
+                finally:
+                    post_delete.disconnect(collect, sender=FooItem)
+                self.assertEqual(deleted_pks, [signalled.pk])
+
+                model_admin.delete_translation_groups(
+                    request, manager.filter(pk=other.pk)
+                )
+                self.assertTrue(manager.filter(pk=other.pk).exists())
+                model_admin.delete_translation_groups(
+                    confirmed_request, manager.filter(pk=other.pk)
+                )
+                self.assertFalse(manager.filter(pk=other.pk).exists())
+                self.assertEqual(
+                    list(LogEntry._default_manager.filter(
+                        user=user, action_flag=DELETION
+                    ).values_list('object_id', flat=True)),
+                    [text_type(other.pk)]
+                )
+            finally:
+                manager.filter(pk__in=pks + [other.pk]).delete()
+                LogEntry._default_manager.filter(user=user).delete()
+                get_cache().clear()
+
+            return pks
+
 
 if __name__ == "__main__":
     # Tests
@@ -1,6 +1,12 @@
 from django.utils import translation
 
-from .helpers import default_language
+from .conf import get_setting
+from .helpers import (
+    get_default_language,
+    get_languages_keys,
+    get_languages_keys_set,
+    setting_changed
+)
 
 __title__ = 'slim.translations'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
@@ -8,9 +14,14 @@ __copyright__ = '2013-2017 Artur Barseghyan'
 __license__ = 'GPL 2.0/LGPL 2.1'
 __all__ = (
     'short_language_code',
-    'is_primary_language'
+    'is_primary_language',
+    'get_fallback_chain',
+    'get_fallback_chains',
+    'reset_fallback_chains',
 )
 
+_fallback_chains = None
+
 
 def short_language_code(code=None):
     """Extract the short language code from its argument
@@ -48,4 +59,77 @@ def is_primary_language(language=None):
     if not language:
         language = translation.get_language()
 
-    return language == default_language
+    return language == get_default_language()
+
+
+def _build_fallback_chain(language, languages_keys):
+    """Build the fallback chain for the language given.
+
+    :param str language:
+    :param frozenset languages_keys:
+    :return tuple:
+    """
+    language_fallbacks = get_setting('LANGUAGE_FALLBACKS')
+    if language in language_fallbacks:
+        fallbacks = list(language_fallbacks[language])
+    else:
+        fallbacks = [short_language_code(language), get_default_language()]
+
+    chain = [language]
+    for fallback in fallbacks:
+        if fallback in languages_keys and fallback not in chain:
+            chain.append(fallback)
+    return tuple(chain)
+
+
+def get_fallback_chains():
+    """Get fallback chains of all languages specified in ``LANGUAGES``.
+
+    Chains are computed once (until ``LANGUAGES`` or ``SLIM_*`` settings
+    change, see ``SLIM_LANGUAGE_FALLBACKS`` setting).
+
+    :return dict: Language codes as keys, tuples of language codes (the
+        language itself being the first one) as values.
+    """
+    global _fallback_chains
+    if _fallback_chains is None:
+        languages_keys = get_languages_keys_set()
+        _fallback_chains = dict(
+            (language, _build_fallback_chain(language, languages_keys))
+            for language in get_languages_keys()
+        )
+    return _fallback_chains
+
+
+def reset_fallback_chains(**kwargs):
+    """Drop computed fallback chains (to be computed again on next use).
+
+    Connected to the ``setting_changed`` signal.
+    """
+    global _fallback_chains
+    setting = kwargs.get('setting')
+    if setting is None \
+            or setting == 'LANGUAGES' \
+            or setting.startswith('SLIM_'):
+        _fallback_chains = None
+
+
+setting_changed.connect(reset_fallback_chains)
+
+
+def get_fallback_chain(language=None):
+    """Get fallback chain for the current or passed language.
+
+    >>> get_fallback_chain('de-at')
+    ('de-at', 'de', 'en')
+
+    :param str language:
+    :return tuple: Language codes, the language itself being the first one.
+    """
+    if not language:
+        language = translation.get_language()
+
+    chain = get_fallback_chains().get(language)
+    if chain is None:
+        chain = _build_fallback_chain(language, get_languages_keys_set())
+    return chain
@@ -2,11 +2,11 @@ __title__ = 'slim.utils'
 __author__ = 'Artur Barseghyan <artur.barseghyan@gmail.com>'
 __copyright__ = '2013-2017 Artur Barseghyan'
 __license__ = 'GPL 2.0/LGPL 2.1'
-__all__ = ('locale_url_is_installed',)
+__all__ = ('locale_url_is_installed', 'get_slim_models', 'get_model',)
 
 from django.conf import settings
 
-from slim.settings import USE_LOCALEURL
+from slim.conf import settings as slim_settings
 
 
 def locale_url_is_installed():
@@ -16,9 +16,51 @@ def locale_url_is_installed():
     """
     # This is good as deprecated.
 
-    if USE_LOCALEURL is True \
+    if slim_settings.USE_LOCALEURL is True \
             and 'localeurl' in settings.INSTALLED_APPS \
             and 'localeurl.middleware.LocaleURLMiddleware' \
                 in settings.MIDDLEWARE_CLASSES:
         return True
     return False
+
+
+def get_slim_models():
+    """Get all installed models having a ``LanguageField``.
+
+    :return list:
+    """
+    from .models.fields import LanguageField
+
+    try:
+        from django.apps import apps
+        installed_models = apps.get_models()
+    except ImportError:
+        from django.db.models import get_models
+        installed_models = get_models()
+
+    return [
+        model
+        for model
+        in installed_models
+        if any(
+            isinstance(field, LanguageField) for field in model._meta.fields
+        )
+    ]
+
+
+def get_model(app_label, model_name):
+    """Get model by app label and model name.
+
+    :param str app_label:
+    :param str model_name:
+    :return django.db.models.Model: Or None if not found.
+    """
+    try:
+        from django.apps import apps
+        try:
+            return apps.get_model(app_label, model_name)
+        except LookupError:
+            return None
+    except ImportError:
+        from django.db.models import get_model as django_get_model
+        return django_get_model(app_label, model_name)